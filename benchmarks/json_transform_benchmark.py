@@ -0,0 +1,114 @@
+"""업로드 시 중첩 라벨 컬럼 JSON 직렬화 벤치마크
+
+기존 경로(행별 dict 디코딩 → lambda에서 json.dumps)와
+배치 경로(_apply_json_transform: Arrow 배치를 DuckDB to_json()으로 직렬화)를 KIE 라벨 모양의 합성 데이터로 비교한다.
+
+사용 예:
+    python benchmarks/json_transform_benchmark.py --rows 1000000
+    python benchmarks/json_transform_benchmark.py --rows 1000000 --num-proc 1
+"""
+import argparse
+import json
+import logging
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pyarrow as pa
+from datasets import Dataset, Value
+from datasets import config as datasets_config
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from datalake.core.client import DatalakeClient  # noqa: E402
+
+
+def make_client(num_proc: int) -> DatalakeClient:
+    """서버 연결/디렉토리 검사 없이 변환 메서드만 쓰는 클라이언트"""
+    client = DatalakeClient.__new__(DatalakeClient)
+    client.num_proc = num_proc
+    client.logger = logging.getLogger("json_transform_benchmark")
+    return client
+
+
+def make_dataset(rows: int, fields_per_row: int, cache_dir: Path) -> Dataset:
+    """KIE 라벨(list<struct<key, value, bbox>>) 컬럼을 가진 합성 데이터셋을 Arrow 파일로 저장 후 로드"""
+    fields = [
+        {"key": f"항목{k}", "value": f"값 {k}", "bbox": [10.0 * k, 20.0, 110.0 * k, 40.0]}
+        for k in range(fields_per_row)
+    ]
+    # 1%는 라벨 없음
+    labels = [None if n % 100 == 0 else fields for n in range(rows)]
+    table = pa.table({
+        "hash": [f"{n:064x}" for n in range(rows)],
+        "labels": labels,
+        "width": list(range(rows)),
+    })
+    dataset = Dataset(table)
+    dataset.save_to_disk(str(cache_dir / "kie"))
+    return Dataset.load_from_disk(str(cache_dir / "kie"))
+
+
+def legacy_json_transform(client: DatalakeClient, dataset: Dataset, columns: list) -> Dataset:
+    """변경 전 _apply_json_transform 경로"""
+    def json_transform(x):
+        if isinstance(x, (dict, list)):
+            return json.dumps(x, ensure_ascii=False)
+        return x
+
+    features = dataset.features.copy()
+    for col in columns:
+        features[col] = Value('string')
+    return dataset.map(
+        lambda x: {col: json_transform(x[col]) for col in columns},
+        num_proc=client.num_proc,
+        features=features,
+    )
+
+
+def timed(name: str, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<32} {elapsed:8.2f}s  ({len(result):,}행)")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="중첩 라벨 컬럼 JSON 직렬화 벤치마크")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--fields", type=int, default=8, help="행당 KIE 항목 수")
+    parser.add_argument("--num-proc", type=int, default=4, help="기존 경로의 map() 프로세스 수")
+    parser.add_argument("--check-rows", type=int, default=100_000, help="결과 비교에 쓰는 행 수")
+    parser.add_argument("--skip-legacy", action="store_true", help="기존 경로 측정 생략")
+    args = parser.parse_args()
+
+    work_dir = Path(tempfile.mkdtemp(prefix="datalake_bench_"))
+    try:
+        datasets_config.HF_DATASETS_CACHE = str(work_dir / "cache")
+        client = make_client(args.num_proc)
+        dataset = make_dataset(args.rows, args.fields, work_dir)
+        print(f"📊 {args.rows:,}행, 행당 항목 {args.fields}개, num_proc={args.num_proc}")
+
+        legacy = None
+        if not args.skip_legacy:
+            legacy = timed("legacy (행별 map)", lambda: legacy_json_transform(client, dataset, ["labels"]))
+        batched = timed("batched (Arrow 배치)", lambda: client._apply_json_transform(dataset, ["labels"]))
+
+        if legacy is not None:
+            # 배치 경로는 공백 없는 JSON을 쓰므로 파싱한 값으로 비교
+            check_rows = min(len(dataset), args.check_rows)
+            expected = legacy.data.column("labels").slice(0, check_rows).to_pylist()
+            actual = batched.data.column("labels").slice(0, check_rows).to_pylist()
+            same = all(
+                (a is None and b is None) or (a is not None and b is not None and json.loads(a) == json.loads(b))
+                for a, b in zip(expected, actual)
+            )
+            print(f"결과 일치 (앞 {check_rows:,}행): {same}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""to_dataset() 변환 경로 벤치마크
+
+기존 경로(DataFrame 복사 → 행별 lambda로 절대경로 변환 → Dataset.from_pandas → 행별 map 존재 확인)와
+Arrow 경로(search(as_arrow=True) 결과를 복사 없이 Dataset으로 감싸기)를 같은 합성 데이터로 비교한다.
+
+사용 예:
+    python benchmarks/to_dataset_benchmark.py --rows 1000000
+    python benchmarks/to_dataset_benchmark.py --rows 1000000 --no-check-exists
+"""
+import argparse
+import logging
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+from datasets import Dataset
+from datasets import config as datasets_config
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from datalake.core.client import DatalakeClient  # noqa: E402
+
+
+def make_client(assets_path: Path, num_proc: int) -> DatalakeClient:
+    """서버 연결/디렉토리 검사 없이 변환 메서드만 쓰는 클라이언트"""
+    client = DatalakeClient.__new__(DatalakeClient)
+    client.assets_path = assets_path
+    client.num_proc = num_proc
+    client.logger = logging.getLogger("to_dataset_benchmark")
+    return client
+
+
+def make_results(rows: int, num_files: int, assets_path: Path) -> pa.Table:
+    """검색 결과와 같은 모양의 합성 테이블 (path는 num_files개 파일을 반복 참조)"""
+    for i in range(num_files):
+        file_path = assets_path / f"{i % 256:02x}" / f"{i:08d}.jpg"
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.touch()
+
+    # 10%는 존재하지 않는 파일
+    paths = [
+        f"{i % 256:02x}/{i:08d}.jpg" if n % 10 else f"missing/{n:08d}.jpg"
+        for n, i in enumerate(j % num_files for j in range(rows))
+    ]
+    return pa.table({
+        "hash": [f"{n:064x}" for n in range(rows)],
+        "path": paths,
+        "labels": ['{"word": {"text": {"content": ["안녕하세요"]}}}'] * rows,
+        "width": list(range(rows)),
+        "provider": ["aihub"] * rows,
+        "dataset": ["bench"] * rows,
+        "task": ["ocr"] * rows,
+        "variant": ["word"] * rows,
+    })
+
+
+def legacy_to_dataset(client: DatalakeClient, df: pd.DataFrame, check_exists: bool) -> Dataset:
+    """변경 전 to_dataset() 경로"""
+    df_copy = df.copy()
+    df_copy["path"] = df_copy["path"].apply(
+        lambda x: (client.assets_path / x).as_posix() if isinstance(x, str) and x else x
+    )
+    dataset = Dataset.from_pandas(df_copy)
+    if check_exists:
+        dataset = dataset.map(
+            lambda example: {"exists": bool(example["path"]) and Path(example["path"]).exists()},
+            num_proc=client.num_proc,
+        )
+        dataset = dataset.filter(lambda x: x, input_columns=["exists"], num_proc=client.num_proc)
+        dataset = dataset.remove_columns(["exists"])
+    return dataset
+
+
+def timed(name: str, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<32} {elapsed:8.2f}s  ({len(result):,}행)")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="to_dataset() 변환 경로 벤치마크")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--num-files", type=int, default=10_000)
+    parser.add_argument("--num-proc", type=int, default=4)
+    parser.add_argument("--no-check-exists", action="store_true", help="파일 존재 확인 생략")
+    parser.add_argument("--skip-legacy", action="store_true", help="기존 경로 측정 생략")
+    args = parser.parse_args()
+
+    check_exists = not args.no_check_exists
+    work_dir = Path(tempfile.mkdtemp(prefix="datalake_bench_"))
+    try:
+        assets_path = work_dir / "assets"
+        # 스트림 경로가 만드는 Arrow 파일도 작업 디렉토리에 두고 함께 정리
+        datasets_config.HF_DATASETS_CACHE = str(work_dir / "cache")
+        client = make_client(assets_path, args.num_proc)
+        table = make_results(args.rows, args.num_files, assets_path)
+        df = table.to_pandas()
+        print(f"📊 {args.rows:,}행, 파일 존재 확인: {check_exists}")
+
+        if not args.skip_legacy:
+            timed("legacy (DataFrame)", lambda: legacy_to_dataset(client, df, check_exists))
+        timed("to_dataset (DataFrame)", lambda: client.to_dataset(df, check_path_exists=check_exists))
+        timed("to_dataset (Arrow Table)", lambda: client.to_dataset(table, check_path_exists=check_exists))
+        batches = table.to_batches(max_chunksize=100_000)
+        timed("to_dataset (RecordBatch 스트림)", lambda: client.to_dataset(iter(batches), check_path_exists=check_exists))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
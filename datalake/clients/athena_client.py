@@ -3,7 +3,8 @@ import awswrangler as wr
 import pandas as pd
 import boto3
 
-from typing import Optional, Dict, Union, List
+from collections import deque
+from typing import Optional, Dict, Union, List, Iterator, Callable
 from datalake.clients.queries import SQLQueries
 
 class AthenaClient:
@@ -16,6 +17,8 @@ class AthenaClient:
         database (str): Athena 데이터베이스 이름
         s3_output (str): Athena 쿼리 결과가 저장될 S3 경로
         session (boto3.Session): AWS 세션 객체
+        max_concurrent_queries (int): 동시에 실행할 최대 쿼리 수
+        result_cache_seconds (int): 같은 SQL의 이전 결과를 재사용할 기간(초), 0이면 재사용 안 함
 
     Partition Info Example
         catalog --- provider=A --- dataset=B --- task=D --- variant=X --- abc.parquet  
@@ -31,6 +34,12 @@ class AthenaClient:
         self,
         database: str = 'kdl-data-catalog',
         s3_output: str = 's3://kdl-data-lake/athena-client-output',
+        workgroup: str = 'primary',
+        max_concurrent_queries: int = 4,
+        result_cache_seconds: int = 900,
+        result_reuse_minutes: Optional[int] = None,
+        s3_endpoint_url: Optional[str] = None,
+        athena_endpoint_url: Optional[str] = None,
         **kwargs
     ):
         """AthenaClient 초기화
@@ -38,6 +47,13 @@ class AthenaClient:
         Args:
             database (str): Athena 데이터베이스 이름
             s3_output (str): Athena 쿼리 결과가 저장될 S3 경로
+            workgroup (str): Athena 워크그룹
+            max_concurrent_queries (int): 동시에 실행할 최대 쿼리 수 (계정의 동시 DML 쿼리 한도 이하로 설정)
+            result_cache_seconds (int): 같은 SQL을 이 기간 안에 다시 실행하면 S3에 남아 있는
+                이전 결과를 재사용 (awswrangler 캐시 조회 + 프로세스 내 SQL→쿼리 ID 캐시). 0이면 재사용 안 함
+            result_reuse_minutes (Optional[int]): Athena 엔진 v3의 서버 측 결과 재사용 기간(분), None이면 사용 안 함
+            s3_endpoint_url (Optional[str]): S3 엔드포인트 (로컬 S3 호환 서버 테스트용)
+            athena_endpoint_url (Optional[str]): Athena 엔드포인트 (로컬 테스트용)
             **kwargs: boto3.Session 생성에 사용될 파라미터
                 AWS 자격 증명 정보를 파라미터로 기입할 때 사용,
                 입력 안하면 기본값으로 자동 적용(환경변수 or aws configure에서 정의한 값)
@@ -46,79 +62,161 @@ class AthenaClient:
                 - aws_secret_access_key (str): AWS 시크릿 키
         """
         self.database = database
-        self.s3_output = s3_output
+        self.s3_output = s3_output.rstrip('/')
+        self.workgroup = workgroup
+        self.max_concurrent_queries = max(1, max_concurrent_queries)
+        self.result_cache_seconds = result_cache_seconds
+        self.result_reuse_minutes = result_reuse_minutes
+        self.s3_endpoint_url = s3_endpoint_url
         self.session = boto3.Session(**kwargs) if kwargs else None
 
+        # awswrangler 엔드포인트 설정은 프로세스 전역
+        if s3_endpoint_url:
+            wr.config.s3_endpoint_url = s3_endpoint_url
+        if athena_endpoint_url:
+            wr.config.athena_endpoint_url = athena_endpoint_url
+
+        # SQL → (쿼리 ID, 실행 시각): 같은 프로세스에서 반복되는 쿼리는 캐시 조회 API 호출도 생략
+        self._query_ids: Dict[str, tuple] = {}
+
     def execute_query(
         self,
         sql: str,
         chunksize: Optional[int] = None
-    ) -> pd.DataFrame:
+    ) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
         """SQL 쿼리 실행
         Args:
             sql (str): 실행할 SQL 쿼리문
             chunksize (Optional[int]): 청크 크기 (None이면 전체 데이터)
             
         Returns:
-            pd.DataFrame: 쿼리 결과
+            pd.DataFrame: 쿼리 결과 (chunksize를 주면 청크 DataFrame iterator)
         """
-        self.cleanup_previous_output()
         if chunksize:
-            return self._execute_query_in_chunks(sql, chunksize)
-
-        return wr.athena.read_sql_query(
-            sql=sql,
-            database=self.database,
-            s3_output=self.s3_output,
-            boto3_session=self.session
-        )
+            return self.execute_query_iter(sql, chunksize)
+        return self._read_results(self.start_query(sql))
 
-    def _execute_query_in_chunks(
+    def execute_query_iter(
         self,
         sql: str,
         chunksize: int,
-    ) -> pd.DataFrame:
-        """청크 단위로 쿼리 실행
+    ) -> Iterator[pd.DataFrame]:
+        """SQL 쿼리 결과를 청크 단위로 스트리밍
         Args:
             sql (str): 실행할 SQL 쿼리문
             chunksize (int): 청크 크기
             
+        Yields:
+            pd.DataFrame: 결과 청크
+        """
+        return self._iter_queries([sql], chunksize)
+
+    def start_query(self, sql: str) -> str:
+        """쿼리 제출 (완료를 기다리지 않음)
+
+        result_cache_seconds 안에 같은 SQL을 실행한 적이 있으면 새로 실행하지 않고 그 쿼리 ID를 반환한다.
+
         Returns:
-            pd.DataFrame: 모든 청크를 합친 결과
+            str: 쿼리 실행 ID
         """
-        dfs = []
-        for chunk in wr.athena.read_sql_query(
+        if self.result_cache_seconds > 0:
+            cached = self._query_ids.get(sql)
+            if cached and time.time() - cached[1] < self.result_cache_seconds:
+                return cached[0]
+
+        query_id = wr.athena.start_query_execution(
             sql=sql,
             database=self.database,
             s3_output=self.s3_output,
+            workgroup=self.workgroup,
             boto3_session=self.session,
-            chunksize=chunksize
-        ):
-            dfs.append(chunk)
-        return pd.concat(dfs, ignore_index=True)
+            athena_cache_settings=(
+                {'max_cache_seconds': self.result_cache_seconds}
+                if self.result_cache_seconds > 0 else None
+            ),
+            result_reuse_configuration=(
+                {
+                    'ResultReuseByAgeConfiguration': {
+                        'Enabled': True,
+                        'MaxAgeInMinutes': self.result_reuse_minutes,
+                    }
+                }
+                if self.result_reuse_minutes else None
+            ),
+        )
+        if self.result_cache_seconds > 0:
+            self._query_ids[sql] = (query_id, time.time())
+        return query_id
+
+    def _read_results(
+        self,
+        query_id: str,
+        chunksize: Optional[int] = None,
+    ) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
+        """쿼리 완료를 기다린 뒤 S3의 결과 읽기 (chunksize를 주면 iterator)"""
+        try:
+            return wr.athena.get_query_results(
+                query_execution_id=query_id,
+                boto3_session=self.session,
+                chunksize=chunksize,
+            )
+        except Exception:
+            # 실패한 쿼리 ID는 재사용하지 않음
+            self._query_ids = {
+                sql: cached for sql, cached in self._query_ids.items() if cached[0] != query_id
+            }
+            raise
+
+    def _iter_queries(
+        self,
+        sqls: List[str],
+        chunksize: Optional[int] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """여러 쿼리를 최대 max_concurrent_queries개까지 미리 제출하고 순서대로 결과를 스트리밍
+
+        앞 쿼리의 결과를 읽는 동안 뒤 쿼리들은 Athena에서 이미 실행 중이다.
+        """
+        sql_iter = iter(sqls)
+        pending = deque()
+
+        def submit_next():
+            sql = next(sql_iter, None)
+            if sql is not None:
+                pending.append(self.start_query(sql))
+
+        for _ in range(self.max_concurrent_queries):
+            submit_next()
+
+        while pending:
+            query_id = pending.popleft()
+            submit_next()
+            if chunksize:
+                yield from self._read_results(query_id, chunksize)
+            else:
+                yield self._read_results(query_id)
 
     def _process_variants(
         self,
         variants: Union[str, List[str]],
-        query_func: callable,
-        **kwargs
-    ) -> pd.DataFrame:
-        """variants 처리 및 결과 병합
+        build_sql: Callable[[str], str],
+        chunksize: Optional[int] = None,
+    ) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
+        """variant별 쿼리를 동시에 실행하고 결과 병합
         Args:
             variants (Union[str, List[str]]): 단일 variant 또는 variant 리스트
-            query_func (callable): 실행할 쿼리 함수
-            **kwargs: query_func에 전달할 파라미터
+            build_sql (Callable): variant를 받아 실행할 SQL을 반환하는 함수
+            chunksize (Optional[int]): 청크 크기 (주면 모든 variant의 청크를 순서대로 내보내는 iterator 반환)
         Returns:
-            pd.DataFrame: 병합된 결과
+            pd.DataFrame: 병합된 결과 (chunksize를 주면 청크 DataFrame iterator)
         """
         if isinstance(variants, str):
             variants = [variants]
-        
-        dfs = []
-        for variant in variants:
-            df = query_func(variant=variant, **kwargs)
-            dfs.append(df)
 
+        sqls = [build_sql(variant) for variant in variants]
+        if chunksize:
+            return self._iter_queries(sqls, chunksize)
+
+        dfs = list(self._iter_queries(sqls))
         if dfs:
             return pd.concat(dfs, ignore_index=True)
         return pd.DataFrame()
@@ -130,7 +228,7 @@ class AthenaClient:
         variants: Union[str, List[str]],
         chunksize: Optional[int] = None,
         partition_conditions: Optional[Dict[str, str]] = None
-    ) -> pd.DataFrame:
+    ) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
         """유효한 라벨 데이터 검색
         JSON 컬럼에서 특정 variant의 text.content가 유효한 데이터를 검색합니다.
         유효한 데이터란 NULL이 아니고, 빈 배열이 아니며, 배열의 길이가 0보다 큰 경우를 의미합니다.
@@ -144,6 +242,7 @@ class AthenaClient:
                 {파티션컬럼: 값} 형태로 지정. Defaults to None.
         Returns:
             pd.DataFrame: 검색된 데이터의 hash, path를 포함한 DataFrame
+                (chunksize를 주면 청크 DataFrame iterator)
         Example:
             >>> client = AthenaClient(database="my_db", s3_output="s3://my-bucket/output")
             >>> df = client.search_valid_content(
@@ -153,19 +252,19 @@ class AthenaClient:
             ...     partition_conditions={"provider": "aihub", "dataset": "ocr_data"}
             ... )
         """
-        def query_func(variant: str, **kwargs) -> pd.DataFrame:
+        def build_sql(variant: str) -> str:
             json_loc = f'$.{variant}.text.content'
-            sql = SQLQueries.extract_valid_content(
+            return SQLQueries.extract_valid_content(
                 table=table,
                 column=column,
                 json_loc=json_loc,
                 partition_conditions=partition_conditions
             )
-            return self.execute_query(sql, chunksize=chunksize)
 
         return self._process_variants(
             variants=variants,
-            query_func=query_func
+            build_sql=build_sql,
+            chunksize=chunksize,
         )
 
     def search_text_in_content(
@@ -176,7 +275,7 @@ class AthenaClient:
         variants: Union[str, List[str]],
         chunksize: Optional[int] = None,
         partition_conditions: Optional[Dict[str, str]] = None
-    ) -> pd.DataFrame:
+    ) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
         """특정 텍스트가 포함된 라벨 데이터 검색
         JSON 컬럼에서 특정 variant의 text.content에 검색어가 포함된 데이터를 검색합니다.
         검색은 대소문자를 구분하며, 부분 문자열 매칭을 수행합니다.
@@ -191,6 +290,7 @@ class AthenaClient:
                 {파티션컬럼: 값} 형태로 지정. Defaults to None.
         Returns:
             pd.DataFrame: 검색된 데이터의 hash,path를 포함한 DataFrame
+                (chunksize를 주면 청크 DataFrame iterator)
         Example:
             >>> client = AthenaClient(database="my_db", s3_output="s3://my-bucket/output")
             >>> df = client.search_text_in_content(
@@ -201,23 +301,20 @@ class AthenaClient:
             ...     partition_conditions={"provider": "aihub", "dataset": "ocr_data"}
             ... )
         """
-        def query_func(
-            variant: str,
-            **kwargs,
-        ) -> pd.DataFrame:
+        def build_sql(variant: str) -> str:
             json_loc = f'$.{variant}.text.content'
-            sql = SQLQueries.extract_text_in_content(
+            return SQLQueries.extract_text_in_content(
                 table=table,
                 column=column,
                 json_loc=json_loc,
                 search_text=search_text,
                 partition_conditions=partition_conditions
             )
-            return self.execute_query(sql, chunksize=chunksize)
 
         return self._process_variants(
             variants=variants,
-            query_func=query_func
+            build_sql=build_sql,
+            chunksize=chunksize,
         )
 
     def retrieve_with_existing_cols(
@@ -345,25 +442,36 @@ class AthenaClient:
 
     def cleanup_previous_output(
         self,
+        older_than_seconds: Optional[int] = None,
     ):
-        """이전 쿼리 실행으로 생성된 임시 데이터 정리"""
+        """이전 쿼리 실행으로 생성된 임시 데이터 정리
+
+        쿼리마다 자동으로 호출하지 않는다 (결과 재사용을 위해 S3 결과를 남겨 둠).
+        주기적으로 호출하거나 S3 수명 주기 규칙으로 정리한다.
+
+        Args:
+            older_than_seconds (Optional[int]): 이 시간보다 오래된 객체만 삭제 (None이면 전체)
+        """
         try:
-            s3_client = self.session.client('s3') if self.session else boto3.client('s3')
+            s3_client = (self.session or boto3).client('s3', endpoint_url=self.s3_endpoint_url)
             bucket = self.s3_output.split('/')[2]
             prefix = '/'.join(self.s3_output.split('/')[3:])
-            
-            # 해당 경로의 모든 객체 삭제
-            s3_client.delete_objects(
-                Bucket=bucket,
-                Delete={
-                    'Objects': [
-                        {'Key': obj['Key']} 
-                        for obj in s3_client.list_objects_v2(
-                            Bucket=bucket,
-                            Prefix=prefix
-                        ).get('Contents', [])
-                    ]
-                }
-            )
+            cutoff = time.time() - older_than_seconds if older_than_seconds is not None else None
+
+            keys = []
+            paginator = s3_client.get_paginator('list_objects_v2')
+            for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+                for obj in page.get('Contents', []):
+                    if cutoff is None or obj['LastModified'].timestamp() < cutoff:
+                        keys.append(obj['Key'])
+
+            # delete_objects는 요청당 최대 1000개
+            for i in range(0, len(keys), 1000):
+                s3_client.delete_objects(
+                    Bucket=bucket,
+                    Delete={'Objects': [{'Key': key} for key in keys[i:i + 1000]]}
+                )
+            # 지워진 결과를 가리킬 수 있는 쿼리 ID 캐시도 비움
+            self._query_ids.clear()
         except Exception as e:
             print(f"데이터 정리 중 오류 발생: {str(e)}")
@@ -1,11 +1,15 @@
 import os
+import re
 import sys
-from typing import Optional, Dict, Union, List
+import json
+import uuid
+from typing import Any, Optional, Dict, Union, List, Iterator
 import pandas as pd
+import pyarrow as pa
 import duckdb
 from pathlib import Path
 
-from datalake.clients.queries import SQLQueries
+from datalake.clients.queries import SQLQueries, CatalogQueryBuilder, Query
 
 
 class DuckDBClient:
@@ -28,93 +32,501 @@ class DuckDBClient:
         Partitions = [provider, dataset, task, variant]
     """
 
+    META_TABLE = "_datalake_meta"
+    OVERLAY_DATABASE = "_datalake_overlay"  # 읽기 전용 DB 위에 현재 catalog 뷰를 만드는 인메모리 DB
+    PARTITION_COLUMNS = ['provider', 'dataset', 'task', 'variant']
+
+    REMOTE_PREFIXES = ('s3://', 's3a://', 'gcs://', 'gs://', 'http://', 'https://')
+    STRING_LITERAL_PATTERN = re.compile(r"'(?:[^']|'')*'")
+    # read_parquet()/parquet_metadata() 등의 경로 인자 (문자열 또는 문자열 목록)
+    PARQUET_SOURCE_PATTERN = re.compile(
+        r"\b(?:read_parquet|parquet_scan|parquet_metadata|parquet_file_metadata|parquet_schema)\s*\(\s*"
+        r"(\[(?:[^\]']|'(?:[^']|'')*')*\]|'(?:[^']|'')*')",
+        re.IGNORECASE,
+    )
+
     def __init__(
         self,
         database_path: Optional[str] = None,
         read_only: bool = True,
+        threads: Optional[int] = None,
+        memory_limit: Optional[str] = None,
     ):
         """DuckDBClient 초기화
 
         Args:
             database_path (Optional[str]): DuckDB 데이터베이스 파일 경로. None이면 인메모리 DB 사용
+            read_only (bool): 읽기 전용 연결 여부
+            threads (Optional[int]): 연결별 DuckDB 스레드 수 (None이면 DuckDB 기본값)
+            memory_limit (Optional[str]): 연결별 메모리 제한 (예: '4GB', None이면 DuckDB 기본값)
         """
         self.database_path = database_path
+        self.read_only = read_only
+        self.threads = threads
+        self.memory_limit = memory_limit
         self.connection = None
+        self._loaded_extensions = set()
+        # (테이블, catalog 세대, 파티션 조건) → non-null 컬럼 목록
+        self._non_null_cache: Dict[tuple, List[str]] = {}
+        # 현재 catalog 세대 (설정되면 DB와 세대가 다를 때 hash/텍스트 색인 등 파생 테이블을 쓰지 않음)
+        self.catalog_generation: Optional[int] = None
+        # attach_overlay() 후 cursor()에도 적용할 search_path
+        self._search_path: Optional[str] = None
         # 연결 초기화
         self.connect(read_only=read_only)
 
     def connect(self, read_only: bool = False) -> None:
-        """DuckDB 연결 생성 및 초기 설정"""
+        """DuckDB 연결 생성 및 초기 설정
+
+        확장은 연결 시 설치하지 않고 필요한 쿼리에서만 로드한다 (폐쇄망 대응).
+        """
+        config = {}
+        if self.threads:
+            config['threads'] = self.threads
+        if self.memory_limit:
+            config['memory_limit'] = self.memory_limit
+
         try:
             if self.database_path:
-                # 디렉토리 생성
-                Path(self.database_path).parent.mkdir(mode=0o777, parents=True, exist_ok=True)
-                self.connection = duckdb.connect(self.database_path, read_only=read_only)
-                os.chmod(self.database_path, 0o777)
+                if read_only:
+                    self.connection = duckdb.connect(self.database_path, read_only=True, config=config)
+                else:
+                    # 디렉토리 생성
+                    Path(self.database_path).parent.mkdir(mode=0o777, parents=True, exist_ok=True)
+                    self.connection = duckdb.connect(self.database_path, read_only=False, config=config)
+                    os.chmod(self.database_path, 0o777)
             else:
                 # 인메모리 데이터베이스
-                self.connection = duckdb.connect(':memory:', read_only=read_only)
-            # 기본 확장 설치
-            self._install_extensions()
+                self.connection = duckdb.connect(':memory:', read_only=read_only, config=config)
             
         except Exception as e:
             raise Exception(f"DuckDB 연결 실패: {str(e)}")
 
-    def _install_extensions(self) -> None:
-        """필요한 DuckDB 확장 설치"""
-        try:
-            # JSON 확장
-            self.connection.execute("INSTALL json")
-            self.connection.execute("LOAD json")
-            
-            # HTTPfs 확장 (S3 지원)
-            self.connection.execute("INSTALL httpfs")
-            self.connection.execute("LOAD httpfs")
-            
-        except Exception as e:
-            print(f"확장 설치 중 오류: {str(e)}")
+    def attach_overlay(self) -> None:
+        """이후 만드는 뷰/테이블을 인메모리 DB에 만들고 DB 파일의 같은 이름 객체보다 우선 조회
 
-    def execute_query(self, sql: str) -> pd.DataFrame:
-        """SQL 쿼리 실행
+        읽기 전용 DB 파일은 수정할 수 없고 TEMP 객체는 cursor()로 만든 연결에서 보이지 않으므로,
+        같은 인스턴스의 모든 cursor가 공유하는 인메모리 DB를 search_path 맨 앞에 둔다.
+        같은 프로세스에서 같은 DB 파일을 연 연결은 인스턴스를 공유하므로 이미 붙어 있으면 그대로 쓴다.
+        """
+        database = self.connection.execute("SELECT current_database()").fetchone()[0]
+        attached = self.connection.execute(
+            "SELECT 1 FROM duckdb_databases() WHERE database_name = ?", [self.OVERLAY_DATABASE]
+        ).fetchone()
+        if not attached:
+            self.connection.execute(f"ATTACH ':memory:' AS {self.OVERLAY_DATABASE} (READ_ONLY false)")
+        self._search_path = f'{self.OVERLAY_DATABASE}.main,"{database}".main'
+        self.connection.execute(f"SET search_path = '{self._search_path}'")
+
+    def cursor(self) -> duckdb.DuckDBPyConnection:
+        """호출 단위로 쓰는 연결 (스레드 간 공유 가능, search_path 설정 포함)"""
+        cursor = self.connection.cursor()
+        if self._search_path:
+            cursor.execute(f"SET search_path = '{self._search_path}'")
+        return cursor
+
+    def load_extension(self, name: str) -> None:
+        """DuckDB 확장 로드 (이미 설치돼 있으면 네트워크 접근 없이 LOAD만 수행)"""
+        if name in self._loaded_extensions:
+            return
+        try:
+            self.connection.execute(f"LOAD {name}")
+        except duckdb.Error:
+            # 로컬에 없을 때만 설치 시도
+            try:
+                self.connection.execute(f"INSTALL {name}")
+                self.connection.execute(f"LOAD {name}")
+            except duckdb.Error as e:
+                raise Exception(f"DuckDB 확장 '{name}' 로드 실패: {str(e)}")
+        self._loaded_extensions.add(name)
+
+    def _ensure_extensions(self, sql: str) -> None:
+        """쿼리에 필요한 확장만 로드 (JSON 함수 → json, 원격 Parquet 경로 → httpfs)
+
+        검색어 등 문자열 리터럴 안의 내용은 보지 않는다 (URL 검색어로 httpfs를 설치하려 하지 않도록).
+        """
+        if 'json' in self.STRING_LITERAL_PATTERN.sub("''", sql).lower():
+            self.load_extension('json')
+        parquet_paths = ' '.join(match.group(1) for match in self.PARQUET_SOURCE_PATTERN.finditer(sql))
+        if any(prefix in parquet_paths for prefix in self.REMOTE_PREFIXES):
+            self.load_extension('httpfs')
+
+    def execute_query(self, sql: str, params: Optional[List] = None) -> pd.DataFrame:
+        """SQL 쿼리 실행 (호출마다 별도 cursor를 사용하므로 여러 스레드에서 동시에 호출 가능)
         
         Args:
-            sql (str): 실행할 SQL 쿼리문
+            sql (str): 실행할 SQL 쿼리문 (값은 `?` 자리표시자로 작성)
+            params (List, optional): `?` 순서대로 바인딩할 값
         Returns:
             pd.DataFrame: 쿼리 결과
         """
         try:
-            return self.connection.execute(sql).df()
+            self._ensure_extensions(sql)
+            with self.cursor() as cursor:
+                return cursor.execute(sql, params or []).df()
         except Exception as e:
             raise Exception(f"쿼리 실행 실패: {str(e)}\nSQL: {sql}")
 
+    @staticmethod
+    def to_arrow_table(result: duckdb.DuckDBPyConnection) -> pa.Table:
+        """실행 결과를 Arrow Table로 (to_arrow_table이 없는 이전 DuckDB는 fetch_arrow_table 사용)"""
+        if hasattr(result, 'to_arrow_table'):
+            return result.to_arrow_table()
+        return result.fetch_arrow_table()
+
+    def execute_query_arrow(self, sql: str, params: Optional[List] = None) -> pa.Table:
+        """SQL 쿼리 실행 (pandas 변환 없이 Arrow Table로 반환, 호출마다 별도 cursor 사용)
+
+        Args:
+            sql (str): 실행할 SQL 쿼리문 (값은 `?` 자리표시자로 작성)
+            params (List, optional): `?` 순서대로 바인딩할 값
+        Returns:
+            pa.Table: 쿼리 결과
+        """
+        try:
+            self._ensure_extensions(sql)
+            with self.cursor() as cursor:
+                return self.to_arrow_table(cursor.execute(sql, params or []))
+        except Exception as e:
+            raise Exception(f"쿼리 실행 실패: {str(e)}\nSQL: {sql}")
+
+    def execute_query_iter(
+        self,
+        sql: str,
+        params: Optional[List] = None,
+        batch_size: int = 100_000,
+    ) -> Iterator[pa.RecordBatch]:
+        """SQL 쿼리 결과를 Arrow RecordBatch 단위로 스트리밍
+
+        결과 전체를 메모리에 올리지 않고 batch_size 행씩 가져온다.
+        별도 cursor를 사용하므로 순회 중에도 같은 연결로 다른 쿼리를 실행할 수 있다.
+
+        Args:
+            sql (str): 실행할 SQL 쿼리문
+            params (List, optional): `?` 순서대로 바인딩할 값
+            batch_size (int): RecordBatch당 최대 행 수
+        Yields:
+            pa.RecordBatch: 쿼리 결과 배치
+        """
+        cursor = self.cursor()
+        try:
+            try:
+                self._ensure_extensions(sql)
+                result = cursor.execute(sql, params or [])
+                if hasattr(result, 'to_arrow_reader'):
+                    reader = result.to_arrow_reader(batch_size)
+                else:
+                    reader = result.fetch_record_batch(batch_size)
+            except Exception as e:
+                raise Exception(f"쿼리 실행 실패: {str(e)}\nSQL: {sql}")
+            for batch in reader:
+                yield batch
+        finally:
+            cursor.close()
+
     def create_table_from_parquet(
         self, 
         table_name: str, 
-        parquet_path: str,
+        parquet_path: Union[str, List[str]],
         hive_partitioning: bool = True,
-        union_by_name: bool = True
+        union_by_name: bool = True,
+        constants: Optional[List[Optional[Dict[str, Any]]]] = None,
+        json_columns: Optional[List[List[str]]] = None
     ) -> None:
         """Parquet 파일에서 테이블 생성
         
         Args:
             table_name (str): 생성할 테이블 이름
-            parquet_path (str): Parquet 파일 경로 (와일드카드 지원)
+            parquet_path (str | List[str]): Parquet 파일 경로 (와일드카드 지원) 또는 파일 목록
             hive_partitioning (bool): Hive 파티션 사용 여부
+            constants (List[dict], optional): 파일 목록과 같은 순서의 segment별 상수 컬럼 {컬럼: 값}
+            json_columns (List[List[str]], optional): 파일별로 JSON 문자열로 읽을 중첩 컬럼
         """
         try:
             if hive_partitioning:
                 sql = f"""
                 CREATE OR REPLACE TABLE {table_name} AS 
-                SELECT * FROM read_parquet('{parquet_path}', hive_partitioning=true, union_by_name={str(union_by_name).lower()})
+                {SQLQueries.catalog_source(parquet_path, constants, True, union_by_name, json_columns)}
                 """
             else:
                 sql = SQLQueries.create_table_from_parquet_duckdb(table_name, parquet_path)
+            self._ensure_extensions(sql)
             self.connection.execute(sql)
             print(f"✅ 테이블 '{table_name}' 생성 완료")
             
         except Exception as e:
             raise Exception(f"테이블 생성 실패: {str(e)}")
 
+    def create_view_from_parquet(
+        self,
+        view_name: str,
+        parquet_path: Union[str, List[str]],
+        hive_partitioning: bool = True,
+        union_by_name: bool = True,
+        constants: Optional[List[Optional[Dict[str, Any]]]] = None,
+        json_columns: Optional[List[List[str]]] = None,
+    ) -> None:
+        """Parquet 파일을 복사하지 않고 조회하는 뷰 생성
+
+        DB 파일에는 뷰 정의만 저장되고 데이터는 매 쿼리마다 Parquet에서 직접 읽는다.
+        파티션 컬럼 조건은 Hive 파티션 pruning으로, 상수 컬럼 조건은 segment 묶음 단위로 파일을 건너뛴다.
+
+        Args:
+            view_name (str): 생성할 뷰 이름
+            parquet_path (str | List[str]): Parquet 파일 경로 (와일드카드 지원) 또는 파일 목록
+            hive_partitioning (bool): Hive 파티션 사용 여부
+            union_by_name (bool): 컬럼 이름 기준 스키마 병합 여부
+            constants (List[dict], optional): 파일 목록과 같은 순서의 segment별 상수 컬럼 {컬럼: 값}
+            json_columns (List[List[str]], optional): 파일별로 JSON 문자열로 읽을 중첩 컬럼
+        """
+        try:
+            sql = f"""
+            CREATE OR REPLACE VIEW {view_name} AS 
+            {SQLQueries.catalog_source(parquet_path, constants, hive_partitioning, union_by_name, json_columns)}
+            """
+            self._ensure_extensions(sql)
+            self.connection.execute(sql)
+            print(f"✅ 뷰 '{view_name}' 생성 완료")
+
+        except Exception as e:
+            raise Exception(f"뷰 생성 실패: {str(e)}")
+
+    def insert_from_parquet(
+        self,
+        table_name: str,
+        parquet_path: Union[str, List[str]],
+        constants: Optional[List[Optional[Dict[str, Any]]]] = None,
+        json_columns: Optional[List[List[str]]] = None,
+    ) -> None:
+        """Parquet 파일의 행을 기존 테이블에 추가 (컬럼 이름 기준, 새 컬럼은 테이블에 추가)
+
+        Args:
+            table_name (str): 대상 테이블 이름
+            parquet_path (str | List[str]): Parquet 파일 경로 (와일드카드 지원) 또는 파일 목록
+            constants (List[dict], optional): 파일 목록과 같은 순서의 segment별 상수 컬럼 {컬럼: 값}
+            json_columns (List[List[str]], optional): 파일별로 JSON 문자열로 읽을 중첩 컬럼
+        """
+        source = f"({SQLQueries.catalog_source(parquet_path, constants, json_columns=json_columns)})"
+        try:
+            self._ensure_extensions(source)
+            existing = set(self.connection.execute(f"DESCRIBE {table_name}").df()['column_name'])
+            incoming = self.connection.execute(f"DESCRIBE SELECT * FROM {source}").df()
+            for _, row in incoming.iterrows():
+                if row['column_name'] not in existing:
+                    self.connection.execute(
+                        f'ALTER TABLE {table_name} ADD COLUMN "{row["column_name"]}" {row["column_type"]}'
+                    )
+            self.connection.execute(f"INSERT INTO {table_name} BY NAME SELECT * FROM {source}")
+
+        except Exception as e:
+            raise Exception(f"테이블 행 추가 실패: {str(e)}")
+
+    def write_segments(
+        self,
+        table_name: str,
+        files: List[str],
+        asset_bytes: Optional[List[Optional[int]]] = None,
+        constant_columns: Optional[List[List[str]]] = None,
+    ) -> None:
+        """DB에 반영된 catalog segment 파일 목록 저장 (증분 구축 비교, 파티션 통계, 컬럼 존재 정보용)"""
+        segments = pa.table({
+            'file_path': pa.array(files, type=pa.string()),
+            'asset_bytes': pa.array(asset_bytes or [None] * len(files), type=pa.int64()),
+            'constant_columns': pa.array(constant_columns or [[]] * len(files), type=pa.list_(pa.string())),
+        })
+        self.connection.register("_segment_files", segments)
+        try:
+            self.connection.execute(
+                f"CREATE OR REPLACE TABLE {table_name} AS "
+                f"SELECT file_path, asset_bytes, constant_columns FROM _segment_files"
+            )
+        finally:
+            self.connection.unregister("_segment_files")
+
+    def read_segments(self, table_name: str) -> Optional[List[str]]:
+        """DB에 반영된 segment 파일 목록 (기록이 없으면 None)"""
+        try:
+            rows = self.connection.execute(f"SELECT file_path FROM {table_name}").fetchall()
+        except duckdb.CatalogException:
+            return None
+        return [row[0] for row in rows]
+
+    def create_side_table(
+        self,
+        table_name: str,
+        source: str,
+        columns: List[str],
+    ) -> None:
+        """자주 조회하는 컬럼만 물리 테이블로 저장 (뷰 모드 보조 테이블)
+
+        Args:
+            table_name (str): 생성할 테이블 이름
+            source (str): 원본 테이블/뷰 이름
+            columns (List[str]): 저장할 컬럼 목록
+        """
+        try:
+            select_cols = ', '.join(f'"{col}"' for col in columns)
+            sql = f"""
+            CREATE OR REPLACE TABLE {table_name} AS
+            SELECT {select_cols} FROM {source}
+            """
+            self.connection.execute(sql)
+            print(f"✅ 보조 테이블 '{table_name}' 생성 완료")
+
+        except Exception as e:
+            raise Exception(f"보조 테이블 생성 실패: {str(e)}")
+
+    def create_column_presence_table(
+        self,
+        table_name: str,
+        parquet_path: Union[str, List[str]],
+        segments_table: Optional[str] = None,
+    ) -> None:
+        """파티션별 컬럼 존재 여부 테이블 생성 (Parquet 메타데이터 기반)
+
+        Args:
+            table_name (str): 생성할 테이블 이름
+            parquet_path (str | List[str]): Parquet 파일 경로 (와일드카드 지원) 또는 파일 목록
+            segments_table (str, optional): write_segments()로 만든 segment 테이블 (상수 컬럼 반영)
+        """
+        try:
+            sql = SQLQueries.create_column_presence_table_duckdb(
+                table_name, parquet_path, segments_table
+            )
+            self._ensure_extensions(sql)
+            self.connection.execute(sql)
+            print(f"✅ 컬럼 존재 정보 테이블 '{table_name}' 생성 완료")
+
+        except Exception as e:
+            raise Exception(f"컬럼 존재 정보 테이블 생성 실패: {str(e)}")
+
+    def create_partition_stats_table(
+        self,
+        table_name: str,
+        parquet_path: Union[str, List[str]],
+        segments_table: str,
+    ) -> None:
+        """파티션별 통계 테이블 생성 (행 수, segment 수, Parquet/asset 크기)
+
+        Args:
+            table_name (str): 생성할 테이블 이름
+            parquet_path (str | List[str]): Parquet 파일 경로 (와일드카드 지원) 또는 파일 목록
+            segments_table (str): write_segments()로 만든 segment 테이블
+        """
+        try:
+            sql = SQLQueries.create_partition_stats_table_duckdb(
+                table_name, parquet_path, segments_table
+            )
+            self._ensure_extensions(sql)
+            self.connection.execute(sql)
+            print(f"✅ 파티션 통계 테이블 '{table_name}' 생성 완료")
+
+        except Exception as e:
+            raise Exception(f"파티션 통계 테이블 생성 실패: {str(e)}")
+
+    def create_text_docs_table(self, table: str, columns: List[str]) -> None:
+        """텍스트 색인/라벨 테이블이 공유하는 문서 테이블 `{table}_text_docs` 생성
+
+        (doc_id, hash, path, 파티션, column_name, value) 형태로 컬럼 값 하나가 문서 하나다.
+
+        Args:
+            table (str): 원본 테이블/뷰 이름
+            columns (List[str]): 문서로 저장할 컬럼 목록
+        """
+        try:
+            sql = SQLQueries.create_text_docs_table_duckdb(
+                f"{table}_text_docs", table, columns, json_columns=self.nested_columns(table)
+            )
+            self._ensure_extensions(sql)
+            self.connection.execute(sql)
+            print(f"✅ 텍스트 문서 테이블 '{table}_text_docs' 생성 완료")
+
+        except Exception as e:
+            raise Exception(f"텍스트 문서 테이블 생성 실패: {str(e)}")
+
+    def create_text_index(
+        self,
+        table: str,
+        columns: List[str],
+        ngram_size: int = 2,
+    ) -> None:
+        """텍스트 컬럼용 문자 n-gram 역색인 `{table}_text_ngrams` (gram, doc_id) 생성
+
+        create_text_docs_table로 문서 테이블을 먼저 만들어야 한다.
+
+        Args:
+            table (str): 원본 테이블/뷰 이름
+            columns (List[str]): 색인할 컬럼 목록
+            ngram_size (int): n-gram 길이 (기본 2, 한국어 음절 기준 bi-gram)
+        """
+        ngrams_table = f"{table}_text_ngrams"
+        try:
+            self.connection.execute(
+                SQLQueries.create_text_ngrams_table_duckdb(
+                    ngrams_table, f"{table}_text_docs", columns, ngram_size
+                )
+            )
+            print(f"✅ 텍스트 색인 '{ngrams_table}' 생성 완료 ({', '.join(columns)})")
+
+        except Exception as e:
+            raise Exception(f"텍스트 색인 생성 실패: {str(e)}")
+
+    def create_label_texts_table(self, table: str, column_paths: Dict[str, List[str]]) -> None:
+        """JSON 라벨 텍스트를 펼친 `{table}_label_texts` (doc_id, column_name, json_path, value) 생성
+
+        create_text_docs_table로 문서 테이블을 먼저 만들어야 한다.
+
+        Args:
+            table (str): 원본 테이블/뷰 이름
+            column_paths (Dict[str, List[str]]): {컬럼: [JSON 경로]} (경로에 `{variant}` 사용 가능)
+        """
+        label_table = f"{table}_label_texts"
+        try:
+            sql = SQLQueries.create_label_texts_table_duckdb(
+                label_table, f"{table}_text_docs", column_paths
+            )
+            self._ensure_extensions(sql)
+            self.connection.execute(sql)
+            print(f"✅ 라벨 텍스트 테이블 '{label_table}' 생성 완료")
+
+        except Exception as e:
+            raise Exception(f"라벨 텍스트 테이블 생성 실패: {str(e)}")
+
+    def create_hash_index(self, table: str) -> None:
+        """hash 조회용 정렬 색인 `{table}_hash_index` (hash, 파티션) 생성
+
+        Args:
+            table (str): 원본 테이블/뷰 이름
+        """
+        try:
+            self.connection.execute(
+                SQLQueries.create_hash_index_table_duckdb(f"{table}_hash_index", table)
+            )
+            print(f"✅ hash 색인 '{table}_hash_index' 생성 완료")
+
+        except Exception as e:
+            raise Exception(f"hash 색인 생성 실패: {str(e)}")
+
+    def write_meta(self, values: Dict[str, str]) -> None:
+        """DB 메타데이터 저장 (key-value)"""
+        self.connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.META_TABLE} (key VARCHAR PRIMARY KEY, value VARCHAR)"
+        )
+        for key, value in values.items():
+            self.connection.execute(
+                f"INSERT OR REPLACE INTO {self.META_TABLE} VALUES (?, ?)",
+                [key, None if value is None else str(value)]
+            )
+
+    def read_meta(self) -> Dict[str, str]:
+        """DB 메타데이터 조회 (테이블이 없으면 빈 dict)"""
+        try:
+            with self.cursor() as cursor:
+                rows = cursor.execute(f"SELECT key, value FROM {self.META_TABLE}").fetchall()
+        except duckdb.CatalogException:
+            return {}
+        return dict(rows)
+
     def _process_variants(
         self,
         variants: Union[str, List[str]],
@@ -135,6 +547,81 @@ class DuckDBClient:
             return pd.concat(dfs, ignore_index=True)
         return pd.DataFrame()
 
+    def derived_tables_current(self) -> bool:
+        """hash 색인, 텍스트 색인, 라벨 텍스트, 보조 테이블이 현재 catalog 세대 기준인지 확인
+
+        파생 테이블은 build_db 시점 데이터의 복사본이라, 이후 업로드가 반영된 view 모드 catalog와
+        함께 쓰면 새 행이 빠진다. catalog_generation이 설정되지 않았으면 현재 기준으로 본다.
+        """
+        if self.catalog_generation is None:
+            return True
+        db_generation = self.read_meta().get('catalog_generation')
+        return db_generation is not None and int(db_generation) == self.catalog_generation
+
+    def _label_path_patterns(self, column: str) -> List[re.Pattern]:
+        """build_db에 설정된 라벨 텍스트 경로를 정규식으로 (`{variant}`는 variant 그룹으로 캡처)"""
+        configured = json.loads(self.read_meta().get('label_text_paths', '{}'))
+        patterns = []
+        for path in configured.get(column, []):
+            parts = re.escape(path).split(re.escape('{variant}'))
+            regex = parts[0] + ''.join(
+                ('(?P<variant>[^.]+)' if index == 0 else '(?P=variant)') + part
+                for index, part in enumerate(parts[1:])
+            )
+            patterns.append(re.compile(regex + '$'))
+        return patterns
+
+    def label_text_covers(self, column: str, json_paths: List[str]) -> bool:
+        """build_db에서 만든 라벨 텍스트 테이블이 주어진 (컬럼, JSON 경로)를 모두 포함하는지 확인
+
+        설정 경로의 `{variant}`는 임의의 variant 이름과 매칭된다.
+        DB가 현재 catalog 세대 기준이 아니면 False.
+        """
+        if not self.derived_tables_current():
+            return False
+        patterns = self._label_path_patterns(column)
+        return bool(patterns) and all(
+            any(pattern.match(json_path) for pattern in patterns) for json_path in json_paths
+        )
+
+    def label_path_variant(self, column: str, json_path: str) -> Optional[str]:
+        """JSON 경로가 `{variant}` 설정 경로로만 매칭되면 경로 안의 variant 값 (아니면 None)
+
+        라벨 텍스트 테이블은 `{variant}`를 각 행의 variant로 치환해 펼치므로 해당 경로에는
+        그 variant 행만 들어 있다. 전체 스캔도 같은 행만 보도록 조건을 맞출 때 사용한다.
+        """
+        matched = None
+        for pattern in self._label_path_patterns(column):
+            match = pattern.match(json_path)
+            if match is None:
+                continue
+            if 'variant' not in pattern.groupindex:
+                return None
+            matched = match.group('variant')
+        return matched
+
+    def label_conditions(
+        self,
+        builder: CatalogQueryBuilder,
+        conditions: Query,
+        column: str,
+        json_path: str,
+    ) -> Query:
+        """라벨 텍스트 테이블과 같은 행 범위가 되도록 `{variant}` 경로의 variant 조건 추가"""
+        variant = self.label_path_variant(column, json_path)
+        if variant is None:
+            return conditions
+        return builder.combine_conditions(conditions, builder.conditions_from_dict({'variant': variant}))
+
+    def text_index_ngram_size(self, column: str) -> Optional[int]:
+        """컬럼에 n-gram 색인이 있으면 n-gram 길이, 없으면 None (DB가 현재 catalog 세대 기준이 아니면 None)"""
+        if not self.derived_tables_current():
+            return None
+        meta = self.read_meta()
+        if column not in json.loads(meta.get('text_index_columns', '[]')):
+            return None
+        return int(meta.get('text_ngram_size', 2))
+
     def search_valid_content(
         self,
         table: str,
@@ -143,6 +630,9 @@ class DuckDBClient:
         partition_conditions: Optional[Dict[str, str]] = None
     ) -> pd.DataFrame:
         """유효한 라벨 데이터 검색
+
+        라벨 텍스트 테이블이 있으면 모든 variant를 한 번의 조회로 처리한다.
+        라벨 텍스트 경로가 `{variant}`로 설정되어 있으면 어느 쪽이든 해당 variant 행만 찾는다.
         
         Args:
             table (str): 검색할 테이블 이름
@@ -153,15 +643,32 @@ class DuckDBClient:
         Returns:
             pd.DataFrame: 검색된 데이터
         """
+        if isinstance(variants, str):
+            variants = [variants]
+        json_paths = [f'$.{variant}.text.content' for variant in variants]
+
+        builder = CatalogQueryBuilder(table)
+        conditions = builder.conditions_from_dict(partition_conditions or {})
+
+        if self.label_text_covers(column, json_paths):
+            query = builder.label_text_search(
+                column=column,
+                json_paths=json_paths,
+                conditions=conditions,
+            )
+            return self.execute_query(query.sql, query.params)
+
+        nested = column in self.nested_columns(table)
+
         def query_func(variant: str, **kwargs) -> pd.DataFrame:
-            json_loc = f'$.{variant}.text.content'
-            sql = SQLQueries.extract_valid_content(
-                table=table,
+            json_path = f'$.{variant}.text.content'
+            query = builder.valid_content(
                 column=column,
-                json_loc=json_loc,
-                partition_conditions=partition_conditions
+                json_path=json_path,
+                conditions=self.label_conditions(builder, conditions, column, json_path),
+                nested=nested,
             )
-            return self.execute_query(sql)
+            return self.execute_query(query.sql, query.params)
 
         return self._process_variants(
             variants=variants,
@@ -177,6 +684,9 @@ class DuckDBClient:
         partition_conditions: Optional[Dict[str, str]] = None
     ) -> pd.DataFrame:
         """특정 텍스트가 포함된 라벨 데이터 검색
+
+        라벨 텍스트 테이블이 있으면 모든 variant를 한 번의 조회로 처리한다.
+        라벨 텍스트 경로가 `{variant}`로 설정되어 있으면 어느 쪽이든 해당 variant 행만 찾는다.
         
         Args:
             table (str): 검색할 테이블 이름
@@ -188,17 +698,34 @@ class DuckDBClient:
         Returns:
             pd.DataFrame: 검색된 데이터
         """
+        if isinstance(variants, str):
+            variants = [variants]
+        json_paths = [f'$.{variant}.text.content' for variant in variants]
+        builder = CatalogQueryBuilder(table)
+        conditions = builder.conditions_from_dict(partition_conditions or {})
+
+        if self.label_text_covers(column, json_paths):
+            query = builder.label_text_search(
+                column=column,
+                json_paths=json_paths,
+                search_text=search_text,
+                conditions=conditions,
+                ngram_size=self.text_index_ngram_size(column),
+            )
+            return self.execute_query(query.sql, query.params)
+
+        nested = column in self.nested_columns(table)
+
         def query_func(variant: str, **kwargs) -> pd.DataFrame:
-            json_loc = f'$.{variant}.text.content'
-            sql = SQLQueries.extract_text_in_content(
-                table=table,
+            json_path = f'$.{variant}.text.content'
+            query = builder.text_search(
                 column=column,
-                json_loc=json_loc,
                 search_text=search_text,
-                partition_conditions=partition_conditions,
-                engine="duckdb"  # DuckDB 엔진 사용
+                json_path=json_path,
+                conditions=self.label_conditions(builder, conditions, column, json_path),
+                nested=nested,
             )
-            return self.execute_query(sql)
+            return self.execute_query(query.sql, query.params)
 
         return self._process_variants(
             variants=variants,
@@ -206,9 +733,15 @@ class DuckDBClient:
         )
 
     def retrieve_partitions(self, table: str = "catalog") -> pd.DataFrame:
-        """모든 파티션 조합 조회"""
-        sql = SQLQueries.get_distinct_partitions(table)
-        return self.execute_query(sql)
+        """모든 파티션 조합 조회 (`{table}_partition_stats`가 있으면 스캔 없이 통계 테이블 사용)"""
+        return self.execute_query(self.partitions_sql(table))
+
+    def partitions_sql(self, table: str = "catalog") -> str:
+        """파티션 목록 조회 SQL (통계 테이블 우선)"""
+        stats_table = f"{table}_partition_stats"
+        if stats_table in self.list_tables()['name'].values:
+            return SQLQueries.get_partition_stats(stats_table)
+        return SQLQueries.get_distinct_partitions(table)
 
     def retrieve_with_existing_cols(
         self,
@@ -219,81 +752,158 @@ class DuckDBClient:
         table: str = "catalog",
         limit: Optional[int] = None,
     ) -> pd.DataFrame:
-        """존재하는 컬럼만 포함해서 조회"""
-        if isinstance(providers, str):
-            providers = [providers]
-        if isinstance(datasets, str):
-            datasets = [datasets]
-        if isinstance(tasks, str):
-            tasks = [tasks]
-        if isinstance(variants, str):
-            variants = [variants]
-        
-        if providers is None:
-            providers = []
-        if datasets is None:
-            datasets = []
-        if tasks is None:
-            tasks = []
-        if variants is None:
-            variants = []
-            
-        providers = [i for i in providers if i]
-        datasets = [i for i in datasets if i]
-        tasks = [i for i in tasks if i]
-        variants = [i for i in variants if i]
-            
-        # WHERE 조건 구성
-        conditions = []
-        
-        if providers:
-            provider_condition = " OR ".join([f"provider = '{i}'" for i in providers])
-            conditions.append(f"({provider_condition})")
-
-        if datasets:
-            dataset_condition = " OR ".join([f"dataset = '{i}'" for i in datasets])
-            conditions.append(f"({dataset_condition})")
-
-        if tasks:
-            task_condition = " OR ".join([f"task = '{i}'" for i in tasks])
-            conditions.append(f"({task_condition})")
-            
-        if variants:
-            variant_condition = " OR ".join([f"variant = '{i}'" for i in variants])
-            conditions.append(f"({variant_condition})")
+        """존재하는 컬럼만 포함해서 조회
 
+        파티션 값은 `IN (?, ...)` 파라미터로 바인딩되므로 따옴표가 포함된 이름도 안전하다.
+        """
         try:
-            # 테이블 스키마 확인
-            table_info = self.get_table_info(table)
-            if table_info.empty:
+            query = self.existing_cols_query(providers, datasets, tasks, variants, table, limit)
+            if query is None:
                 return pd.DataFrame()
-
-            # 모든 컬럼명 가져오기
-            all_columns = table_info['column_name'].tolist()
-
-            # 실제 데이터에서 NULL이 아닌 값이 있는 컬럼 확인
-            non_null_cols = []
-            for col in all_columns:
-                check_sql = f"SELECT COUNT(*) as count FROM {table} WHERE {col} IS NOT NULL"
-                if conditions:
-                    check_sql += f" AND {' AND '.join(conditions)}"
-
-                result = self.execute_query(check_sql)
-                if result['count'].iloc[0] > 0:
-                    non_null_cols.append(col)
-
-            # 존재하는 컬럼만으로 조회
-            sql = f"SELECT {', '.join(non_null_cols)} FROM {table}"
-            if conditions:
-                sql += f" WHERE {' AND '.join(conditions)}"
-            if limit is not None:
-                sql += f" LIMIT {limit}"
-            
-            return self.execute_query(sql)
+            return self.execute_query(query.sql, query.params)
         except Exception as e:
             print(f"컬럼 조회 실패: {str(e)}")
             return pd.DataFrame()
 
+    def existing_cols_query(
+        self,
+        providers: List = [],
+        datasets: List = [],
+        tasks: List = [],
+        variants: List = [],
+        table: str = "catalog",
+        limit: Optional[int] = None,
+    ) -> Optional[Query]:
+        """조건에 맞는 행에서 값이 있는 컬럼만 조회하는 쿼리 (해당 컬럼이 없으면 None)"""
+        builder = CatalogQueryBuilder(table)
+        conditions = builder.partition_conditions(
+            providers=providers,
+            datasets=datasets,
+            tasks=tasks,
+            variants=variants,
+        )
+
+        # 테이블 스키마 확인
+        table_info = self.get_table_info(table)
+        if table_info.empty:
+            return None
+
+        # 모든 컬럼명 가져오기
+        all_columns = table_info['column_name'].tolist()
+
+        # 실제 데이터에서 NULL이 아닌 값이 있는 컬럼 확인
+        non_null_cols = self._get_non_null_columns(table, all_columns, conditions)
+        if not non_null_cols:
+            return None
+
+        # 존재하는 컬럼만으로 조회
+        return builder.select(non_null_cols, conditions, limit=limit)
+
+    def _get_non_null_columns(
+        self,
+        table: str,
+        all_columns: List[str],
+        conditions: Query,
+    ) -> List[str]:
+        """조건에 맞는 행 중 NULL이 아닌 값이 하나라도 있는 컬럼 목록
+
+        build_db에서 만든 컬럼 존재 정보 테이블이 있으면 그 테이블만 조회하고,
+        없으면 모든 컬럼의 COUNT를 한 번의 집계 쿼리로 계산한다.
+        결과는 catalog 세대와 파티션 조건별로 캐시된다.
+        """
+        cache_key = (
+            table,
+            self.read_meta().get('catalog_generation'),
+            conditions.sql,
+            tuple(conditions.params),
+        )
+        if cache_key in self._non_null_cache:
+            return list(self._non_null_cache[cache_key])
+
+        where_sql = f" WHERE {conditions.sql}" if conditions.sql else ""
+        presence_table = f"{table}_column_presence"
+
+        if presence_table in self.list_tables()['name'].values:
+            sql = f"""
+            SELECT column_name FROM {presence_table}{where_sql}
+            GROUP BY column_name
+            HAVING SUM(non_null_count) > 0
+            """
+            with self.cursor() as cursor:
+                rows = cursor.execute(sql, conditions.params).fetchall()
+            present = {row[0] for row in rows}
+            has_rows = bool(present)
+            non_null_cols = [
+                col for col in all_columns
+                if col in present or (has_rows and col in self.PARTITION_COLUMNS)
+            ]
+        else:
+            query = CatalogQueryBuilder(table).count_non_null(all_columns, conditions)
+            with self.cursor() as cursor:
+                row = cursor.execute(query.sql, query.params).fetchone()
+            non_null_cols = [col for col, count in zip(all_columns, row) if count > 0]
+
+        self._non_null_cache[cache_key] = non_null_cols
+        return list(non_null_cols)
+
+    def lookup_by_hash(
+        self,
+        hashes: List[str],
+        table: str = "catalog",
+        columns: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """hash 목록에 해당하는 모든 행 조회 (모든 task/variant 대상)
+
+        hash 목록은 Arrow 테이블로 등록해 임시 테이블로 만든 뒤 조인하므로
+        수백만 개도 SQL 문자열 없이 처리된다. `{table}_hash_index`가 있고 현재 catalog 세대 기준이면
+        먼저 해당 hash가 있는 파티션만 찾아 원본 조회 범위를 좁힌다.
+
+        Args:
+            hashes (List[str]): 조회할 hash 목록
+            table (str): 조회할 테이블/뷰 이름
+            columns (List[str], optional): 반환할 컬럼 (None이면 전체)
+
+        Returns:
+            pd.DataFrame: 조회 결과
+        """
+        builder = CatalogQueryBuilder(table)
+        lookup_table = f"_hash_lookup_{uuid.uuid4().hex[:8]}"
+        cursor = self.cursor()
+        try:
+            cursor.register(f"{lookup_table}_src", pa.table({'hash': pa.array(hashes, type=pa.string())}))
+            cursor.execute(
+                f"CREATE TEMP TABLE {lookup_table} AS SELECT DISTINCT hash FROM {lookup_table}_src"
+            )
+
+            conditions = Query("", [])
+            if (
+                f"{table}_hash_index" in self.list_tables()['name'].values
+                and self.derived_tables_current()
+            ):
+                partitions = cursor.execute(f"""
+                    SELECT DISTINCT provider, dataset, task, variant
+                    FROM {table}_hash_index
+                    WHERE hash IN (SELECT hash FROM {lookup_table})
+                """).df()
+                if partitions.empty:
+                    return pd.DataFrame(columns=columns or [])
+                conditions = builder.conditions_from_dict({
+                    col: partitions[col].dropna().unique().tolist()
+                    for col in self.PARTITION_COLUMNS
+                })
+
+            query = builder.select(columns, conditions)
+            where = "WHERE" if not conditions.sql else "AND"
+            sql = f"{query.sql} {where} hash IN (SELECT hash FROM {lookup_table})"
+            self._ensure_extensions(sql)
+            return cursor.execute(sql, query.params).df()
+        except Exception as e:
+            raise Exception(f"hash 조회 실패: {str(e)}")
+        finally:
+            cursor.execute(f"DROP TABLE IF EXISTS {lookup_table}")
+            cursor.unregister(f"{lookup_table}_src")
+            cursor.close()
+
     def close(self) -> None:
         """연결 종료"""
         if self.connection:
@@ -315,6 +925,16 @@ class DuckDBClient:
             print(f"테이블 정보 조회 실패: {str(e)}")
             return pd.DataFrame()
 
+    def nested_columns(self, table: str) -> List[str]:
+        """struct/list/map 같은 중첩 타입 컬럼 목록"""
+        table_info = self.get_table_info(table)
+        if table_info.empty:
+            return []
+        return [
+            row['column_name'] for _, row in table_info.iterrows()
+            if row['column_type'].startswith(('STRUCT', 'MAP', 'UNION')) or row['column_type'].endswith(']')
+        ]
+
     def list_tables(self) -> pd.DataFrame:
         """데이터베이스의 모든 테이블 목록 조회"""
         try:
@@ -1 +1,2 @@
-from .sql_queries import SQLQueries
\ No newline at end of file
+from .sql_queries import SQLQueries
+from .query_builder import CatalogQueryBuilder, Query
\ No newline at end of file
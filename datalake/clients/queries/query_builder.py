@@ -0,0 +1,447 @@
+"""파라미터 바인딩 기반 catalog 검색 쿼리 생성기"""
+
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+
+class Query(NamedTuple):
+    """실행할 SQL과 바인딩 파라미터 (`?` 순서대로)"""
+    sql: str
+    params: List[Any]
+
+
+class CatalogQueryBuilder:
+    """catalog 검색용 파라미터화 쿼리 생성기
+
+    값은 항상 `?` 파라미터로 바인딩하므로 데이터셋 이름 등에 따옴표가 있어도 안전하다.
+    SQL 문자열은 (컬럼, 조건 개수, limit 여부) 같은 모양에만 의존하므로
+    같은 모양의 반복 검색은 동일한 문장을 재사용한다.
+
+    Example:
+        >>> builder = CatalogQueryBuilder("catalog")
+        >>> conditions = builder.partition_conditions(providers=["aihub"], tasks=["ocr", "raw"])
+        >>> builder.select(["hash", "path"], conditions, limit=10)
+        Query(sql='SELECT "hash", "path" FROM catalog WHERE "provider" IN (?) AND "task" IN (?, ?) LIMIT ?',
+              params=['aihub', 'ocr', 'raw', 10])
+    """
+
+    PARTITION_COLUMNS = ['provider', 'dataset', 'task', 'variant']
+    SAMPLE_METHODS = ('reservoir', 'bernoulli', 'system')
+
+    def __init__(self, table: str = "catalog"):
+        self.table = table
+
+    @staticmethod
+    def quote_identifier(name: str) -> str:
+        """컬럼 이름을 SQL 식별자로 인용"""
+        return '"' + name.replace('"', '""') + '"'
+
+    @staticmethod
+    def normalize_values(values) -> List[str]:
+        """str/None/리스트 입력을 빈 값이 제거된 리스트로 정규화"""
+        if values is None:
+            return []
+        if isinstance(values, str):
+            values = [values]
+        return [value for value in values if value]
+
+    def partition_conditions(
+        self,
+        providers: Optional[Sequence[str]] = None,
+        datasets: Optional[Sequence[str]] = None,
+        tasks: Optional[Sequence[str]] = None,
+        variants: Optional[Sequence[str]] = None,
+    ) -> Query:
+        """파티션 필터 조건 생성
+
+        Returns:
+            Query: sql에는 AND로 연결할 조건 (조건이 없으면 빈 문자열)
+        """
+        values_by_column = {
+            'provider': self.normalize_values(providers),
+            'dataset': self.normalize_values(datasets),
+            'task': self.normalize_values(tasks),
+            'variant': self.normalize_values(variants),
+        }
+        return self.conditions_from_dict(values_by_column)
+
+    def conditions_from_dict(self, values_by_column: Dict[str, Any]) -> Query:
+        """{컬럼: 값 또는 값 리스트} 형태의 조건 생성 (값이 비어 있는 컬럼은 무시)"""
+        columns = []
+        params = []
+        for column, values in values_by_column.items():
+            values = self.normalize_values(values)
+            if values:
+                columns.append((column, len(values)))
+                params.extend(values)
+        return Query(_in_conditions_sql(tuple(columns)), params)
+
+    @staticmethod
+    def combine_conditions(*conditions: Query) -> Query:
+        """여러 조건을 AND로 결합 (빈 조건은 무시)"""
+        return Query(
+            ' AND '.join(condition.sql for condition in conditions if condition.sql),
+            [param for condition in conditions for param in condition.params],
+        )
+
+    def select(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        conditions: Optional[Query] = None,
+        limit: Optional[int] = None,
+        table: Optional[str] = None,
+    ) -> Query:
+        """SELECT 쿼리 생성 (columns가 None이면 전체 컬럼)"""
+        conditions = conditions or Query("", [])
+        select_cols = ', '.join(self.quote_identifier(col) for col in columns) if columns else '*'
+        sql = f"SELECT {select_cols} FROM {table or self.table}"
+        params = list(conditions.params)
+        if conditions.sql:
+            sql += f" WHERE {conditions.sql}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        return Query(sql, params)
+
+    def count_non_null(
+        self,
+        columns: Sequence[str],
+        conditions: Optional[Query] = None,
+        table: Optional[str] = None,
+    ) -> Query:
+        """컬럼별 non-null 개수를 한 번의 집계로 계산하는 쿼리"""
+        conditions = conditions or Query("", [])
+        counts = ', '.join(f"COUNT({self.quote_identifier(col)})" for col in columns)
+        sql = f"SELECT {counts} FROM {table or self.table}"
+        if conditions.sql:
+            sql += f" WHERE {conditions.sql}"
+        return Query(sql, list(conditions.params))
+
+    def text_search(
+        self,
+        column: str,
+        search_text: str,
+        json_path: Optional[str] = None,
+        conditions: Optional[Query] = None,
+        limit: Optional[int] = None,
+        table: Optional[str] = None,
+        nested: bool = False,
+    ) -> Query:
+        """컬럼 텍스트 검색 쿼리 (json_path가 있으면 해당 JSON 배열 원소에서 검색)
+
+        검색어는 `LIKE '%검색어%'` 패턴으로 바인딩되므로 검색어 안의 %, _ 는 와일드카드로 동작한다.
+        nested=True면 struct/list 컬럼을 JSON 문자열로 변환해 검색한다.
+        """
+        conditions = conditions or Query("", [])
+        table = table or self.table
+        col = self.quote_identifier(column)
+        value_expr = f"CAST(to_json({col}) AS VARCHAR)" if nested else col
+        base_conditions = [f"{col} IS NOT NULL"]
+        if conditions.sql:
+            base_conditions.append(conditions.sql)
+
+        if json_path is None:
+            sql = f"""
+            SELECT DISTINCT hash, path, {col}
+            FROM {table}
+            WHERE {' AND '.join(base_conditions)} AND {value_expr} LIKE ?
+            """
+            params = list(conditions.params) + [self.like_pattern(search_text)]
+        else:
+            sql = f"""
+            WITH extracted_content AS (
+                SELECT
+                    hash,
+                    path,
+                    {col},
+                    unnest(cast(json_extract({value_expr}, ?) as varchar[])) as content
+                FROM {table}
+                WHERE {' AND '.join(base_conditions)}
+                    AND json_array_length(json_extract({value_expr}, ?)) > 0
+            )
+            SELECT DISTINCT hash, path, {col}
+            FROM extracted_content
+            WHERE content LIKE ?
+            """
+            params = [json_path] + list(conditions.params) + [json_path, self.like_pattern(search_text)]
+
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        return Query(sql, params)
+
+    def valid_content(
+        self,
+        column: str,
+        json_path: str,
+        conditions: Optional[Query] = None,
+        table: Optional[str] = None,
+        nested: bool = False,
+    ) -> Query:
+        """JSON 경로의 배열에 값이 하나라도 있는 행 조회 쿼리"""
+        conditions = conditions or Query("", [])
+        col = self.quote_identifier(column)
+        value_expr = f"CAST(to_json({col}) AS VARCHAR)" if nested else col
+        where = [f"{col} IS NOT NULL", f"json_array_length(json_extract({value_expr}, ?)) > 0"]
+        if conditions.sql:
+            where.append(conditions.sql)
+        sql = f"""
+            SELECT DISTINCT hash, path, {col}
+            FROM {table or self.table}
+            WHERE {' AND '.join(where)}
+            """
+        return Query(sql, [json_path] + list(conditions.params))
+
+    @staticmethod
+    def like_pattern(search_text: str) -> str:
+        """부분 일치 LIKE 패턴 (검색어의 %, _ 는 와일드카드로 남김)"""
+        return f"%{search_text}%"
+
+    @staticmethod
+    def ngrams(text: str, ngram_size: int = 2) -> List[str]:
+        """검색어를 문자 n-gram으로 분해 (중복 제거, 순서 유지)
+
+        LIKE 와일드카드(%, _)를 걸치는 n-gram은 만들지 않고 그 사이 문자열에서만 뽑는다.
+        """
+        return list(dict.fromkeys(
+            part[i:i + ngram_size]
+            for part in re.split(r"[%_]", text)
+            for i in range(len(part) - ngram_size + 1)
+        ))
+
+    def indexed_text_search(
+        self,
+        column: str,
+        search_text: str,
+        json_path: Optional[str] = None,
+        ngram_size: int = 2,
+        limit: Optional[int] = None,
+    ) -> Optional[Query]:
+        """n-gram 색인으로 후보 문서를 좁힌 뒤 원문으로 검증하는 텍스트 검색 쿼리
+
+        검색어의 모든 n-gram을 가진 문서만 후보로 남기고, 후보에 대해서만
+        LIKE(또는 JSON 경로 추출 후 LIKE)로 실제 포함 여부를 확인한다.
+
+        Returns:
+            Optional[Query]: 색인을 쓸 수 없는 검색어면 None (와일드카드 사이 문자열이 모두 n-gram보다 짧거나,
+                JSON 검색에서 원문 JSON 문자열에 이스케이프되어 저장되는 문자를 포함한 경우)
+        """
+        grams = self.ngrams(search_text, ngram_size)
+        if not grams:
+            return None
+        if json_path is not None and self.has_json_escaped_chars(search_text):
+            return None
+
+        col = self.quote_identifier(column)
+        candidates_sql, params = self._ngram_candidates_cte(grams)
+        candidates_sql = f"""
+            WITH {candidates_sql},
+            candidate_docs AS (
+                SELECT d.hash, d.path, d.value
+                FROM {self.table}_text_docs d
+                JOIN candidates c ON d.doc_id = c.doc_id
+                WHERE d.column_name = ?
+            )"""
+        params.append(column)
+
+        if json_path is None:
+            sql = f"""{candidates_sql}
+            SELECT DISTINCT hash, path, value AS {col}
+            FROM candidate_docs
+            WHERE value LIKE ?
+            """
+            params.append(self.like_pattern(search_text))
+        else:
+            sql = f"""{candidates_sql},
+            extracted_content AS (
+                SELECT hash, path, value,
+                    unnest(cast(json_extract(value, ?) as varchar[])) as content
+                FROM candidate_docs
+                WHERE json_array_length(json_extract(value, ?)) > 0
+            )
+            SELECT DISTINCT hash, path, value AS {col}
+            FROM extracted_content
+            WHERE content LIKE ?
+            """
+            params.extend([json_path, json_path, self.like_pattern(search_text)])
+
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        return Query(sql, params)
+
+    def label_text_search(
+        self,
+        column: str,
+        json_paths: Sequence[str],
+        search_text: Optional[str] = None,
+        conditions: Optional[Query] = None,
+        ngram_size: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> Query:
+        """build_db에서 펼쳐 둔 라벨 텍스트 테이블 조회 쿼리
+
+        여러 JSON 경로(variant)를 한 문장으로 조회한다. search_text가 None이면
+        경로에 값이 하나라도 있는 행(유효 라벨), 있으면 해당 텍스트를 포함한 행을 찾는다.
+        ngram_size가 주어지면 n-gram 색인으로 후보 문서를 먼저 좁힌다.
+        """
+        conditions = conditions or Query("", [])
+        col = self.quote_identifier(column)
+        json_paths = list(json_paths)
+        ctes = ""
+        params: List[Any] = []
+        where = [
+            "l.column_name = ?",
+            f"l.json_path IN ({', '.join(['?'] * len(json_paths))})",
+        ]
+        where_params: List[Any] = [column] + json_paths
+
+        if search_text is not None:
+            where.append("l.value LIKE ?")
+            where_params.append(self.like_pattern(search_text))
+            # n-gram 색인은 원문 JSON 문자열 기준이므로 이스케이프되는 문자가 있으면 사용하지 않음
+            grams = self.ngrams(search_text, ngram_size) if ngram_size else []
+            if grams and not self.has_json_escaped_chars(search_text):
+                candidates_sql, params = self._ngram_candidates_cte(grams)
+                ctes = f"WITH {candidates_sql}"
+                where.append("l.doc_id IN (SELECT doc_id FROM candidates)")
+
+        if conditions.sql:
+            where.append(conditions.sql)
+            where_params.extend(conditions.params)
+
+        sql = f"""
+            {ctes}
+            SELECT DISTINCT d.hash, d.path, d.value AS {col}
+            FROM {self.table}_label_texts l
+            JOIN {self.table}_text_docs d ON l.doc_id = d.doc_id
+            WHERE {' AND '.join(where)}
+            """
+        params.extend(where_params)
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        return Query(sql, params)
+
+    def sample(
+        self,
+        query: Query,
+        rows: Optional[int] = None,
+        fraction: Optional[float] = None,
+        method: Optional[str] = None,
+        seed: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> Query:
+        """쿼리 결과를 DuckDB 안에서 샘플링 (`USING SAMPLE`)
+
+        rows를 주면 정확히 rows개(reservoir), fraction을 주면 각 행을 fraction 확률로(bernoulli) 뽑는다.
+        seed를 주면 같은 DB에서 항상 같은 샘플이 나온다.
+        """
+        clause = self.sample_clause(rows=rows, fraction=fraction, method=method, seed=seed)
+        sql = f"SELECT * FROM ({query.sql}) AS sampled USING SAMPLE {clause}"
+        params = list(query.params)
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        return Query(sql, params)
+
+    def stratified_sample(
+        self,
+        query: Query,
+        quotas: Sequence[Tuple[Sequence[str], Union[int, float]]],
+        method: Optional[str] = None,
+        seed: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> Query:
+        """파티션별 할당량만큼 DuckDB 안에서 샘플링 (파티션마다 `USING SAMPLE` 후 UNION ALL)
+
+        Args:
+            query: 샘플링할 쿼리 (결과에 파티션 컬럼이 있어야 함)
+            quotas: [((provider, dataset, task, variant), 할당량)] — int면 행 수, float면 비율
+        """
+        partition_filter = ' AND '.join(
+            f"{self.quote_identifier(col)} = ?" for col in self.PARTITION_COLUMNS
+        )
+        branches = []
+        params = list(query.params)
+        for partition, quota in quotas:
+            if isinstance(quota, float):
+                clause = self.sample_clause(fraction=quota, method=method, seed=seed)
+            else:
+                clause = self.sample_clause(rows=quota, method=method, seed=seed)
+            branches.append(
+                f"(SELECT * FROM (SELECT * FROM base WHERE {partition_filter}) USING SAMPLE {clause})"
+            )
+            params.extend(partition)
+
+        if not branches:
+            # 샘플링할 파티션이 없으면 빈 결과 (컬럼 구성은 유지)
+            branches.append("(SELECT * FROM base WHERE false)")
+
+        sql = f"""
+            WITH base AS ({query.sql})
+            SELECT * FROM ({' UNION ALL '.join(branches)}) AS sampled
+            """
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        return Query(sql, params)
+
+    @classmethod
+    def sample_clause(
+        cls,
+        rows: Optional[int] = None,
+        fraction: Optional[float] = None,
+        method: Optional[str] = None,
+        seed: Optional[int] = None,
+    ) -> str:
+        """`USING SAMPLE` 뒤에 올 샘플 크기/방식 문자열 (값은 검증 후 숫자로만 삽입)"""
+        if (rows is None) == (fraction is None):
+            raise ValueError("샘플 크기는 rows와 fraction 중 하나만 지정해야 합니다")
+
+        if rows is not None:
+            method = method or 'reservoir'
+            if method != 'reservoir':
+                raise ValueError(f"행 수 샘플링은 reservoir 방식만 지원합니다: {method}")
+            rows = int(rows)
+            if rows < 0:
+                raise ValueError(f"샘플 행 수는 0 이상이어야 합니다: {rows}")
+            size = f"{rows} ROWS"
+        else:
+            method = method or 'bernoulli'
+            fraction = float(fraction)
+            if not 0 < fraction <= 1:
+                raise ValueError(f"샘플 비율은 0과 1 사이의 값이어야 합니다: {fraction}")
+            size = f"{fraction * 100:.10g} PERCENT"
+
+        if method not in cls.SAMPLE_METHODS:
+            raise ValueError(f"지원하지 않는 샘플링 방식: {method} (가능: {', '.join(cls.SAMPLE_METHODS)})")
+        if seed is None:
+            return f"{size} ({method})"
+        return f"{size} ({method}, {int(seed)})"
+
+    @staticmethod
+    def has_json_escaped_chars(text: str) -> bool:
+        """JSON 문자열로 저장될 때 이스케이프되는 문자(따옴표, 역슬래시, 제어문자) 포함 여부"""
+        return any(ch in '"\\' or ord(ch) < 0x20 for ch in text)
+
+    def _ngram_candidates_cte(self, grams: List[str]) -> Tuple[str, List[Any]]:
+        """모든 n-gram을 포함한 문서만 남기는 `candidates` CTE"""
+        sql = f"""candidates AS (
+                SELECT doc_id
+                FROM {self.table}_text_ngrams
+                WHERE gram IN ({', '.join(['?'] * len(grams))})
+                GROUP BY doc_id
+                HAVING COUNT(DISTINCT gram) = ?
+            )"""
+        return sql, list(grams) + [len(grams)]
+
+
+@lru_cache(maxsize=256)
+def _in_conditions_sql(columns: Tuple[Tuple[str, int], ...]) -> str:
+    """(컬럼, 값 개수) 모양별 IN 조건 문자열 (모양이 같으면 같은 문자열 재사용)"""
+    return ' AND '.join(
+        f"{CatalogQueryBuilder.quote_identifier(column)} IN ({', '.join(['?'] * count)})"
+        for column, count in columns
+    )
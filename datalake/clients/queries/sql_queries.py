@@ -1,9 +1,83 @@
 """JSON 관련 Athena 쿼리 템플릿"""
 
-from typing import Dict, Any
+import json
+from typing import Dict, Any, List, Optional, Union
 
 class SQLQueries:
 
+    @staticmethod
+    def escape_literal(value: Any) -> str:
+        """SQL 문자열 리터럴용 이스케이프 (작은따옴표 중복)"""
+        return str(value).replace("'", "''")
+
+    @staticmethod
+    def parquet_source(parquet_path: Union[str, List[str]]) -> str:
+        """read_parquet()/parquet_metadata() 경로 인자 (경로 패턴 문자열 또는 파일 목록)"""
+        if isinstance(parquet_path, (list, tuple)):
+            return "[" + ", ".join(f"'{SQLQueries.escape_literal(path)}'" for path in parquet_path) + "]"
+        return f"'{SQLQueries.escape_literal(parquet_path)}'"
+
+    @staticmethod
+    def constant_literal(value: Any) -> str:
+        """상수 컬럼 값의 SQL 리터럴 (문자열 외 dict/list 등은 JSON 문자열)"""
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        if isinstance(value, (int, float)):
+            return repr(value)
+        if not isinstance(value, str):
+            value = json.dumps(value, ensure_ascii=False)
+        return f"'{SQLQueries.escape_literal(value)}'"
+
+    @staticmethod
+    def catalog_source(
+        parquet_path: Union[str, List[str]],
+        constants: Optional[List[Optional[Dict[str, Any]]]] = None,
+        hive_partitioning: bool = True,
+        union_by_name: bool = True,
+        json_columns: Optional[List[List[str]]] = None,
+    ) -> str:
+        """catalog segment를 읽는 SELECT (segment별 상수 컬럼은 리터럴 컬럼으로 추가)
+
+        constants는 parquet_path 파일 목록과 같은 순서의 {컬럼: 값} 목록이다.
+        값이 같은 파일끼리 read_parquet 하나로 묶고 UNION ALL BY NAME으로 합치므로,
+        상수 컬럼 조건(lang = 'ko' 등)은 값이 다른 묶음을 파일을 열지 않고 건너뛴다.
+        json_columns(파일별 목록)의 중첩 컬럼은 to_json으로 읽어 문자열 파일과 타입을 맞춘다.
+        """
+        options = (
+            f"hive_partitioning={str(hive_partitioning).lower()}, "
+            f"union_by_name={str(union_by_name).lower()}"
+        )
+        if not any(constants or []) and not any(json_columns or []):
+            return f"SELECT * FROM read_parquet({SQLQueries.parquet_source(parquet_path)}, {options})"
+
+        constants = constants or [None] * len(parquet_path)
+        json_columns = json_columns or [[]] * len(parquet_path)
+        groups = {}
+        for path, values, to_json_columns in zip(parquet_path, constants, json_columns):
+            values = values or {}
+            to_json_columns = sorted(to_json_columns or [])
+            key = json.dumps([values, to_json_columns], sort_keys=True, ensure_ascii=False)
+            groups.setdefault(key, (values, to_json_columns, []))[2].append(path)
+
+        branches = []
+        for values, to_json_columns, paths in groups.values():
+            star = '*'
+            if to_json_columns:
+                replaced = []
+                for column in to_json_columns:
+                    identifier = '"' + column.replace('"', '""') + '"'
+                    replaced.append(f"to_json({identifier})::VARCHAR AS {identifier}")
+                star = f"* REPLACE ({', '.join(replaced)})"
+            projections = [star]
+            for column, value in sorted(values.items()):
+                identifier = '"' + column.replace('"', '""') + '"'
+                projections.append(f"{SQLQueries.constant_literal(value)} AS {identifier}")
+            branches.append(
+                f"SELECT {', '.join(projections)} "
+                f"FROM read_parquet({SQLQueries.parquet_source(paths)}, {options})"
+            )
+        return "\nUNION ALL BY NAME\n".join(branches)
+
     @staticmethod
     def extract_valid_content(
         table: str, 
@@ -23,6 +97,7 @@ class SQLQueries:
         Returns:
             str: JSON 데이터 추출 쿼리
         """
+        json_loc = SQLQueries.escape_literal(json_loc)
         conditions = [
             f"{column} IS NOT NULL",
             f"json_extract({column}, '{json_loc}') IS NOT NULL",
@@ -30,7 +105,9 @@ class SQLQueries:
         ]
         
         if partition_conditions:
-            partition_checks = [f"{k}='{v}'" for k, v in partition_conditions.items()]
+            partition_checks = [
+                f"{k}='{SQLQueries.escape_literal(v)}'" for k, v in partition_conditions.items()
+            ]
             conditions.extend(partition_checks)
 
         return f"""
@@ -64,10 +141,13 @@ class SQLQueries:
             str: 텍스트 검색 쿼리
         """
         
+        search_text = SQLQueries.escape_literal(search_text)
         base_conditions = [f"{column} IS NOT NULL"]
         
         if partition_conditions:
-            partition_checks = [f"{k}='{v}'" for k, v in partition_conditions.items()]
+            partition_checks = [
+                f"{k}='{SQLQueries.escape_literal(v)}'" for k, v in partition_conditions.items()
+            ]
             base_conditions.extend(partition_checks)
         
         if search_type == "simple":
@@ -84,6 +164,7 @@ class SQLQueries:
             # JSON 파싱 검색
             if not json_loc:
                 raise ValueError("JSON 검색시 json_loc 파라미터가 필요합니다")
+            json_loc = SQLQueries.escape_literal(json_loc)
                 
             if engine.lower() == "duckdb":
                 # DuckDB 문법
@@ -128,6 +209,15 @@ class SQLQueries:
         ORDER BY provider, dataset, task, variant
         """
 
+    @staticmethod
+    def columns_to_json(table_name: str, columns: List[str]) -> str:
+        """중첩(struct/list) 컬럼을 JSON 문자열로 직렬화 (NULL은 NULL 유지)"""
+        projections = []
+        for column in columns:
+            identifier = '"' + column.replace('"', '""') + '"'
+            projections.append(f"to_json({identifier})::VARCHAR AS {identifier}")
+        return f"SELECT {', '.join(projections)} FROM {table_name}"
+
     @staticmethod
     def create_table_from_parquet_duckdb(
         table_name: str,
@@ -139,6 +229,197 @@ class SQLQueries:
         SELECT * FROM read_parquet('{parquet_path}/**/*.parquet', hive_partitioning=true)
         """
         
+    @staticmethod
+    def create_column_presence_table_duckdb(
+        table_name: str,
+        parquet_path: Union[str, List[str]],
+        segments_table: Optional[str] = None
+    ) -> str:
+        """파티션별 컬럼 non-null/null 개수 테이블 생성 (Parquet footer 통계만 사용, 데이터 스캔 없음)
+
+        중첩 컬럼은 leaf 중 가장 많이 채워진 값을 사용하고,
+        null 통계가 없는 row group은 모두 채워진 것으로 간주한다.
+        segments_table의 constant_columns(segment 메타데이터로만 저장된 상수 컬럼)는 모든 행이 채워진 것으로 센다.
+        """
+        constant_counts = ""
+        if segments_table:
+            constant_counts = f"""
+            UNION ALL
+            SELECT f.file_name, unnest(s.constant_columns) AS column_name, f.num_rows, f.num_rows
+            FROM parquet_file_metadata({SQLQueries.parquet_source(parquet_path)}) f
+            JOIN {segments_table} s ON s.file_path = f.file_name
+            WHERE len(s.constant_columns) > 0"""
+        return f"""
+        CREATE OR REPLACE TABLE {table_name} AS
+        WITH leaf_counts AS (
+            SELECT
+                file_name,
+                split_part(path_in_schema, ', ', 1) AS column_name,
+                MAX(row_group_num_rows - COALESCE(stats_null_count, 0)) AS non_null_count,
+                MAX(row_group_num_rows) AS num_rows
+            FROM parquet_metadata({SQLQueries.parquet_source(parquet_path)})
+            GROUP BY file_name, row_group_id, column_name{constant_counts}
+        )
+        SELECT
+            regexp_extract(file_name, 'provider=([^/]+)', 1) AS provider,
+            regexp_extract(file_name, 'dataset=([^/]+)', 1) AS dataset,
+            regexp_extract(file_name, 'task=([^/]+)', 1) AS task,
+            regexp_extract(file_name, 'variant=([^/]+)', 1) AS variant,
+            column_name,
+            SUM(non_null_count)::BIGINT AS non_null_count,
+            SUM(num_rows - non_null_count)::BIGINT AS null_count
+        FROM leaf_counts
+        GROUP BY provider, dataset, task, variant, column_name
+        """
+
+    @staticmethod
+    def create_partition_stats_table_duckdb(
+        table_name: str,
+        parquet_path: Union[str, List[str]],
+        segments_table: str
+    ) -> str:
+        """파티션별 행 수/segment 수/Parquet 크기/asset 크기 테이블 생성 (footer만 읽음)
+
+        asset 크기는 segments_table(서버가 manifest에 기록한 값)에서 가져오며,
+        크기를 모르는 segment가 하나라도 있으면 NULL이다.
+        """
+        return f"""
+        CREATE OR REPLACE TABLE {table_name} AS
+        WITH files AS (
+            SELECT file_name, num_rows, file_size_bytes
+            FROM parquet_file_metadata({SQLQueries.parquet_source(parquet_path)})
+        )
+        SELECT
+            regexp_extract(f.file_name, 'provider=([^/]+)', 1) AS provider,
+            regexp_extract(f.file_name, 'dataset=([^/]+)', 1) AS dataset,
+            regexp_extract(f.file_name, 'task=([^/]+)', 1) AS task,
+            regexp_extract(f.file_name, 'variant=([^/]+)', 1) AS variant,
+            SUM(f.num_rows)::BIGINT AS num_samples,
+            COUNT(*)::BIGINT AS num_segments,
+            SUM(f.file_size_bytes)::BIGINT AS parquet_bytes,
+            CASE WHEN COUNT(s.asset_bytes) = COUNT(*) THEN SUM(s.asset_bytes) END::BIGINT AS asset_bytes
+        FROM files f
+        LEFT JOIN {segments_table} s ON s.file_path = f.file_name
+        GROUP BY provider, dataset, task, variant
+        ORDER BY provider, dataset, task, variant
+        """
+
+    @staticmethod
+    def get_partition_stats(table: str) -> str:
+        """사전 계산된 파티션 통계 조회 (get_distinct_partitions와 같은 컬럼 순서)"""
+        return f"""
+        SELECT provider, dataset, task, variant, num_samples
+        FROM {table}
+        ORDER BY provider, dataset, task, variant
+        """
+
+    @staticmethod
+    def create_text_docs_table_duckdb(
+        table_name: str,
+        source: str,
+        columns: List[str],
+        json_columns: List[str] = None
+    ) -> str:
+        """텍스트 색인 대상 문서 테이블 생성 (컬럼 값 하나가 문서 하나)
+
+        json_columns(struct/list 등 중첩 타입 컬럼)는 JSON 문자열로 변환해 저장한다.
+        """
+        json_columns = json_columns or []
+        branches = "\n            UNION ALL\n".join(
+            f"""
+            SELECT hash, path, provider, dataset, task, variant,
+                '{SQLQueries.escape_literal(column)}' AS column_name,
+                {f'CAST(to_json("{column}") AS VARCHAR)' if column in json_columns else f'CAST("{column}" AS VARCHAR)'} AS value
+            FROM {source}
+            WHERE "{column}" IS NOT NULL"""
+            for column in columns
+        )
+        return f"""
+        CREATE OR REPLACE TABLE {table_name} AS
+        SELECT row_number() OVER () AS doc_id, *
+        FROM ({branches}
+        )
+        """
+
+    @staticmethod
+    def create_text_ngrams_table_duckdb(
+        table_name: str,
+        docs_table: str,
+        columns: List[str],
+        ngram_size: int = 2
+    ) -> str:
+        """문자 n-gram 역색인 테이블 생성
+
+        공백 기준 토큰화 없이 문자 단위로 자르므로 한국어에도 그대로 적용된다.
+        gram 순으로 정렬해 저장하므로 gram 조건 조회 시 row group 단위로 건너뛴다.
+        """
+        column_list = ', '.join(f"'{SQLQueries.escape_literal(col)}'" for col in columns)
+        return f"""
+        CREATE OR REPLACE TABLE {table_name} AS
+        SELECT DISTINCT substr(value, i, {ngram_size}) AS gram, doc_id
+        FROM (
+            SELECT doc_id, value, unnest(range(1, length(value) - {ngram_size} + 2)) AS i
+            FROM {docs_table}
+            WHERE column_name IN ({column_list}) AND length(value) >= {ngram_size}
+        )
+        ORDER BY gram, doc_id
+        """
+
+    @staticmethod
+    def create_label_texts_table_duckdb(
+        table_name: str,
+        docs_table: str,
+        column_paths: Dict[str, List[str]]
+    ) -> str:
+        """JSON 라벨을 (doc_id, column_name, json_path, value) 행으로 펼친 테이블 생성
+
+        경로의 `{variant}`는 각 행의 variant 값으로 치환된다 (예: '$.{variant}.text.content').
+        배열은 원소별로, 문자열/숫자는 한 행으로 저장하고 객체/null은 제외한다.
+        """
+        branches = []
+        for column, paths in column_paths.items():
+            for path in paths:
+                path_expr = f"replace('{SQLQueries.escape_literal(path)}', '{{variant}}', variant)"
+                branches.append(f"""
+                SELECT doc_id, column_name, {path_expr} AS json_path,
+                    json_extract(value, {path_expr}) AS extracted
+                FROM {docs_table}
+                WHERE column_name = '{SQLQueries.escape_literal(column)}' AND json_valid(value)""")
+        union_sql = "\n                UNION ALL".join(branches)
+        return f"""
+        CREATE OR REPLACE TABLE {table_name} AS
+        WITH extracted AS ({union_sql}
+        ),
+        flattened AS (
+            SELECT doc_id, column_name, json_path,
+                unnest(CASE json_type(extracted)
+                    WHEN 'ARRAY' THEN cast(extracted as varchar[])
+                    WHEN 'OBJECT' THEN []::varchar[]
+                    WHEN 'NULL' THEN []::varchar[]
+                    ELSE [extracted->>'$']
+                END) AS value
+            FROM extracted
+            WHERE extracted IS NOT NULL
+        )
+        SELECT * FROM flattened
+        WHERE value IS NOT NULL
+        ORDER BY column_name, json_path, doc_id
+        """
+
+    @staticmethod
+    def create_hash_index_table_duckdb(table_name: str, source: str) -> str:
+        """hash 순으로 정렬한 (hash, 파티션) 색인 테이블 생성
+
+        정렬 저장으로 row group별 min/max(zone map)가 좁아져 hash 조인 시 대부분을 건너뛴다.
+        """
+        return f"""
+        CREATE OR REPLACE TABLE {table_name} AS
+        SELECT DISTINCT hash, provider, dataset, task, variant
+        FROM {source}
+        WHERE hash IS NOT NULL
+        ORDER BY hash
+        """
+
     @staticmethod
     def get_providers_query(table: str) -> str:
         """모든 Provider 목록 조회 쿼리"""
@@ -0,0 +1,154 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, List, Optional, Union
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+def default_query_cache_dir() -> Path:
+    """로컬 쿼리 결과 캐시 기본 경로 (NAS가 아닌 사용자 로컬 디스크)"""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "datalake" / "query_cache"
+
+
+class QueryResultCache:
+    """쿼리 결과를 로컬 Parquet 파일로 보관하는 LRU 캐시
+
+    디렉토리 구조: {cache_dir}/{DB 식별자}-{세대 토큰}/{쿼리 키}.parquet
+    세대 토큰(catalog 세대 + DB 파일 mtime)이 바뀌면 같은 DB의 이전 세대 디렉토리는 통째로 삭제되고,
+    전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 파일부터 지운다 (사용 시각 = 파일 mtime).
+    결과 하나가 max_entry_bytes보다 크면 저장하지 않는다 (큰 결과는 다시 조회하는 편이 디스크 쓰기보다 쌈).
+    """
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path, None] = None,
+        max_bytes: int = 1024 * 1024 * 1024,
+        max_entry_bytes: int = 64 * 1024 * 1024,
+    ):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_query_cache_dir()
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = min(max_entry_bytes, max_bytes)
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Lock은 pickle할 수 없으므로 제외 (datasets.map(num_proc>1)로 클라이언트가 복제될 때)
+        state = self.__dict__.copy()
+        state.pop("_lock", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(namespace: str, sql: str, params: Optional[List[Any]] = None) -> str:
+        """정규화한 쿼리(공백 정리된 SQL + 바인딩 값)로 캐시 키 생성"""
+        normalized = {
+            "namespace": namespace,
+            "sql": " ".join(sql.split()),
+            "params": list(params or []),
+        }
+        payload = json.dumps(normalized, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def make_scope(db_path: Union[str, Path], generation_token: Any) -> str:
+        """DB 경로 + 세대 토큰으로 캐시 범위(디렉토리 이름) 생성"""
+        db_id = hashlib.sha256(str(db_path).encode("utf-8")).hexdigest()[:16]
+        token = hashlib.sha256(repr(generation_token).encode("utf-8")).hexdigest()[:16]
+        return f"{db_id}-{token}"
+
+    def get(self, scope: str, key: str) -> Optional[pa.Table]:
+        """캐시된 결과 조회 (없거나 읽기 실패 시 None)"""
+        cache_file = self.cache_dir / scope / f"{key}.parquet"
+        try:
+            table = pq.read_table(cache_file)
+        except (FileNotFoundError, OSError, pa.ArrowInvalid):
+            return None
+        try:
+            os.utime(cache_file)  # LRU 사용 시각 갱신
+        except OSError:
+            pass
+        return table
+
+    def put(self, scope: str, key: str, table: pa.Table) -> bool:
+        """결과 저장 (max_entry_bytes보다 큰 결과는 저장하지 않음)
+
+        Returns:
+            저장 여부
+        """
+        if table.nbytes > self.max_entry_bytes:
+            return False
+
+        with self._lock:
+            self._purge_stale_scopes(scope)
+            scope_dir = self.cache_dir / scope
+            scope_dir.mkdir(parents=True, exist_ok=True)
+
+            cache_file = scope_dir / f"{key}.parquet"
+            fd, tmp_path = tempfile.mkstemp(dir=scope_dir, prefix=f".{key}.", suffix=".tmp")
+            os.close(fd)
+            try:
+                pq.write_table(table, tmp_path)
+                os.replace(tmp_path, cache_file)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+            self._evict()
+        return True
+
+    def clear(self) -> int:
+        """캐시 전체 삭제
+
+        Returns:
+            삭제한 캐시 파일 수
+        """
+        with self._lock:
+            if not self.cache_dir.exists():
+                return 0
+            removed = sum(1 for _ in self.cache_dir.rglob("*.parquet"))
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+            return removed
+
+    def size_bytes(self) -> int:
+        """현재 캐시 전체 크기"""
+        if not self.cache_dir.exists():
+            return 0
+        return sum(f.stat().st_size for f in self.cache_dir.rglob("*.parquet"))
+
+    def _purge_stale_scopes(self, scope: str):
+        """같은 DB의 이전 세대 캐시 디렉토리 삭제"""
+        if not self.cache_dir.exists():
+            return
+        db_id = scope.split("-", 1)[0]
+        for scope_dir in self.cache_dir.iterdir():
+            if scope_dir.is_dir() and scope_dir.name.startswith(f"{db_id}-") and scope_dir.name != scope:
+                shutil.rmtree(scope_dir, ignore_errors=True)
+
+    def _evict(self):
+        """전체 크기가 max_bytes 이하가 될 때까지 오래된 파일부터 삭제"""
+        entries = []
+        for cache_file in self.cache_dir.rglob("*.parquet"):
+            try:
+                stat = cache_file.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, cache_file))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, cache_file in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self.max_bytes:
+                break
+            try:
+                cache_file.unlink()
+                total -= size
+            except FileNotFoundError:
+                continue
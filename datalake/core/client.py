@@ -1,27 +1,59 @@
 import logging
 import os
 import uuid
+import hashlib
 import json
 import shutil
+import tempfile
 import pandas as pd
+import duckdb
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 import requests 
 import time 
-import subprocess
 import psutil
+import threading
 from pathlib import Path
 from datetime import datetime
 from datasets import Dataset, load_from_disk
 from datasets import Image as DatasetImage
-from typing import Dict, Optional, List, Union
+from datasets import Value
+from datasets import config as datasets_config
+from datasets.table import InMemoryTable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, List, Union, Iterator, Iterable
 from PIL import Image
 
 from datalake.core.collections import CollectionManager
 from datalake.core.schema import SchemaManager
-from datalake.utils import setup_logging
+from datalake.core.cache import QueryResultCache
+from datalake.core.staging import FileStager
+from datalake.core.transport import HttpStagingTransport, default_upload_cache_dir
+from datalake.utils import (
+    setup_logging,
+    read_catalog_generation,
+    list_catalog_segments,
+    file_sha256,
+    is_nested_type,
+    read_file_schemas,
+    json_fallback_columns,
+)
 from datalake.clients import DuckDBClient
+from datalake.clients.queries import SQLQueries, CatalogQueryBuilder, Query
 
 
 class DatalakeClient:
+    DB_MODES = ("table", "view")
+    UPLOAD_TRANSPORTS = ("auto", "fs", "http")
+    PARTITION_COLUMNS = ['provider', 'dataset', 'task', 'variant']
+    TEXT_NGRAM_SIZE = 2
+    PARQUET_LOAD_BATCH_SIZE = 1000  # 업로드용 Parquet를 Arrow로 옮길 때 한 번에 읽는 행 수
+    JSON_TRANSFORM_BATCH_SIZE = 50_000  # 중첩 컬럼을 JSON 문자열로 바꿀 때 한 번에 처리하는 행 수
+    ASSET_LOOKUP_BATCH_SIZE = 100_000  # 서버에 한 번에 조회하는 asset hash 수
+    STAGING_SCAN_BATCH_SIZE = 10_000  # staging 복사 시 경로 컬럼을 한 번에 읽는 행 수
+    SEARCH_FILE_MAX_AGE = 24 * 3600  # 검색 결과 Arrow 파일과 파생 Dataset cache 파일 보관 시간 (초)
+
     def __init__(
         self, 
         user_id: str = None, # 사용자 ID (필수)
@@ -31,6 +63,18 @@ class DatalakeClient:
         num_proc: int = 8, # 병렬 처리 프로세스 수
         table_name: str = "catalog",
         create_dirs: bool = False, # 초기 디렉토리 생성 여부
+        db_mode: str = "table", # "table": catalog 전체 복사, "view": Parquet 직접 조회
+        duckdb_threads: Optional[int] = None, # DuckDB 연결별 스레드 수
+        duckdb_memory_limit: Optional[str] = None, # DuckDB 연결별 메모리 제한 (예: "8GB")
+        nested_labels: bool = False, # dict/list 컬럼을 JSON 문자열 대신 Arrow struct/list로 저장
+        query_cache: bool = False, # search()/get_partitions() 결과를 로컬 디스크에 캐시 (같은 쿼리를 반복할 때만 켜기)
+        query_cache_dir: Optional[str] = None, # 캐시 경로 (기본: ~/.cache/datalake/query_cache)
+        query_cache_max_mb: int = 1024, # 캐시 최대 크기 (초과 시 오래 안 쓴 결과부터 삭제)
+        query_cache_max_result_mb: int = 64, # 이보다 큰 결과는 캐시하지 않음
+        staging_workers: Optional[int] = None, # staging 파일 복사 스레드 수 (NAS는 크게, 로컬 디스크는 작게; 기본: num_proc * 4, 최대 32)
+        staging_buffer_mb: Optional[int] = None, # 복사 버퍼 크기 (기본: OS 복사 경로 사용, sendfile이 느린 NAS에서 지정)
+        upload_transport: str = "auto", # "fs": base_path에 직접 기록, "http": 서버 업로드 API, "auto": base_path가 마운트되지 않았으면 http
+        http_upload_workers: int = 8, # http 업로드 동시 파트 전송 수
     ):
         if not user_id:
             raise ValueError("user_id는 필수 입니다. 예: DatalakeClient(user_id='user_123')")
@@ -49,17 +93,56 @@ class DatalakeClient:
         self.config_path = self.base_path / "config" / "schema.yaml"
         self.duckdb_path = self.base_path / "users" / f"{self.user_id}.duckdb"
         
+        if db_mode not in self.DB_MODES:
+            raise ValueError(f"db_mode는 {self.DB_MODES} 중 하나여야 합니다: {db_mode}")
+        if upload_transport not in self.UPLOAD_TRANSPORTS:
+            raise ValueError(f"upload_transport는 {self.UPLOAD_TRANSPORTS} 중 하나여야 합니다: {upload_transport}")
+        if upload_transport == "auto":
+            mounted = create_dirs or self.staging_pending_path.exists()
+            upload_transport = "fs" if mounted else "http"
+        self.upload_transport = upload_transport
+        self.http_transport = HttpStagingTransport(
+            self.server_url, max_workers=http_upload_workers
+        ) if upload_transport == "http" else None
+
         self.num_proc = num_proc
         self.table_name = table_name
+        self.hot_table_name = f"{table_name}_hot"
+        self.db_mode = db_mode
+        self.duckdb_threads = duckdb_threads
+        self.duckdb_memory_limit = duckdb_memory_limit
+        self.nested_labels = nested_labels
+        # (DB 경로, catalog 세대, DB 파일 mtime) → 읽기 전용 DuckDBClient
+        self._duck_pool: Dict[tuple, DuckDBClient] = {}
+        self._duck_pool_lock = threading.Lock()
+        self.query_cache = QueryResultCache(
+            cache_dir=query_cache_dir,
+            max_bytes=query_cache_max_mb * 1024 * 1024,
+            max_entry_bytes=query_cache_max_result_mb * 1024 * 1024,
+        ) if query_cache else None
+        self.file_stager = FileStager(
+            max_workers=staging_workers or min(32, num_proc * 4),
+            buffer_size=staging_buffer_mb * 1024 * 1024 if staging_buffer_mb else None,
+            # http 업로드는 로컬 staging에 원본 링크만 두고 전송 시 원본을 읽음
+            symlink=(upload_transport == "http"),
+        )
         self.image_data_candidates = ['image', 'image_bytes']
         self.image_data_key = 'image'  # 기본 이미지 컬럼 키
         self.file_path_candidates = ['image_path', 'file', 'file_path']
         self.file_path_key = 'file_path'  # 기본 파일 경로 컬럼 키
+        self.asset_ref_key = '_asset_ref'  # 이미 저장된 asset을 가리키는 staging 컬럼 (서버와 동일)
         
     
         
         self._initialize(log_level, create_dirs=create_dirs)
         self._check_server_connection()
+
+        if self.http_transport is not None:
+            self.logger.info(f"🌐 base_path 대신 서버 업로드 API 사용: {self.server_url}")
+            server_key = hashlib.sha256(self.server_url.encode("utf-8")).hexdigest()[:16]
+            self.config_path = self.http_transport.fetch_schema(
+                default_upload_cache_dir() / f"schema-{server_key}.yaml"
+            )
                
         self.schema_manager = SchemaManager(
             config_path=self.config_path,
@@ -70,6 +153,12 @@ class DatalakeClient:
         )
         
     def _initialize(self, log_level: str, create_dirs: bool = False):
+        if self.upload_transport == "http":
+            # NAS가 마운트되지 않은 환경: 디렉토리 검사와 NAS 로그 파일 생략
+            setup_logging(user_id=self.user_id, log_level=log_level)
+            self.logger = logging.getLogger(__name__)
+            return
+
         required_paths = {
             'base': self.base_path,
             'staging': self.staging_path,
@@ -123,6 +212,8 @@ class DatalakeClient:
         dataset_description: str = "", # 데이터셋 설명
         original_source: str = "", # 원본 소스 URL 
         overwrite: bool = False, # 기존 pending 데이터 제거 여부
+        replace_catalog: bool = False, # catalog의 기존 파티션 데이터를 교체 (기본: segment 추가)
+        skip_existing_assets: bool = True, # 서버에 이미 있는 파일(SHA256 기준)은 staging 복사 생략
     ) -> str:
         task = "raw"
 
@@ -149,9 +240,11 @@ class DatalakeClient:
             has_files= file_info['has_file_paths'],
             dataset_description=dataset_description,
             original_source=original_source,
+            nested_columns=file_info['nested_columns'],
+            write_mode="replace" if replace_catalog else "append",
         )
         
-        staging_dir = self._save_to_staging(dataset_obj, metadata)
+        staging_dir = self._save_to_staging(dataset_obj, metadata, skip_existing_assets=skip_existing_assets)
         self.logger.info(f"✅ Task 데이터 업로드 완료: {staging_dir}")
         
         return staging_dir
@@ -166,6 +259,8 @@ class DatalakeClient:
         dataset_description: str = "",
         overwrite: bool = False,
         meta: Optional[Dict] = None,
+        replace_catalog: bool = False, # catalog의 기존 파티션 데이터를 교체 (기본: segment 추가)
+        skip_existing_assets: bool = True, # 서버에 이미 있는 파일(SHA256 기준)은 staging 복사 생략
     ) -> str:
         self.logger.info(f"📥 Task data 업로드 시작: {provider}/{dataset}/{task}/{variant}")
         
@@ -206,10 +301,12 @@ class DatalakeClient:
             total_rows=len(dataset_obj),
             data_type='task',
             meta=meta,
+            nested_columns=file_info['nested_columns'],
+            write_mode="replace" if replace_catalog else "append",
         )
         
         # Staging에 저장
-        staging_dir = self._save_to_staging(dataset_obj, metadata)
+        staging_dir = self._save_to_staging(dataset_obj, metadata, skip_existing_assets=skip_existing_assets)
         self.logger.info(f"✅ Task 데이터 업로드 완료: {staging_dir}")
         
         return staging_dir
@@ -314,7 +411,109 @@ class DatalakeClient:
             elapsed = time.time() - start_time
             self.logger.error(f"❌ 요청 실패: {e} ({elapsed:.2f}초)")
             return None
-    
+
+    def trigger_compaction(
+        self,
+        providers: Optional[List[str]] = None,
+        datasets: Optional[List[str]] = None,
+        tasks: Optional[List[str]] = None,
+        variants: Optional[List[str]] = None,
+        row_group_size: int = 100_000,
+        compression: str = "zstd",
+        compression_level: Optional[int] = None,
+        bloom_filter_columns: Optional[List[str]] = None,
+    ) -> Optional[str]:
+        """서버에 catalog compaction 요청 (파티션 필터가 없으면 전체)
+
+        Returns:
+            작업 ID (wait_for_job_completion()으로 대기), 실패 시 None
+        """
+        payload = {
+            "providers": providers,
+            "datasets": datasets,
+            "tasks": tasks,
+            "variants": variants,
+            "row_group_size": row_group_size,
+            "compression": compression,
+            "compression_level": compression_level,
+        }
+        if bloom_filter_columns is not None:
+            payload["bloom_filter_columns"] = bloom_filter_columns
+
+        self.logger.info("🗜️ Catalog compaction 요청 중...")
+        try:
+            response = requests.post(f"{self.server_url}/compact", json=payload, timeout=30)
+            if response.status_code != 200:
+                self.logger.error(f"❌ compaction 시작 실패: {response.status_code} {response.text}")
+                return None
+
+            result = response.json()
+            job_id = result.get('job_id')
+            if result.get('status') == 'already_running':
+                self.logger.warning(f"⚠️ 이미 실행 중인 작업이 있습니다: {job_id}")
+                return None
+            self.logger.info(f"✅ compaction 작업 시작됨: {job_id}")
+            return job_id
+
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"❌ 서버 연결 실패: {e}")
+            return None
+
+    def sync_to_object_storage(
+        self,
+        bucket: str,
+        prefix: str = "",
+        include_assets: bool = False,
+        endpoint_url: Optional[str] = None,
+        delete: bool = False,
+        verify: bool = False,
+        dry_run: bool = False,
+        max_workers: int = 8,
+        max_bandwidth: Optional[int] = None,
+        crawler_name: Optional[str] = None,
+        **session_kwargs,
+    ) -> Dict:
+        """catalog(와 assets)를 S3 호환 버킷에 미러링 (변경된 파일만 업로드)
+
+        Args:
+            bucket: 대상 버킷
+            prefix: 버킷 안의 기준 경로
+            include_assets: assets/도 함께 동기화
+            endpoint_url: S3 호환 서버 주소 (None이면 AWS S3)
+            delete: 로컬에 없는 원격 객체 삭제
+            verify: 상태 기록 대신 원격 크기/ETag와 비교
+            dry_run: 업로드/삭제 없이 대상만 계산
+            max_workers: 동시 업로드 스레드 수
+            max_bandwidth: 전체 업로드 대역폭 제한 (바이트/초)
+            crawler_name: catalog가 바뀌었으면 실행할 Glue Crawler 이름
+            **session_kwargs: boto3.Session 파라미터
+
+        Returns:
+            동기화 통계 {'catalog': {...}, 'assets': {...}, 'crawler_started': bool}
+        """
+        # boto3는 aws extra 의존성이므로 사용할 때만 import
+        from datalake.core.sync import ObjectStorageSync
+
+        self.logger.info(f"☁️ 동기화 시작: s3://{bucket}/{prefix}")
+        with ObjectStorageSync(
+            bucket=bucket,
+            prefix=prefix,
+            endpoint_url=endpoint_url,
+            max_workers=max_workers,
+            max_bandwidth=max_bandwidth,
+            **session_kwargs,
+        ) as syncer:
+            result = syncer.sync(
+                catalog_path=self.catalog_path,
+                assets_path=self.assets_path if include_assets else None,
+                delete=delete,
+                verify=verify,
+                dry_run=dry_run,
+                crawler_name=crawler_name,
+            )
+        self.logger.info("✅ 동기화 완료")
+        return result
+
     def get_job_status(self, job_id: str) -> Optional[dict]:
         """작업 상태 조회"""
         try:
@@ -385,40 +584,61 @@ class DatalakeClient:
                 'path': str(self.duckdb_path),
                 'size_mb': round(db_size, 1),
                 'modified_time': db_mtime.strftime('%Y-%m-%d %H:%M:%S'),
-                'is_outdated': self._is_db_outdated(),
             }
 
-            with DuckDBClient(str(self.duckdb_path), read_only=True) as duck_client:
-                tables = duck_client.list_tables()
-                info['tables'] = tables['name'].tolist()
+            duck_client = self._get_duck_client()
+            tables = duck_client.list_tables()
+            info['tables'] = tables['name'].tolist()
+            db_meta = duck_client.read_meta()
+            info['is_outdated'] = self._is_db_outdated(db_meta)
+            info['catalog_generation'] = read_catalog_generation(self.catalog_path)
+            info['db_generation'] = db_meta.get('catalog_generation')
+            info['mode'] = db_meta.get('mode', 'table')
+            info['hot_columns'] = json.loads(db_meta.get('hot_columns', '[]'))
+            info['text_index_columns'] = json.loads(db_meta.get('text_index_columns', '[]'))
+            info['label_text_paths'] = json.loads(db_meta.get('label_text_paths', '{}'))
                 
-                if self.table_name in info['tables']:
+            if self.table_name in info['tables']:
+                stats_table = f"{self.table_name}_partition_stats"
+                stats_df = None
+                if stats_table in info['tables']:
+                    # build_db 시점에 footer로 계산한 파티션 통계 (catalog 스캔 없음)
+                    stats_df = duck_client.execute_query(f"SELECT * FROM {stats_table}")
+                    info['total_rows'] = int(stats_df['num_samples'].sum())
+                    info['parquet_bytes'] = int(stats_df['parquet_bytes'].sum())
+                    info['asset_bytes'] = (
+                        None if stats_df['asset_bytes'].isna().any()
+                        else int(stats_df['asset_bytes'].sum())
+                    )
+                else:
                     count_result = duck_client.execute_query(f"SELECT COUNT(*) as total FROM {self.table_name}")
-                    total_rows = count_result['total'].iloc[0]
-                    info['total_rows'] = total_rows
-                    info['partitions'] = 0
-                    info['provider_stats'] = {}
-                    info['dataset_stats'] = {}
-                    info['task_stats'] = {}
-                    info['variant_stats'] = {}
+                    info['total_rows'] = count_result['total'].iloc[0]
+                info['partitions'] = 0
+                info['provider_stats'] = {}
+                info['dataset_stats'] = {}
+                info['task_stats'] = {}
+                info['variant_stats'] = {}
                     
-                    # 파티션 정보
-                    try:
+                # 파티션 정보
+                try:
+                    if stats_df is not None:
+                        partitions_df = stats_df
+                    else:
                         partitions_df = duck_client.retrieve_partitions(self.table_name)
-                        info['partitions'] = len(partitions_df)
-
-                        # Provider별 통계
-                        if not partitions_df.empty:
-                            provider_stats = partitions_df.groupby('provider').size().to_dict()
-                            dataset_stats = partitions_df.groupby('dataset').size().to_dict()
-                            task_stats = partitions_df.groupby('task').size().to_dict()
-                            variant_stats = partitions_df.groupby('variant').size().to_dict()
-                            info['provider_stats'] = provider_stats
-                            info['dataset_stats'] = dataset_stats
-                            info['task_stats'] = task_stats
-                            info['variant_stats'] = variant_stats
-                    except Exception as e:
-                        self.logger.warning(f"파티션 정보 조회 실패: {e}")
+                    info['partitions'] = len(partitions_df)
+
+                    # Provider별 통계
+                    if not partitions_df.empty:
+                        provider_stats = partitions_df.groupby('provider').size().to_dict()
+                        dataset_stats = partitions_df.groupby('dataset').size().to_dict()
+                        task_stats = partitions_df.groupby('task').size().to_dict()
+                        variant_stats = partitions_df.groupby('variant').size().to_dict()
+                        info['provider_stats'] = provider_stats
+                        info['dataset_stats'] = dataset_stats
+                        info['task_stats'] = task_stats
+                        info['variant_stats'] = variant_stats
+                except Exception as e:
+                    self.logger.warning(f"파티션 정보 조회 실패: {e}")
                 
             return info
 
@@ -429,14 +649,46 @@ class DatalakeClient:
                 'error': str(e)
             }
     
-    def build_db(self, force_rebuild: bool = True) -> bool:
-        """DB 구축 또는 재구축"""
-        self.logger.info("🔨 DB 구축 시작...")
+    def build_db(
+        self,
+        force_rebuild: bool = True,
+        mode: Optional[str] = None,
+        hot_columns: Optional[List[str]] = None,
+        text_index_columns: Optional[List[str]] = None,
+        label_text_paths: Optional[Dict[str, List[str]]] = None,
+        incremental: bool = False,
+    ) -> bool:
+        """DB 구축 또는 재구축
+
+        Args:
+            force_rebuild: 기존 DB 파일 삭제 후 재구축 여부
+            mode: "table"이면 catalog를 DB 파일에 복사, "view"면 Parquet를 직접 조회하는 뷰만 생성
+                (None이면 클라이언트의 db_mode 사용)
+            hot_columns: view 모드에서 보조 테이블로 저장할 컬럼 목록 (텍스트 검색 등에 사용)
+            text_index_columns: 문자 n-gram 색인을 만들 텍스트/JSON 컬럼 목록
+                (search(text_search=...)가 자동으로 색인을 사용)
+            label_text_paths: 텍스트를 펼쳐 저장할 {컬럼: [JSON 경로]}
+                (경로의 `{variant}`는 행의 variant로 치환, 예: {"labels": ["$.{variant}.text.content"]})
+            incremental: table 모드 DB에 새로 추가된 segment만 반영 (불가능하면 전체 재구축)
+        """
+        mode = mode or self.db_mode
+        if mode not in self.DB_MODES:
+            raise ValueError(f"mode는 {self.DB_MODES} 중 하나여야 합니다: {mode}")
+        hot_columns = [col for col in (hot_columns or []) if col not in self.PARTITION_COLUMNS]
+
+        self.logger.info(f"🔨 DB 구축 시작... (mode={mode})")
         
         try:
             if not self.catalog_path.exists():
                 raise FileNotFoundError(f"Catalog 디렉토리가 존재하지 않습니다: {self.catalog_path}")
 
+            if incremental and self.duckdb_path.exists():
+                updated = self._update_db_incremental(mode, text_index_columns, label_text_paths)
+                if updated is not None:
+                    return updated
+                self.logger.info("🔄 증분 갱신을 할 수 없어 전체 재구축합니다")
+                force_rebuild = True
+
             # 기존 DB 파일 처리
             if self.duckdb_path.exists():
                 if force_rebuild:
@@ -446,26 +698,60 @@ class DatalakeClient:
                     self.logger.info("⚠️ 기존 DB 파일이 존재합니다. force_rebuild=True로 재구축하세요.")
                     return False
 
+            # 같은 파일에 대한 읽기 전용 연결이 열려 있으면 쓰기 연결을 열 수 없음
+            self.close()
+
             # 디렉토리 생성
             self.duckdb_path.parent.mkdir(mode=0o777, parents=True, exist_ok=True)
 
-            # Parquet 파일들 확인
-            parquet_files = list(self.catalog_path.rglob("*.parquet"))
+            # 구축 시작 시점의 세대 기록 (구축 중 catalog가 바뀌면 outdated로 판단됨)
+            catalog_generation = read_catalog_generation(self.catalog_path)
+
+            # 파티션 manifest 기준 현재 스냅샷의 파일 목록 (쓰는 중인 segment는 포함되지 않음)
+            segments = list_catalog_segments(self.catalog_path)
+            parquet_files = [segment['path'].as_posix() for segment in segments]
             if not parquet_files:
                 raise FileNotFoundError("Parquet 파일을 찾을 수 없습니다.")
+            source_options = self._catalog_source_options(segments)
 
             self.logger.info(f"📂 발견된 Parquet 파일: {len(parquet_files)}개")
 
             # 새 DB 생성
-            with DuckDBClient(str(self.duckdb_path), read_only=False) as duck_client:
-                parquet_pattern = str(self.catalog_path / "**" / "*.parquet")
-                
-                self.logger.info("📊 테이블 생성 중...")
-                duck_client.create_table_from_parquet(
-                    self.table_name,
-                    parquet_pattern,
-                    hive_partitioning=True,
-                    union_by_name=True
+            with DuckDBClient(
+                str(self.duckdb_path),
+                read_only=False,
+                threads=self.duckdb_threads,
+                memory_limit=self.duckdb_memory_limit,
+            ) as duck_client:
+                if mode == "view":
+                    self.logger.info("📊 뷰 생성 중...")
+                    duck_client.create_view_from_parquet(
+                        self.table_name,
+                        parquet_files,
+                        hive_partitioning=True,
+                        union_by_name=True,
+                        **source_options,
+                    )
+                    if hot_columns:
+                        self._build_hot_table(duck_client, hot_columns)
+                else:
+                    self.logger.info("📊 테이블 생성 중...")
+                    duck_client.create_table_from_parquet(
+                        self.table_name,
+                        parquet_files,
+                        hive_partitioning=True,
+                        union_by_name=True,
+                        **source_options,
+                    )
+
+                self._build_derived_tables(
+                    duck_client,
+                    segments,
+                    catalog_generation,
+                    mode=mode,
+                    hot_columns=hot_columns if mode == "view" else [],
+                    text_index_columns=text_index_columns or [],
+                    label_text_paths=label_text_paths or {},
                 )
 
                 # 결과 검증
@@ -499,12 +785,13 @@ class DatalakeClient:
             if not self.duckdb_path.exists():
                 raise FileNotFoundError("DB가 없습니다. build_db()로 먼저 생성하세요.")
                 
-            with DuckDBClient(str(self.duckdb_path), read_only=True) as duck_client:
-                self._validate_db(duck_client)
-                partitions_df = duck_client.retrieve_partitions(self.table_name)
+            duck_client = self._get_duck_client()
+            self._validate_db(duck_client)
+            query = Query(duck_client.partitions_sql(self.table_name), [])
+            partitions_df = self._execute_cached(duck_client, "partitions", query)
                 
-                self.logger.debug(f"📊 총 {len(partitions_df)}개 파티션 조회됨")
-                return partitions_df
+            self.logger.debug(f"📊 총 {len(partitions_df)}개 파티션 조회됨")
+            return partitions_df
 
         except Exception as e:
             self.logger.error(f"❌ 파티션 조회 실패: {e}")
@@ -517,8 +804,10 @@ class DatalakeClient:
         tasks: Optional[List[str]] = None,
         variants: Optional[List[str]] = None,
         text_search: Optional[Dict] = None,
-        limit: Optional[int] = None
-    ) -> pd.DataFrame:
+        limit: Optional[int] = None,
+        as_arrow: bool = False,
+        sample: Optional[Union[int, float, Dict]] = None,
+    ) -> Union[pd.DataFrame, pa.Table]:
         """
         DB에서 데이터 검색
         
@@ -528,66 +817,213 @@ class DatalakeClient:
             tasks: Task 목록 (None이면 전체)
             variants: Variant 목록 (None이면 전체)
             text_search: 텍스트 검색 설정 {"column": str, "text": str, "json_path": str}
+                (text 부분 일치 검색, text 안의 %, _ 는 LIKE 와일드카드)
             limit: 결과 제한 수
+            as_arrow: True면 pandas 변환 없이 Arrow Table 반환 (to_dataset()/download()에 그대로 전달)
+            sample: DuckDB 안에서 샘플링 (`USING SAMPLE`, 샘플 행만 전송됨)
+                - int: 정확히 N개 (reservoir)
+                - float: 각 행을 해당 비율로 (bernoulli, 0.1 = 10%)
+                - dict: {"rows": N} 또는 {"fraction": p}, "method"(reservoir/bernoulli/system), "seed",
+                  "per_partition": 파티션별 할당량 (int/float 또는 {"provider/dataset/task/variant": 할당량})
             
         Returns:
-            검색 결과 DataFrame
+            검색 결과 DataFrame (as_arrow=True면 pa.Table)
         """
         self.logger.info("🔍 검색 시작")
         
         try:
-            if not self.duckdb_path.exists():
-                raise FileNotFoundError("DB가 없습니다. build_db()로 먼저 생성하세요.")
-            
-            with DuckDBClient(str(self.duckdb_path), read_only=True) as duck_client:
-                self._validate_db(duck_client)
-                
-                if text_search:
-                    # 텍스트 검색
-                    results = self._perform_text_search(duck_client, text_search, limit)
-                else:
-                    # 파티션 기반 검색
-                    results = self._perform_partition_search(
-                        duck_client, providers, datasets, tasks, variants, limit
-                    )
+            duck_client = self._get_search_client()
+            query = self._build_search_query(
+                duck_client, providers, datasets, tasks, variants, text_search, limit, sample
+            )
+            if query is None:
+                results = pa.table({}) if as_arrow else pd.DataFrame()
+            else:
+                # seed 없는 샘플은 호출마다 달라야 하므로 캐시하지 않음
+                cacheable = not sample or (isinstance(sample, dict) and sample.get('seed') is not None)
+                results = self._execute_cached(duck_client, "search", query, as_arrow, cacheable)
 
-                self.logger.info(f"📊 검색 결과: {len(results):,}개 항목")
-                return results
+            self.logger.info(f"📊 검색 결과: {len(results):,}개 항목")
+            return results
 
         except Exception as e:
             self.logger.error(f"❌ 검색 실패: {e}")
             raise
 
+    def search_iter(
+        self,
+        providers: Optional[List[str]] = None,
+        datasets: Optional[List[str]] = None,
+        tasks: Optional[List[str]] = None,
+        variants: Optional[List[str]] = None,
+        text_search: Optional[Dict] = None,
+        limit: Optional[int] = None,
+        batch_size: int = 100_000,
+        sample: Optional[Union[int, float, Dict]] = None,
+    ) -> Iterator[pa.RecordBatch]:
+        """
+        search()와 같은 조건으로 검색하되 결과를 Arrow RecordBatch 단위로 스트리밍
+        
+        결과 전체를 메모리에 올리지 않으므로 download()/to_dataset()에 그대로 넘기면
+        수천만 행도 batch_size 단위로 처리된다.
+        
+        Args:
+            batch_size: RecordBatch당 최대 행 수
+            (나머지 인자는 search()와 동일)
+            
+        Yields:
+            검색 결과 RecordBatch
+        """
+        self.logger.info(f"🔍 스트리밍 검색 시작 (batch_size={batch_size:,})")
+        duck_client = self._get_search_client()
+        query = self._build_search_query(
+            duck_client, providers, datasets, tasks, variants, text_search, limit, sample
+        )
+        if query is None:
+            return
+
+        total_rows = 0
+        for batch in duck_client.execute_query_iter(query.sql, query.params, batch_size):
+            total_rows += batch.num_rows
+            yield batch
+        self.logger.info(f"📊 검색 결과: {total_rows:,}개 항목")
+
+    def _execute_cached(
+        self,
+        duck_client: DuckDBClient,
+        namespace: str,
+        query: Query,
+        as_arrow: bool = False,
+        cacheable: bool = True,
+    ) -> Union[pd.DataFrame, pa.Table]:
+        """쿼리 실행 (같은 DB 세대에서 같은 쿼리는 로컬 캐시 결과 재사용)"""
+        if self.query_cache is None or not cacheable:
+            if as_arrow:
+                return duck_client.execute_query_arrow(query.sql, query.params)
+            return duck_client.execute_query(query.sql, query.params)
+
+        scope = QueryResultCache.make_scope(self.duckdb_path, self._db_generation_token())
+        key = QueryResultCache.make_key(namespace, query.sql, query.params)
+        table = self.query_cache.get(scope, key)
+        if table is not None:
+            self.logger.debug(f"⚡ 쿼리 캐시 사용: {namespace}")
+        else:
+            table = duck_client.execute_query_arrow(query.sql, query.params)
+            try:
+                self.query_cache.put(scope, key, table)
+            except Exception as e:
+                self.logger.warning(f"⚠️ 쿼리 캐시 저장 실패: {e}")
+        if as_arrow:
+            return table
+        # Arrow 버퍼를 변환하면서 해제해 pandas 사본과 동시에 두 벌을 들고 있지 않도록 함
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+
+    def clear_query_cache(self) -> int:
+        """로컬 쿼리 결과 캐시 삭제
+
+        Returns:
+            삭제한 캐시 파일 수
+        """
+        # 캐시를 끈 클라이언트도 이전에 남긴 기본 경로의 캐시는 지울 수 있도록 함
+        cache = self.query_cache or QueryResultCache()
+        removed = cache.clear()
+        self.logger.info(f"🗑️ 쿼리 캐시 삭제: {removed}개")
+        return removed
+
+    def _get_search_client(self) -> DuckDBClient:
+        """검색용 연결 조회 (DB 존재 및 테이블 검사 포함)"""
+        if not self.duckdb_path.exists():
+            raise FileNotFoundError("DB가 없습니다. build_db()로 먼저 생성하세요.")
+        duck_client = self._get_duck_client()
+        self._validate_db(duck_client)
+        return duck_client
+
+    def lookup_by_hash(
+        self,
+        hashes: Union[List[str], pd.Series],
+        columns: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """asset hash 목록을 참조하는 모든 행 조회 (raw/task 전체)
+
+        Args:
+            hashes: 조회할 hash 목록 (수백만 개 가능)
+            columns: 반환할 컬럼 목록 (None이면 전체, 파티션 컬럼 포함 권장)
+
+        Returns:
+            조회 결과 DataFrame
+        """
+        hashes = [h for h in dict.fromkeys(hashes) if isinstance(h, str) and h]
+        self.logger.info(f"🔑 hash 조회 시작: {len(hashes):,}개")
+
+        try:
+            duck_client = self._get_search_client()
+
+            if columns is not None:
+                available = duck_client.get_table_info(self.table_name)['column_name'].tolist()
+                missing = [col for col in columns if col not in available]
+                if missing:
+                    self.logger.warning(f"⚠️ catalog에 없는 컬럼은 제외: {missing}")
+                columns = [col for col in columns if col in available]
+
+            results = duck_client.lookup_by_hash(hashes, table=self.table_name, columns=columns)
+            self.logger.info(f"📊 조회 결과: {len(results):,}개 행")
+            return results
+
+        except Exception as e:
+            self.logger.error(f"❌ hash 조회 실패: {e}")
+            raise
+
     def to_pandas(
         self, 
-        search_results: pd.DataFrame, 
+        search_results: Union[pd.DataFrame, pa.Table], 
         absolute_paths: bool = True,
     ) -> pd.DataFrame:
         self.logger.info("📊 Pandas DataFrame 변환 시작...")
         
-        df_copy = search_results.copy()
-        
-        if absolute_paths and 'path' in df_copy.columns.tolist():
-            df_copy['path'] = df_copy['path'].apply(
-                lambda x: (self.assets_path / x).as_posix() if isinstance(x, str) and x else x
-            )
-            self.logger.debug("📁 경로를 절대경로로 변환")
+        if isinstance(search_results, pa.Table):
+            if absolute_paths:
+                search_results = self._absolutize_paths(search_results)
+            df_copy = search_results.to_pandas()
+        else:
+            # 얕은 복사: path 컬럼만 새로 할당하므로 원본은 그대로 유지된다
+            df_copy = search_results.copy(deep=False)
+            if absolute_paths and 'path' in df_copy.columns:
+                paths = df_copy['path']
+                prefix = self.assets_path.as_posix().rstrip('/') + '/'
+                relative = paths.str.len().gt(0) & ~paths.str.startswith('/').fillna(True).astype(bool)
+                df_copy['path'] = paths.mask(relative, prefix + paths[relative])
+                self.logger.debug("📁 경로를 절대경로로 변환")
             
         self.logger.info(f"✅ DataFrame 변환 완료: {len(df_copy):,}개 항목")
         return df_copy
 
     def to_dataset(
         self,
-        search_results: pd.DataFrame,
+        search_results: Union[pd.DataFrame, pa.Table, Iterable[pa.RecordBatch]],
         absolute_paths: bool = True,
         check_path_exists: bool = True,
         include_images: bool = False,
     ):
+        """검색 결과를 datasets.Dataset으로 변환
+
+        search(as_arrow=True)의 Arrow Table은 복사 없이 그대로 Dataset으로 감싸고,
+        DataFrame은 Arrow로 한 번만 변환한다. 경로 변환과 파일 존재 확인도 Arrow 연산으로 처리한다.
+        search_iter()의 RecordBatch 스트림을 넘기면 배치 단위로 Arrow 파일에 기록한 뒤
+        메모리 매핑으로 열기 때문에 결과 전체가 메모리에 올라가지 않는다.
+        """
         self.logger.info("📥 Dataset 객체 생성 시작...")
-        df_copy = self.to_pandas(search_results, absolute_paths)
-        dataset = Dataset.from_pandas(df_copy)
-        if check_path_exists and 'path' in dataset.column_names:
-            dataset = self._check_file_exist(dataset)
+        if isinstance(search_results, pd.DataFrame):
+            search_results = pa.Table.from_pandas(search_results, preserve_index=False)
+
+        if isinstance(search_results, pa.Table):
+            table = search_results
+            if absolute_paths:
+                table = self._absolutize_paths(table)
+            if check_path_exists:
+                table = self._filter_existing_paths(table)
+            dataset = Dataset(InMemoryTable(table))
+        else:
+            dataset = self._batches_to_dataset(search_results, absolute_paths, check_path_exists)
         if include_images:
             dataset = self._add_images_to_dataset(dataset)
 
@@ -596,7 +1032,7 @@ class DatalakeClient:
     
     def download(
         self,
-        search_results: pd.DataFrame,
+        search_results: Union[pd.DataFrame, pa.Table, Iterable[pa.RecordBatch]],
         output_path: Union[str, Path],
         format: str = "auto",
         absolute_paths: bool = True,
@@ -607,7 +1043,7 @@ class DatalakeClient:
         검색 결과를 지정된 형식으로 저장
         
         Args:
-            search_results: 검색 결과 DataFrame
+            search_results: 검색 결과 DataFrame/Arrow Table 또는 search_iter()의 RecordBatch 스트림
             output_path: 출력 경로
             format: 출력 형식 ("parquet", "dataset", "auto")
             absolute_paths: 절대 경로 사용 여부
@@ -834,66 +1270,178 @@ class DatalakeClient:
             self.logger.error(f"❌ 프로세스 확인 실패: {e}")
             return {'error': str(e)}
      
-    def _check_file_exist(self, dataset):
-        """Dataset의 파일 존재 여부를 병렬로 확인"""
-        def check_exists(example):
-            try:
-                if example.get('path'):
-                    file_path = Path(example['path'])
-                    example['exists'] = file_path.exists()
-                else:
-                    example['exists'] = False
-            except Exception as e:
-                self.logger.warning(f"파일 존재 확인 실패: {example.get('path', 'unknown')} - {e}")
-                example['exists'] = False
-            return example
-
-        self.logger.info("📁 파일 존재 여부 확인 중...")
-        dataset_with_exists = dataset.map(
-            check_exists,
-            desc="파일 존재 확인",
-            num_proc=self.num_proc
-        )
+    def _filter_existing_paths(self, batch, log: bool = True):
+        """RecordBatch/Table에서 path 파일이 존재하는 행만 남기기
 
-        # 존재하는 파일만 필터링
-        valid_dataset = dataset_with_exists.filter(
-            lambda x: x,
-            input_columns=['exists'],
-            desc="존재하는 파일 필터링",
-            num_proc=self.num_proc
-        )
-
-        # exists 컬럼 제거
-        valid_dataset = valid_dataset.remove_columns(['exists'])
-
-        total_items = len(dataset)
-        valid_items = len(valid_dataset)
-        self.logger.info(f"📊 파일 존재 확인 결과: {valid_items:,}/{total_items:,} 존재")
-
-        return valid_dataset
+        NAS의 stat 지연을 숨기기 위해 경로 목록을 스레드별 구간으로 나눠 확인하고,
+        결과 마스크로 한 번에 필터링한다 (행별 Dataset.map 없음).
+        """
+        if 'path' not in batch.schema.names or batch.num_rows == 0:
+            return batch
+
+        if log:
+            self.logger.info("📁 파일 존재 여부 확인 중...")
+        paths = batch.column('path').to_pylist()
+        num_workers = max(1, min(32, (self.num_proc or 1) * 4, len(paths)))
+        step = -(-len(paths) // num_workers)
+        chunks = [paths[i:i + step] for i in range(0, len(paths), step)]
+
+        def check_exists(chunk):
+            return [isinstance(p, str) and bool(p) and os.path.exists(p) for p in chunk]
+
+        with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+            exists = [flag for flags in executor.map(check_exists, chunks) for flag in flags]
+
+        valid = batch.filter(pa.array(exists, type=pa.bool_()))
+        if log:
+            self.logger.info(f"📊 파일 존재 확인 결과: {valid.num_rows:,}/{batch.num_rows:,} 존재")
+        return valid
     
     def _save_as_parquet(
         self, 
-        search_results: pd.DataFrame, 
+        search_results: Union[pd.DataFrame, pa.Table, Iterable[pa.RecordBatch]], 
         output_path: Union[str, Path],
         absolute_paths: bool = True,
     ) -> Path:
         
-        df_copy = self.to_pandas(search_results, absolute_paths)
-        
         output_path = Path(output_path).with_suffix('.parquet')
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        df_copy.to_parquet(output_path, index=False)
+
+        if isinstance(search_results, pd.DataFrame):
+            df_copy = self.to_pandas(search_results, absolute_paths)
+            df_copy.to_parquet(output_path, index=False)
+            total_rows = len(df_copy)
+        elif isinstance(search_results, pa.Table):
+            table = self._absolutize_paths(search_results) if absolute_paths else search_results
+            pq.write_table(table, str(output_path))
+            total_rows = table.num_rows
+        else:
+            # 배치 단위로 기록 (결과 전체를 메모리에 올리지 않음)
+            total_rows = 0
+            writer = None
+            try:
+                for batch in search_results:
+                    if absolute_paths:
+                        batch = self._absolutize_paths(batch)
+                    if writer is None:
+                        writer = pq.ParquetWriter(str(output_path), batch.schema)
+                    writer.write_batch(batch)
+                    total_rows += batch.num_rows
+            finally:
+                if writer is not None:
+                    writer.close()
+            if writer is None:
+                pd.DataFrame().to_parquet(output_path, index=False)
         
         file_size = output_path.stat().st_size / 1024 / 1024
         self.logger.info(f"✅ Parquet 저장 완료: {output_path}")
-        self.logger.info(f"📊 {len(df_copy):,}개 항목, {file_size:.1f}MB")
+        self.logger.info(f"📊 {total_rows:,}개 항목, {file_size:.1f}MB")
         
         return output_path
 
+    def _absolutize_paths(self, batch):
+        """RecordBatch/Table의 path 컬럼을 assets 기준 절대경로로 변환 (Arrow 연산, 행별 Python 호출 없음)
+
+        비어 있거나 이미 절대경로인 값은 그대로 둔다.
+        """
+        if 'path' not in batch.schema.names:
+            return batch
+        index = batch.schema.get_field_index('path')
+        paths = batch.column(index)
+        if not pa.types.is_string(paths.type) and not pa.types.is_large_string(paths.type):
+            return batch
+        prefix = pa.scalar(self.assets_path.as_posix().rstrip('/') + '/', paths.type)
+        keep = pc.or_kleene(pc.equal(paths, ''), pc.starts_with(paths, '/'))
+        absolute = pc.if_else(keep, paths, pc.binary_join_element_wise(prefix, paths, pa.scalar('', paths.type)))
+        return batch.set_column(index, 'path', absolute)
+
+    def _batches_to_dataset(
+        self,
+        batches: Iterable[pa.RecordBatch],
+        absolute_paths: bool = True,
+        check_path_exists: bool = False,
+    ) -> Dataset:
+        """RecordBatch 스트림을 Arrow 파일에 기록하고 메모리 매핑된 Dataset으로 열기
+
+        select/shuffle/map 등으로 파생된 Dataset과 num_proc 작업자가 같은 파일을 경로로 다시 열기
+        때문에 Dataset GC 시점에는 지우지 않는다. SEARCH_FILE_MAX_AGE가 지난 파일은 다음 호출에서,
+        그 전에는 clear_search_files()로 지운다.
+        """
+        cache_dir = Path(datasets_config.HF_DATASETS_CACHE) / "datalake_search"
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self._prune_search_files(cache_dir)
+        arrow_path = cache_dir / f"search-{uuid.uuid4().hex}.arrow"
+
+        writer = None
+        total_rows = 0
+        read_rows = 0
+        try:
+            for batch in batches:
+                read_rows += batch.num_rows
+                if absolute_paths:
+                    batch = self._absolutize_paths(batch)
+                if check_path_exists:
+                    batch = self._filter_existing_paths(batch, log=False)
+                if writer is None:
+                    writer = pa.ipc.new_stream(str(arrow_path), batch.schema)
+                writer.write_batch(batch)
+                total_rows += batch.num_rows
+        except BaseException:
+            if writer is not None:
+                writer.close()
+                writer = None
+            arrow_path.unlink(missing_ok=True)
+            raise
+        finally:
+            if writer is not None:
+                writer.close()
+
+        if check_path_exists:
+            self.logger.info(f"📊 파일 존재 확인 결과: {total_rows:,}/{read_rows:,} 존재")
+        if not arrow_path.exists():
+            return Dataset.from_dict({})
+        self.logger.debug(f"📦 검색 결과 {total_rows:,}행을 Arrow 파일로 기록: {arrow_path}")
+        return Dataset.from_file(str(arrow_path))
+
+    def clear_search_files(self, max_age: Optional[float] = 0) -> int:
+        """to_dataset()이 남긴 검색 결과 Arrow 파일과 파생 Dataset cache 파일 삭제
+
+        삭제한 파일을 매핑한 Dataset은 이후 map/save_to_disk 등에서 읽지 못하므로
+        사용 중인 Dataset이 없을 때 호출한다.
+
+        Args:
+            max_age: 이 시간(초)보다 오래된 파일만 삭제 (0: 전체, None: SEARCH_FILE_MAX_AGE)
+
+        Returns:
+            삭제한 파일 수
+        """
+        cache_dir = Path(datasets_config.HF_DATASETS_CACHE) / "datalake_search"
+        removed = self._prune_search_files(cache_dir, max_age)
+        self.logger.info(f"🗑️ 검색 결과 파일 삭제: {removed}개")
+        return removed
+
+    def _prune_search_files(self, cache_dir: Path, max_age: Optional[float] = None) -> int:
+        """max_age(기본 SEARCH_FILE_MAX_AGE)보다 오래된 검색 결과/파생 cache Arrow 파일 삭제
+
+        map() 등은 원본 Arrow 파일과 같은 디렉토리에 cache-*.arrow를 기록하므로 함께 정리한다.
+        """
+        if not cache_dir.exists():
+            return 0
+        cutoff = time.time() - (self.SEARCH_FILE_MAX_AGE if max_age is None else max_age)
+        removed = 0
+        for pattern in ("search-*.arrow", "cache-*.arrow"):
+            for path in cache_dir.glob(pattern):
+                try:
+                    if path.stat().st_mtime <= cutoff:
+                        path.unlink()
+                        removed += 1
+                except OSError:
+                    continue
+        return removed
+
     def _save_as_dataset(
         self,
-        search_results: pd.DataFrame,
+        search_results: Union[pd.DataFrame, pa.Table, Iterable[pa.RecordBatch]],
         output_path: Union[str, Path], 
         include_images: bool = False,
         check_path_exists: bool = True,
@@ -916,6 +1464,21 @@ class DatalakeClient:
     def _handle_existing_data(self, provider: str, dataset_name: str, task: str = None, 
                             variant: str = None, overwrite: bool = False, is_raw: bool = True):
         """기존 데이터 처리 로직"""
+        if self.http_transport is not None:
+            existing = self.http_transport.pending_uploads(
+                provider, dataset_name, task, variant=variant, is_raw=is_raw, delete=False
+            )
+            if existing and not overwrite:
+                self.logger.warning(f"⚠️ 이미 pending 데이터가 있어 업로드를 건너뜁니다: {len(existing)}개")
+                self.logger.info("💡 덮어쓰려면 overwrite=True를 사용하세요")
+                return False
+            if existing:
+                self.http_transport.pending_uploads(
+                    provider, dataset_name, task, variant=variant, is_raw=is_raw, delete=True
+                )
+                self.logger.info(f"🗑️ 삭제 완료: {', '.join(existing)}")
+            return True
+
         existing_dirs = self._cleanup_existing_pending(
             provider, dataset_name, task, variant=variant, is_raw=is_raw
         )
@@ -935,27 +1498,374 @@ class DatalakeClient:
         
         return True
 
+    def close(self):
+        """풀에 보관 중인 DuckDB 연결 종료"""
+        with self._duck_pool_lock:
+            for duck_client in self._duck_pool.values():
+                try:
+                    duck_client.close()
+                except Exception as e:
+                    self.logger.warning(f"⚠️ DuckDB 연결 종료 실패: {e}")
+            self._duck_pool.clear()
+
+    def __getstate__(self):
+        # datasets.map(num_proc>1)이 self를 참조하는 함수를 pickle하므로 연결 풀은 제외
+        state = self.__dict__.copy()
+        state['_duck_pool'] = {}
+        state.pop('_duck_pool_lock', None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._duck_pool_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _db_generation_token(self) -> tuple:
+        """DB 내용 식별자 (catalog 세대, DB 파일 mtime) - 둘 중 하나라도 바뀌면 이전 연결/캐시는 무효"""
+        return (
+            read_catalog_generation(self.catalog_path),
+            self.duckdb_path.stat().st_mtime_ns,
+        )
+
+    def _get_duck_client(self) -> DuckDBClient:
+        """읽기 전용 DuckDB 연결 반환 (DB 경로/catalog 세대/DB 파일이 같으면 재사용)"""
+        if not self.duckdb_path.exists():
+            raise FileNotFoundError("DB가 없습니다. build_db()로 먼저 생성하세요.")
+
+        pool_key = (str(self.duckdb_path),) + self._db_generation_token()
+        with self._duck_pool_lock:
+            duck_client = self._duck_pool.get(pool_key)
+            if duck_client is not None:
+                return duck_client
+
+        # 세대나 DB 파일이 바뀌었으면 이전 연결은 정리
+        self.close()
+        with self._duck_pool_lock:
+            duck_client = DuckDBClient(
+                str(self.duckdb_path),
+                read_only=True,
+                threads=self.duckdb_threads,
+                memory_limit=self.duckdb_memory_limit,
+            )
+            duck_client.catalog_generation = pool_key[1]
+            self._duck_pool[pool_key] = duck_client
+            self.logger.debug(f"🔌 DuckDB 연결 생성: {pool_key}")
+            self._refresh_catalog_view(duck_client, pool_key[1])
+            return duck_client
+
+    def _refresh_catalog_view(self, duck_client: DuckDBClient, catalog_generation: int):
+        """view 모드 DB가 이전 세대면 연결에 현재 manifest 기준 뷰를 만들어 catalog 뷰를 가림
+
+        DB 파일의 뷰는 구축 시점의 segment 목록을 가리키므로 그대로 두면 이후 업로드가 보이지 않고,
+        compaction으로 빠진 segment가 보존 기간 뒤 삭제되면 조회가 실패한다.
+        segment/컬럼 존재/파티션 통계 테이블도 연결의 인메모리 DB에 다시 만들고,
+        데이터 복사본인 hash 색인, 보조 테이블, 텍스트 색인은 build_db 전까지 조회에 쓰지 않는다
+        (DuckDBClient.derived_tables_current).
+        """
+        meta = duck_client.read_meta()
+        db_generation = meta.get('catalog_generation')
+        if meta.get('mode') != "view" or (db_generation is not None and int(db_generation) == catalog_generation):
+            return
+
+        try:
+            segments = list_catalog_segments(self.catalog_path)
+            if not segments:
+                return
+            parquet_files = [segment['path'].as_posix() for segment in segments]
+            segments_table = f"{self.table_name}_segments"
+            duck_client.attach_overlay()
+            duck_client.create_view_from_parquet(
+                self.table_name,
+                parquet_files,
+                hive_partitioning=True,
+                union_by_name=True,
+                **self._catalog_source_options(segments),
+            )
+            duck_client.write_segments(
+                segments_table,
+                parquet_files,
+                [segment.get('asset_bytes') for segment in segments],
+                [sorted(segment.get('constants') or {}) for segment in segments],
+            )
+            duck_client.create_column_presence_table(
+                f"{self.table_name}_column_presence", parquet_files, segments_table
+            )
+            duck_client.create_partition_stats_table(
+                f"{self.table_name}_partition_stats", parquet_files, segments_table
+            )
+            self.logger.info(f"🔄 catalog 뷰를 현재 세대로 갱신: {db_generation} → {catalog_generation}")
+        except Exception as e:
+            self.logger.warning(f"⚠️ catalog 뷰 갱신 실패 (구축 시점 뷰 사용): {e}")
+
+    def _catalog_source_options(self, segments: List[Dict]) -> Dict:
+        """catalog 테이블/뷰 생성 시 segment별 상수 컬럼과 JSON으로 읽을 컬럼
+
+        이전 버전에서 같은 컬럼이 중첩 타입과 문자열로 섞여 저장된 catalog도 읽을 수 있도록
+        충돌하는 컬럼의 중첩 파일은 JSON 문자열로 읽는다.
+        """
+        parquet_files = [segment['path'] for segment in segments]
+        json_columns = json_fallback_columns(parquet_files)
+        conflicted = sorted({col for columns in json_columns for col in columns})
+        if conflicted:
+            self.logger.warning(
+                f"⚠️ 중첩 타입과 문자열이 섞여 저장된 컬럼은 JSON 문자열로 조회합니다: {conflicted}"
+            )
+        return {
+            # segment 메타데이터로만 저장된 상수 컬럼(lang/src 등)은 리터럴 컬럼으로 노출
+            'constants': [segment.get('constants') for segment in segments],
+            'json_columns': json_columns,
+        }
+
+    def _build_hot_table(self, duck_client, hot_columns: List[str]):
+        """view 모드용 보조 테이블 생성 (파티션 + hash/path + 지정 컬럼)"""
+        available = duck_client.get_table_info(self.table_name)['column_name'].tolist()
+        missing = [col for col in hot_columns if col not in available]
+        if missing:
+            self.logger.warning(f"⚠️ catalog에 없는 컬럼은 보조 테이블에서 제외: {missing}")
+
+        columns = self.PARTITION_COLUMNS + [
+            col for col in ['hash', 'path'] + hot_columns
+            if col in available and col not in self.PARTITION_COLUMNS
+        ]
+        columns = list(dict.fromkeys(columns))
+        self.logger.info(f"📊 보조 테이블 생성 중: {self.hot_table_name} ({columns})")
+        duck_client.create_side_table(self.hot_table_name, self.table_name, columns)
+
+    def _build_derived_tables(
+        self,
+        duck_client,
+        segments: List[Dict],
+        catalog_generation: int,
+        mode: str,
+        hot_columns: List[str],
+        text_index_columns: List[str],
+        label_text_paths: Dict[str, List[str]],
+    ):
+        """catalog 테이블/뷰에서 파생되는 색인/보조 테이블과 메타데이터 생성"""
+        parquet_files = [segment['path'].as_posix() for segment in segments]
+        text_index_columns, label_text_paths = self._build_text_tables(
+            duck_client, text_index_columns, label_text_paths
+        )
+
+        # hash 기준 조회용 정렬 색인
+        duck_client.create_hash_index(self.table_name)
+
+        # 증분 구축 시 비교할 반영 segment 목록 (서버가 기록한 asset 크기, 상수 컬럼 포함)
+        duck_client.write_segments(
+            f"{self.table_name}_segments",
+            parquet_files,
+            [segment.get('asset_bytes') for segment in segments],
+            [sorted(segment.get('constants') or {}) for segment in segments],
+        )
+
+        # 검색 시 컬럼 존재 여부 판단용 (Parquet 메타데이터만 읽음)
+        duck_client.create_column_presence_table(
+            f"{self.table_name}_column_presence",
+            parquet_files,
+            f"{self.table_name}_segments",
+        )
+
+        # get_db_info/get_partitions용 파티션 통계 (전체 테이블 GROUP BY 대신 사용)
+        duck_client.create_partition_stats_table(
+            f"{self.table_name}_partition_stats",
+            parquet_files,
+            f"{self.table_name}_segments",
+        )
+
+        duck_client.write_meta({
+            'mode': mode,
+            'hot_columns': json.dumps(hot_columns),
+            'text_index_columns': json.dumps(text_index_columns),
+            'label_text_paths': json.dumps(label_text_paths, ensure_ascii=False),
+            'text_ngram_size': self.TEXT_NGRAM_SIZE,
+            'catalog_path': str(self.catalog_path),
+            'catalog_generation': catalog_generation,
+            'built_at': datetime.now().isoformat(),
+        })
+
+    def _update_db_incremental(
+        self,
+        mode: str,
+        text_index_columns: Optional[List[str]],
+        label_text_paths: Optional[Dict[str, List[str]]],
+    ) -> Optional[bool]:
+        """기존 table 모드 DB에 catalog segment 변경분만 반영
+
+        추가된 segment는 행을 INSERT하고, segment가 빠진 파티션(compaction/교체)은
+        해당 파티션 행을 지운 뒤 현재 segment로 다시 채운다. 파생 테이블은 테이블에서 다시 만든다.
+
+        Returns:
+            성공 여부, 증분 갱신이 불가능하면 None (view 모드, 이전 형식 DB 등)
+        """
+        if mode != "table":
+            return None
+
+        catalog_generation = read_catalog_generation(self.catalog_path)
+        current_segments = list_catalog_segments(self.catalog_path)
+        current_files = [segment['path'].as_posix() for segment in current_segments]
+
+        self.close()
+        with DuckDBClient(
+            str(self.duckdb_path),
+            read_only=False,
+            threads=self.duckdb_threads,
+            memory_limit=self.duckdb_memory_limit,
+        ) as duck_client:
+            meta = duck_client.read_meta()
+            loaded_files = duck_client.read_segments(f"{self.table_name}_segments")
+            if meta.get('mode', 'table') != "table" or loaded_files is None:
+                return None
+
+            def partition_of(file_path: str) -> tuple:
+                parts = Path(file_path).parent.relative_to(self.catalog_path).parts
+                return tuple(part.split("=", 1)[1] for part in parts)
+
+            loaded, current = set(loaded_files), set(current_files)
+            removed = loaded - current
+            reload_partitions = {partition_of(f) for f in removed}
+            added = sorted(
+                f for f in current
+                if f not in loaded or partition_of(f) in reload_partitions
+            )
+            if not added and not removed:
+                duck_client.write_meta({'catalog_generation': catalog_generation})
+                self.logger.info("✅ DB가 이미 최신 상태입니다")
+                return True
+
+            self.logger.info(
+                f"🔄 증분 갱신: 추가 segment {len(added)}개, 재적재 파티션 {len(reload_partitions)}개"
+            )
+            duck_client.connection.execute("BEGIN TRANSACTION")
+            try:
+                for partition in sorted(reload_partitions):
+                    conditions = " AND ".join(f"{col} = ?" for col in self.PARTITION_COLUMNS)
+                    duck_client.connection.execute(
+                        f"DELETE FROM {self.table_name} WHERE {conditions}", list(partition)
+                    )
+                if added:
+                    constants_by_file = {
+                        segment['path'].as_posix(): segment.get('constants') for segment in current_segments
+                    }
+                    # 테이블에 문자열로 적재된 컬럼은 새 segment의 중첩 값도 JSON 문자열로 넣는다
+                    table_types = dict(
+                        duck_client.get_table_info(self.table_name)[['column_name', 'column_type']].values
+                    )
+                    json_columns = [
+                        [
+                            field.name for field in schema or []
+                            if is_nested_type(field.type) and table_types.get(field.name) == 'VARCHAR'
+                        ]
+                        for schema in read_file_schemas(added)
+                    ]
+                    duck_client.insert_from_parquet(
+                        self.table_name,
+                        added,
+                        [constants_by_file[f] for f in added],
+                        json_columns,
+                    )
+
+                if text_index_columns is None:
+                    text_index_columns = json.loads(meta.get('text_index_columns') or '[]')
+                if label_text_paths is None:
+                    label_text_paths = json.loads(meta.get('label_text_paths') or '{}')
+                self._build_derived_tables(
+                    duck_client,
+                    current_segments,
+                    catalog_generation,
+                    mode=mode,
+                    hot_columns=[],
+                    text_index_columns=text_index_columns,
+                    label_text_paths=label_text_paths,
+                )
+                duck_client.connection.execute("COMMIT")
+            except Exception as e:
+                duck_client.connection.execute("ROLLBACK")
+                self.logger.warning(f"⚠️ 증분 갱신 실패: {e}")
+                return None
+
+            total_rows = duck_client.execute_query(
+                f"SELECT COUNT(*) AS total FROM {self.table_name}"
+            )['total'].iloc[0]
+            self.logger.info(f"✅ DB 증분 갱신 완료! 총 {total_rows:,}개 행")
+        return True
+
+    def _build_text_tables(
+        self,
+        duck_client,
+        text_index_columns: List[str],
+        label_text_paths: Dict[str, List[str]],
+    ):
+        """텍스트 검색용 문서 테이블, n-gram 색인, 라벨 텍스트 테이블 생성 (catalog에 있는 컬럼만)
+
+        Returns:
+            (실제로 색인된 컬럼 목록, 실제로 펼친 {컬럼: [JSON 경로]})
+        """
+        requested = list(dict.fromkeys(list(text_index_columns) + list(label_text_paths)))
+        if not requested:
+            return [], {}
+        available = duck_client.get_table_info(self.table_name)['column_name'].tolist()
+        missing = [col for col in requested if col not in available]
+        if missing:
+            self.logger.warning(f"⚠️ catalog에 없는 컬럼은 텍스트 색인에서 제외: {missing}")
+
+        text_index_columns = [col for col in dict.fromkeys(text_index_columns) if col in available]
+        label_text_paths = {
+            col: list(dict.fromkeys(paths))
+            for col, paths in label_text_paths.items()
+            if col in available and paths
+        }
+        doc_columns = list(dict.fromkeys(text_index_columns + list(label_text_paths)))
+        if not doc_columns:
+            return [], {}
+
+        duck_client.create_text_docs_table(self.table_name, doc_columns)
+        if text_index_columns:
+            self.logger.info(f"🔤 텍스트 색인 생성 중: {text_index_columns} ({self.TEXT_NGRAM_SIZE}-gram)")
+            duck_client.create_text_index(self.table_name, text_index_columns, self.TEXT_NGRAM_SIZE)
+        if label_text_paths:
+            self.logger.info(f"🏷️ 라벨 텍스트 테이블 생성 중: {label_text_paths}")
+            duck_client.create_label_texts_table(self.table_name, label_text_paths)
+        return text_index_columns, label_text_paths
+
+    def _resolve_search_table(self, duck_client, column: str) -> str:
+        """텍스트 검색 대상 테이블 결정 (보조 테이블에 컬럼이 있고 현재 catalog 세대 기준이면 보조 테이블 사용)"""
+        if not duck_client.derived_tables_current():
+            return self.table_name
+        hot_columns = json.loads(duck_client.read_meta().get('hot_columns', '[]'))
+        if column in hot_columns:
+            return self.hot_table_name
+        return self.table_name
+
     def _validate_db(self, duck_client):
         """DB 유효성 검사"""
         tables = duck_client.list_tables()
         if tables.empty or self.table_name not in tables['name'].values:
             raise ValueError(f"❌ '{self.table_name}' 테이블이 없습니다. DB가 올바르게 구축되었는지 확인하세요.")
 
-    def _is_db_outdated(self) -> bool:
-        """DB가 최신 상태인지 확인"""
+    def _is_db_outdated(self, db_meta: Optional[Dict] = None) -> bool:
+        """DB가 최신 상태인지 확인 (catalog 세대 번호 비교)
+
+        Args:
+            db_meta: 이미 읽어둔 DB 메타데이터 (None이면 DB에서 조회)
+        """
         if not self.duckdb_path.exists():
             return True
 
-        db_mtime = self.duckdb_path.stat().st_mtime
+        if db_meta is None:
+            duck_client = self._get_duck_client()
+            db_meta = duck_client.read_meta()
 
-        # 가장 최근 Parquet 파일 확인
-        latest_parquet_mtime = 0
-        for parquet_file in self.catalog_path.rglob("*.parquet"):
-            file_mtime = parquet_file.stat().st_mtime
-            if file_mtime > latest_parquet_mtime:
-                latest_parquet_mtime = file_mtime
-        
-        return latest_parquet_mtime > db_mtime
+        db_generation = db_meta.get('catalog_generation')
+        if db_generation is None:
+            # 세대 정보가 없는 이전 버전 DB
+            return True
+
+        return int(db_generation) != read_catalog_generation(self.catalog_path)
 
     def _cleanup_db_files(self):
         """DB 관련 파일들 정리"""
@@ -976,60 +1886,164 @@ class DatalakeClient:
                 except Exception as e:
                     self.logger.warning(f"⚠️ 삭제 실패: {file_path} - {e}")
 
-    def _perform_partition_search(
-        self, 
-        duck_client, 
-        providers, 
-        datasets, 
-        tasks, 
-        variants, 
-        limit
-    ):
-        """파티션 기반 검색 실행"""
-        return duck_client.retrieve_with_existing_cols(
-            providers=providers,
-            datasets=datasets, 
-            tasks=tasks,
-            variants=variants,
-            table=self.table_name,
-            limit=limit
+    def _build_search_query(
+        self,
+        duck_client,
+        providers,
+        datasets,
+        tasks,
+        variants,
+        text_search,
+        limit,
+        sample=None,
+    ) -> Optional[Query]:
+        """검색 조건에 맞는 쿼리 생성 (조회할 컬럼이 없으면 None)"""
+        if sample is None:
+            query_limit = limit
+        else:
+            # 샘플링 후에 limit 적용
+            query_limit = None
+
+        if text_search:
+            # 텍스트 검색
+            query = self._build_text_search_query(duck_client, text_search, query_limit)
+        else:
+            # 파티션 기반 검색
+            query = duck_client.existing_cols_query(
+                providers=providers,
+                datasets=datasets, 
+                tasks=tasks,
+                variants=variants,
+                table=self.table_name,
+                limit=query_limit
+            )
+
+        if query is None or sample is None:
+            return query
+        partition_filters = {
+            'provider': providers,
+            'dataset': datasets,
+            'task': tasks,
+            'variant': variants,
+        }
+        return self._apply_sample(duck_client, query, sample, partition_filters, limit, bool(text_search))
+
+    def _apply_sample(
+        self,
+        duck_client,
+        query: Query,
+        sample: Union[int, float, Dict],
+        partition_filters: Dict[str, Optional[List[str]]],
+        limit: Optional[int],
+        text_search: bool = False,
+    ) -> Query:
+        """검색 쿼리를 DuckDB 샘플링 쿼리로 감싸기 (search()의 sample 인자 해석)"""
+        if isinstance(sample, bool):
+            raise ValueError(f"잘못된 sample 값: {sample}")
+        if isinstance(sample, int):
+            sample = {'rows': sample}
+        elif isinstance(sample, float):
+            sample = {'fraction': sample}
+        elif not isinstance(sample, dict):
+            raise ValueError(f"잘못된 sample 값: {sample}")
+
+        sample = dict(sample)
+        per_partition = sample.pop('per_partition', None)
+        unknown = set(sample) - {'rows', 'fraction', 'method', 'seed'}
+        if unknown:
+            raise ValueError(f"알 수 없는 sample 옵션: {', '.join(sorted(unknown))}")
+
+        builder = CatalogQueryBuilder(self.table_name)
+        if per_partition is None:
+            return builder.sample(query, limit=limit, **sample)
+
+        # 파티션별 할당량 (층화 샘플링)
+        if text_search:
+            raise ValueError("텍스트 검색 결과에는 파티션 컬럼이 없어 per_partition 샘플링을 할 수 없습니다")
+        if 'rows' in sample or 'fraction' in sample:
+            raise ValueError("per_partition 샘플링에는 rows/fraction을 함께 지정할 수 없습니다")
+
+        partitions_df = duck_client.retrieve_partitions(self.table_name)
+        for column, values in partition_filters.items():
+            values = builder.normalize_values(values)
+            if values:
+                partitions_df = partitions_df[partitions_df[column].isin(values)]
+        partitions = [
+            tuple(partition)
+            for partition in partitions_df[self.PARTITION_COLUMNS].itertuples(index=False)
+        ]
+
+        if isinstance(per_partition, dict):
+            quotas = [
+                (partition, per_partition['/'.join(partition)])
+                for partition in partitions if '/'.join(partition) in per_partition
+            ]
+        else:
+            quotas = [(partition, per_partition) for partition in partitions]
+        self.logger.debug(f"🎯 파티션별 샘플링: {len(quotas)}개 파티션")
+
+        return builder.stratified_sample(
+            query,
+            quotas,
+            method=sample.get('method'),
+            seed=sample.get('seed'),
+            limit=limit,
         )
 
-    def _perform_text_search(
+    def _build_text_search_query(
         self,
         duck_client,
         text_search,
         limit,
-    ):
-        """텍스트 기반 검색 실행"""
+    ) -> Query:
+        """텍스트 기반 검색 쿼리 생성 (라벨 텍스트 테이블 → n-gram 색인 → 전체 스캔 순)"""
         column = text_search.get("column")
         text = text_search.get("text")
         json_path = text_search.get("json_path")
+        builder = CatalogQueryBuilder(self.table_name)
+        ngram_size = duck_client.text_index_ngram_size(column)
 
-        if json_path:
-            # JSON 검색
-            sql = duck_client.json_queries.search_text_in_column(
-                table=self.table_name,
+        if json_path and duck_client.label_text_covers(column, [json_path]):
+            # build_db에서 펼쳐 둔 라벨 텍스트 테이블 조회 (JSON 파싱 없음)
+            self.logger.debug(f"🏷️ 라벨 텍스트 테이블 사용: {column} {json_path}")
+            query = builder.label_text_search(
                 column=column,
+                json_paths=[json_path],
                 search_text=text,
-                search_type="json",
-                json_loc=json_path,
-                engine="duckdb"
+                ngram_size=ngram_size,
+                limit=limit,
             )
-        else:
-            # 단순 텍스트 검색
-            sql = duck_client.json_queries.search_text_in_column(
-                table=self.table_name,
+            return query
+
+        if ngram_size:
+            # n-gram 색인으로 후보를 좁힌 뒤 검증
+            query = builder.indexed_text_search(
                 column=column,
                 search_text=text,
-                search_type="simple",
-                engine="duckdb"
+                json_path=json_path,
+                ngram_size=ngram_size,
+                limit=limit,
             )
+            if query is not None:
+                self.logger.debug(f"🔤 텍스트 색인 사용: {column}")
+                return query
 
-        if limit is not None:
-            sql += f" LIMIT {limit}"
-            
-        return duck_client.execute_query(sql)
+        table = self._resolve_search_table(duck_client, column)
+        builder = CatalogQueryBuilder(table)
+        conditions = Query("", [])
+        if json_path:
+            # 라벨 텍스트 테이블을 쓸 때와 같은 행 범위 (`{variant}` 경로면 해당 variant만)
+            conditions = duck_client.label_conditions(builder, conditions, column, json_path)
+
+        # json_path가 있으면 JSON 배열 원소 검색, 없으면 단순 텍스트 검색
+        return builder.text_search(
+            column=column,
+            search_text=text,
+            json_path=json_path,
+            conditions=conditions,
+            limit=limit,
+            nested=column in duck_client.nested_columns(table),
+        )
 
     def _add_images_to_dataset(self, dataset):
         def load_image(example):
@@ -1097,6 +2111,8 @@ class DatalakeClient:
         dataset_description: str = "",
         original_source: str = "",
         meta: Optional[Dict] = None,
+        nested_columns: Optional[List[str]] = None,
+        write_mode: str = "append",
     ) -> Dict:
         """메타데이터 생성"""
         metadata = {
@@ -1113,7 +2129,8 @@ class DatalakeClient:
             'uploaded_by': self.user_id,
             'uploaded_at': datetime.now().isoformat(),
             'file_id': str(uuid.uuid4())[:8],
-            
+            'nested_columns': nested_columns or [],
+            'write_mode': write_mode,
         }
         if meta:
             metadata.update(meta)
@@ -1178,9 +2195,16 @@ class DatalakeClient:
                 raise FileNotFoundError(f"❌ 데이터 파일이 존재하지 않습니다: {data_path}")
             
             if data_path.is_dir():
+                # save_to_disk 폴더가 아니면 Parquet shard 폴더로 취급
+                if (data_path / "state.json").exists() or (data_path / "dataset_dict.json").exists():
+                    return "datasets_folder"
+                if any(data_path.rglob("*.parquet")):
+                    return "parquet"
                 return "datasets_folder"
             elif data_path.suffix == '.parquet':
                 return "parquet"
+            elif data_path.suffix == '.arrow':
+                return "arrow"
             else:
                 raise ValueError(f"❌ 지원하지 않는 파일 형식: {data_path.suffix}")
         else:
@@ -1218,13 +2242,31 @@ class DatalakeClient:
                 
         elif data_type == "parquet":
             data_path = Path(data_source).resolve()
-            self.logger.info(f"📂 Parquet 파일 로드 중: {data_path}")
+            parquet_files = (
+                sorted(str(f) for f in data_path.rglob("*.parquet")) if data_path.is_dir() else [str(data_path)]
+            )
+            self.logger.info(f"📂 Parquet 파일 로드 중: {data_path} ({len(parquet_files)}개 파일)")
             try:
-                df = pd.read_parquet(data_path)
-                dataset_obj = Dataset.from_pandas(df)
-                self.logger.info(f"✅ Parquet 파일 로드 완료: {len(df)} 행")
+                # pandas를 거치지 않고 batch 단위로 Arrow 캐시 파일에 쓴 뒤 memory-map
+                # (이미지 bytes 컬럼이 있어도 전체를 메모리에 올리지 않음)
+                dataset_obj = Dataset.from_parquet(
+                    parquet_files,
+                    num_proc=min(self.num_proc, len(parquet_files)),
+                    batch_size=self.PARQUET_LOAD_BATCH_SIZE,
+                )
+                self.logger.info(f"✅ Parquet 파일 로드 완료: {len(dataset_obj)} 행")
             except Exception as e:
                 raise ValueError(f"❌ Parquet 파일 로드 실패: {e}")
+
+        elif data_type == "arrow":
+            data_path = Path(data_source).resolve()
+            self.logger.info(f"📂 Arrow 파일 로드 중: {data_path}")
+            try:
+                # Arrow IPC 스트림 파일은 복사 없이 바로 memory-map
+                dataset_obj = Dataset.from_file(str(data_path))
+                self.logger.info(f"✅ Arrow 파일 로드 완료: {len(dataset_obj)} 행")
+            except Exception as e:
+                raise ValueError(f"❌ Arrow 파일 로드 실패: {e}")
         
         else:            
             raise ValueError(f"❌ 지원하지 않는 데이터 타입: {data_type}. ")
@@ -1265,14 +2307,18 @@ class DatalakeClient:
         else:
             self.logger.debug("📄 Assets 컬럼 처리 생략")
             
-        dataset_obj = self._process_cast_columns(dataset_obj)
+        dataset_obj, file_info['nested_columns'] = self._process_cast_columns(dataset_obj)
         return dataset_obj, file_info
 
     def _detect_file_columns_and_type(
         self,
         dataset_obj: Dataset,
     ) -> Dict:
-        """파일 컬럼들을 찾고 확장자 기반으로 type 결정"""
+        """파일 컬럼들을 찾고 확장자 기반으로 type 결정
+
+        행을 디코딩하지 않고 features/Arrow 스키마로 판단하며, 경로 컬럼만
+        앞쪽 non-null 값 일부를 Arrow에서 꺼내 실제 파일 존재 여부를 확인한다.
+        """
         result = {
             'image_columns': [],
             'file_columns': [],
@@ -1280,17 +2326,25 @@ class DatalakeClient:
             'type': 'text'
         }
         for key in dataset_obj.column_names:
-            sample_value = dataset_obj[0][key]
-            
-            # PIL Image나 bytes 데이터인 경우
+            # 이미지 데이터 컬럼 (이름 기준)
             if key in self.image_data_candidates:
                 result['image_columns'].append(key)
-            # 경로 기반 파일인 경우
-            elif key in self.file_path_candidates:
-                if isinstance(sample_value, str) and Path(sample_value).exists():
-                    ext = Path(sample_value).suffix.lower()
-                    result['extensions'].add(ext)
+            # 경로 기반 파일인 경우 (문자열 컬럼만)
+            elif key in self.file_path_candidates and self._is_string_column(dataset_obj, key):
+                existing = [
+                    path for path in self._sample_column_values(dataset_obj, key)
+                    if Path(path).exists()
+                ]
+                if existing:
+                    result['extensions'].update(Path(path).suffix.lower() for path in existing)
                     result['file_columns'].append(key)
+
+        # 후보 이름이 없으면 Image feature 컬럼 사용
+        if not result['image_columns']:
+            result['image_columns'] = [
+                key for key, feature in dataset_obj.features.items()
+                if isinstance(feature, DatasetImage) and key not in result['file_columns']
+            ]
                     
         if len(result['image_columns']) > 1:
             raise ValueError(f"❌ 이미지 컬럼이 2개 이상입니다: {result['image_columns']}. "
@@ -1323,6 +2377,31 @@ class DatalakeClient:
         
         return result
 
+    @staticmethod
+    def _is_list_type(arrow_type: pa.DataType) -> bool:
+        return (
+            pa.types.is_list(arrow_type)
+            or pa.types.is_large_list(arrow_type)
+            or pa.types.is_fixed_size_list(arrow_type)
+        )
+
+    @staticmethod
+    def _is_string_column(dataset_obj: Dataset, key: str) -> bool:
+        arrow_type = dataset_obj.data.schema.field(key).type
+        return pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type)
+
+    @staticmethod
+    def _sample_column_values(
+        dataset_obj: Dataset,
+        key: str,
+        sample_size: int = 100,
+        scan_rows: int = 1000,
+    ) -> List:
+        """앞쪽 scan_rows행에서 non-null 값 최대 sample_size개 (Arrow 형식으로 꺼내므로 디코딩 없음)"""
+        column = dataset_obj.select_columns([key]).with_format("arrow")[:scan_rows].column(key)
+        values = pc.drop_null(column).to_pylist()
+        return [value for value in values if value][:sample_size]
+
     def _normalize_column_names(
         self,
         dataset_obj: Dataset,
@@ -1352,40 +2431,71 @@ class DatalakeClient:
         return dataset_obj
 
     def _process_cast_columns(self, dataset_obj: Dataset):
-        
+        """dict/list 컬럼 처리
+
+        기본은 JSON 문자열로 변환하고, nested_labels=True면 Arrow struct/list 타입을 그대로 유지한다.
+
+        Returns:
+            (변환된 데이터셋, 중첩 타입으로 유지한 컬럼 목록)
+        """
         self.logger.info("🔍 JSON 변환 대상 컬럼 검사 시작")
         json_cast_columns = []
+        schema = dataset_obj.data.schema
         
-        for key in dataset_obj.column_names:
-            sample_value = dataset_obj[0][key]
-            
-            if isinstance(sample_value, (dict, list)):
+        for key, feature in dataset_obj.features.items():
+            # Image 등은 Arrow에서 struct지만 dict 데이터가 아님
+            if isinstance(feature, DatasetImage):
+                continue
+            arrow_type = schema.field(key).type
+            if pa.types.is_struct(arrow_type) or self._is_list_type(arrow_type):
                 json_cast_columns.append(key)
-                self.logger.info(f"📝 JSON 변환 대상 컬럼 발견: '{key}' (타입: {type(sample_value).__name__})")
+                self.logger.info(f"📝 JSON 변환 대상 컬럼 발견: '{key}' (타입: {arrow_type})")
         
+        if json_cast_columns and self.nested_labels:
+            self.logger.info(f"🧱 중첩 타입으로 저장: {json_cast_columns}")
+            return dataset_obj, json_cast_columns
+
         # JSON dumps 처리
         if json_cast_columns:
             dataset_obj = self._apply_json_transform(dataset_obj, json_cast_columns)
         else:
             self.logger.info("📄 JSON 변환 대상 컬럼 없음")
         
-        return dataset_obj
+        return dataset_obj, []
 
     def _apply_json_transform(self, dataset_obj: Dataset, json_cast_columns: list) -> Dataset:
-        """JSON 변환 적용"""
+        """JSON 변환 적용
+
+        행마다 dict로 디코딩해 json.dumps 하는 대신 Arrow 배치를 DuckDB to_json()으로 직렬화한다.
+        DuckDB가 배치 내부를 병렬 처리하므로 num_proc 워커로 데이터셋을 pickle하지 않는다.
+        출력은 공백 없는 JSON이며 json_extract/json.loads 결과는 json.dumps와 같다.
+        """
         self.logger.info(f"🔄 {len(json_cast_columns)}개 컬럼을 JSON으로 변환 중: {json_cast_columns}")
-        
-        def json_transform(x):
-            if isinstance(x, (dict, list)):
-                return json.dumps(x, ensure_ascii=False)
-            return x
-        
+
+        query = SQLQueries.columns_to_json("batch_view", json_cast_columns)
+
+        # 연결은 배치마다 새로 열어야 map()이 함수를 해시(캐시 fingerprint)할 수 있음
+        def json_transform_batch(batch: pa.Table) -> pa.Table:
+            with duckdb.connect() as connection:
+                connection.register("batch_view", batch.select(json_cast_columns))
+                encoded = DuckDBClient.to_arrow_table(connection.execute(query))
+            for col in json_cast_columns:
+                batch = batch.set_column(batch.schema.get_field_index(col), col, encoded.column(col))
+            return batch
+
+        # 결과 타입을 고정해야 null만 있는 shard도 string 컬럼으로 합쳐짐
+        features = dataset_obj.features.copy()
+        for col in json_cast_columns:
+            features[col] = Value('string')
+
         try:
-            dataset_obj = dataset_obj.map(
-                lambda x: {col: json_transform(x[col]) for col in json_cast_columns},
-                num_proc=self.num_proc,
+            dataset_obj = dataset_obj.with_format("arrow").map(
+                json_transform_batch,
+                batched=True,
+                batch_size=self.JSON_TRANSFORM_BATCH_SIZE,
+                features=features,
                 desc="JSON 변환 중",
-            )
+            ).with_format(None)
             self.logger.info(f"✅ JSON 변환 완료: {json_cast_columns}")
             return dataset_obj
         except Exception as e:
@@ -1396,6 +2506,7 @@ class DatalakeClient:
         self,
         dataset_obj: Dataset,
         metadata: dict,
+        skip_existing_assets: bool = True,
     ) -> str:
         """데이터셋을 staging 폴더에 저장하고 메타데이터 파일 생성"""
         """데이터를 staging 폴더에 저장"""
@@ -1407,108 +2518,200 @@ class DatalakeClient:
         user = metadata['uploaded_by']
         
         staging_dirname = f"{dataset_name}_{task}_{variant}_{file_id}_{timestamp}_{user}"
-        staging_dir= self.staging_path / "pending" / staging_dirname
+        if self.http_transport is not None:
+            # 로컬 임시 디렉토리에 같은 구조를 만든 뒤 서버로 전송
+            local_root = Path(tempfile.mkdtemp(prefix="datalake_upload_"))
+            staging_dir = local_root / staging_dirname
+        else:
+            local_root = None
+            staging_dir = self.staging_path / "pending" / staging_dirname
         try:
             has_file = metadata.get('has_files', False)
             if has_file:
                 staging_assets_dir = staging_dir / "assets"
                 staging_assets_dir.mkdir(mode=0o775, parents=True, exist_ok=True)
+                if skip_existing_assets:
+                    dataset_obj = self._attach_existing_asset_refs(dataset_obj, metadata)
                 dataset_obj  = self._copy_file_path_to_staging(
                     dataset_obj, staging_assets_dir
                 )
                 
             if metadata.get('data_type') == 'task':
-                dataset_obj = self._add_metadata_columns(dataset_obj, metadata)
+                self._add_constant_columns(metadata)
             dataset_obj.save_to_disk(str(staging_dir))
             
             metadata_file = staging_dir / "upload_metadata.json"
             with open(metadata_file, 'w', encoding='utf-8') as f:
                 json.dump(metadata, f, ensure_ascii=False, indent=4)
+
+            if local_root is not None:
+                return self.http_transport.upload_dir(staging_dir, staging_dirname)['path']
                 
             self.logger.info(f"📦 datasets 저장 완료: {staging_dir}")
             return str(staging_dir)
         except Exception as e:
-            if staging_dir.exists():
+            if local_root is None and staging_dir.exists():
                 shutil.rmtree(staging_dir)
             raise 
+        finally:
+            if local_root is not None:
+                shutil.rmtree(local_root, ignore_errors=True)
     
-    def _copy_file_path_to_staging(self, dataset_obj: Dataset, staging_assets_dir: Path):
-        """파일 경로를 staging으로 복사"""
-        sample_value = dataset_obj[0][self.file_path_key]
-        
-        if isinstance(sample_value, str) and Path(sample_value).exists():
-            sample_path = Path(sample_value).resolve()
-            staging_device = os.stat(staging_assets_dir.parent).st_dev
-            source_device = os.stat(sample_path.parent).st_dev
-            same_device = (source_device == staging_device)
-            
-            copy_method = "OS 레벨 cp" if same_device else "Python copy2"
-            self.logger.debug(f"📤 파일 복사 모드: {copy_method} (device: {source_device}→{staging_device})")
-            def copy_file(example, idx):
-                original_path = Path(example[self.file_path_key]).resolve()
-                if original_path.exists():
-                    ext = original_path.suffix or ""
-                    prefix = "file"
-                    
-                    folder_num = idx // 1000
-                    folder_name = f"batch_{folder_num:04d}"
-                    new_filename = f"{prefix}_{idx:06d}{ext}"
-                    target_dir = staging_assets_dir / folder_name
-                    target_path = target_dir / new_filename
-                    target_path.parent.mkdir(mode=0o775,parents=True, exist_ok=True)
-                    
-                    if same_device:
-                        result = subprocess.run(
-                            ["cp", str(original_path), str(target_path)], 
-                            capture_output=True, text=True
-                        )
-                        if result.returncode != 0:
-                            raise RuntimeError(f"cp 명령 실패: {result.stderr}")
-                    else:
-                        shutil.copy2(original_path, target_path)
-                    relative_path = target_path.relative_to(self.staging_pending_path)
-                    example[self.file_path_key] = str(relative_path)
-                    
-                return example
-            
-            dataset_obj = dataset_obj.map(
-                copy_file, 
-                with_indices=True,
-                num_proc=self.num_proc,
-                desc="파일 경로 복사 중",)
+    def _attach_existing_asset_refs(self, dataset_obj: Dataset, metadata: Dict) -> Dataset:
+        """서버에 이미 있는 파일을 찾아 _asset_ref 컬럼으로 표시 (해당 행은 staging 복사 생략)
+
+        로컬에서 파일별 SHA256을 계산하고 서버 /assets/lookup에 한 번에 조회한다.
+        서버 중복 판정과 같은 범위(provider/dataset)이며, 조회에 실패하면 모든 파일을 복사한다.
+        """
+        paths = dataset_obj.data.column(self.file_path_key).to_pylist()
+        unique_paths = [path for path in dict.fromkeys(paths) if isinstance(path, str) and path]
+        if not unique_paths:
             return dataset_obj
-        else:
+
+        self.logger.info(f"🔑 업로드 파일 hash 계산 중: {len(unique_paths):,}개")
+        path_hashes = self._hash_local_files(unique_paths)
+        existing = self._lookup_existing_assets(
+            metadata['provider'], metadata['dataset'], list(set(path_hashes.values()))
+        )
+        if not existing:
+            self.logger.info("📄 이미 저장된 파일 없음 - 전체 파일을 staging에 복사")
+            return dataset_obj
+
+        refs = [existing.get(path_hashes.get(path)) for path in paths]
+        num_refs = sum(ref is not None for ref in refs)
+        self.logger.info(f"♻️ 이미 저장된 파일 {num_refs:,}/{len(paths):,}개는 staging 복사 생략")
+        metadata['deduplicated_files'] = num_refs
+        return dataset_obj.add_column(self.asset_ref_key, pa.array(refs, type=pa.string()))
+
+    def _hash_local_files(self, paths: List[str]) -> Dict[str, str]:
+        """로컬 파일 SHA256 계산 (스레드 병렬, 없는 파일은 제외)"""
+        def hash_file(path):
+            try:
+                return path, file_sha256(Path(path).resolve())
+            except OSError:
+                return path, None
+
+        num_workers = max(1, min(32, (self.num_proc or 1) * 4, len(paths)))
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            return {path: file_hash for path, file_hash in executor.map(hash_file, paths) if file_hash}
+
+    def _lookup_existing_assets(self, provider: str, dataset: str, hashes: List[str]) -> Dict[str, str]:
+        """서버에 저장된 asset 조회 ({hash: assets 기준 상대경로}, 실패 시 빈 dict)"""
+        existing = {}
+        try:
+            for start in range(0, len(hashes), self.ASSET_LOOKUP_BATCH_SIZE):
+                response = requests.post(
+                    f"{self.server_url}/assets/lookup",
+                    json={
+                        "provider": provider,
+                        "dataset": dataset,
+                        "hashes": hashes[start:start + self.ASSET_LOOKUP_BATCH_SIZE],
+                    },
+                    timeout=300,
+                )
+                if response.status_code != 200:
+                    self.logger.warning(f"⚠️ asset 조회 실패: {response.status_code} {response.text}")
+                    return {}
+                existing.update(response.json().get('existing', {}))
+        except requests.exceptions.RequestException as e:
+            self.logger.warning(f"⚠️ asset 조회 서버 연결 실패: {e}")
+            return {}
+        return existing
+
+    def _copy_file_path_to_staging(self, dataset_obj: Dataset, staging_assets_dir: Path):
+        """파일 경로를 staging으로 복사
+
+        경로 컬럼을 Arrow 배치로 읽으며 FileStager 스레드 풀에 복사 작업을 흘려보내고,
+        staging 기준 상대경로 컬럼을 마지막에 한 번에 교체한다.
+        """
+        samples = self._sample_column_values(dataset_obj, self.file_path_key, sample_size=1)
+        sample_value = samples[0] if samples else None
+        
+        if not (isinstance(sample_value, str) and Path(sample_value).exists()):
             self.logger.warning(f"⚠️ 파일 경로 컬럼 '{self.file_path_key}'가 유효하지 않거나 존재하지 않습니다: {sample_value}")
             raise ValueError(f"파일 경로 컬럼 '{self.file_path_key}'가 유효하지 않거나 존재하지 않습니다.")
+
+        columns = [self.file_path_key]
+        has_refs = self.asset_ref_key in dataset_obj.column_names
+        if has_refs:
+            columns.append(self.asset_ref_key)
+
+        staged_paths = []
+        num_copies = 0
+        # staging 디렉토리 이름부터의 상대경로 (서버가 staging/processing 기준으로 찾음)
+        relative_base = staging_assets_dir.relative_to(staging_assets_dir.parent.parent).as_posix()
+        created_dirs = set()
+
+        def copy_jobs():
+            nonlocal num_copies
+            batches = dataset_obj.select_columns(columns).with_format("arrow").iter(
+                batch_size=self.STAGING_SCAN_BATCH_SIZE
+            )
+            for batch in batches:
+                paths = batch.column(self.file_path_key).to_pylist()
+                refs = batch.column(self.asset_ref_key).to_pylist() if has_refs else [None] * len(paths)
+                for source, asset_ref in zip(paths, refs):
+                    idx = len(staged_paths)
+                    # 이미 저장된 asset은 복사하지 않고 서버가 _asset_ref 경로를 그대로 사용
+                    if asset_ref is not None:
+                        staged_paths.append(None)
+                        continue
+                    if not source:
+                        staged_paths.append(source)
+                        continue
+
+                    folder_name = f"batch_{idx // 1000:04d}"
+                    if folder_name not in created_dirs:
+                        (staging_assets_dir / folder_name).mkdir(mode=0o775, parents=True, exist_ok=True)
+                        created_dirs.add(folder_name)
+                    new_filename = f"file_{idx:06d}{os.path.splitext(source)[1]}"
+                    staged_paths.append(f"{relative_base}/{folder_name}/{new_filename}")
+                    num_copies += 1
+                    yield (idx, source), source, os.path.join(staging_assets_dir, folder_name, new_filename)
+
+        self.logger.info(f"📤 파일 복사 중: {len(dataset_obj):,}개 (스레드 {self.file_stager.max_workers}개)")
+        start_time = time.time()
+        missing = self.file_stager.copy_all(copy_jobs())
+
+        # 원본이 없는 파일은 기존처럼 경로를 그대로 둠
+        for idx, source in missing:
+            staged_paths[idx] = source
+        if missing:
+            self.logger.warning(f"⚠️ 원본 파일 없음: {len(missing):,}개")
+
+        self.logger.info(f"✅ 파일 복사 완료: {num_copies - len(missing):,}개, {time.time() - start_time:.2f}초")
+
+        column_names = dataset_obj.column_names
+        return (
+            dataset_obj.remove_columns([self.file_path_key])
+            .add_column(self.file_path_key, pa.array(staged_paths, type=pa.string()))
+            .select_columns(column_names)
+        )
         
-    def _add_metadata_columns(self, dataset_obj: Dataset, metadata: Dict):
-        """Task 데이터에 메타데이터 컬럼 추가"""
-        self.logger.info("📝 Task 메타데이터 컬럼 추가 중")
-        
+    def _add_constant_columns(self, metadata: Dict):
+        """Task 필수 필드(lang/src 등)를 업로드 단위 상수 컬럼으로 메타데이터에 기록
+
+        값은 행마다 저장하지 않고 서버가 segment 메타데이터(manifest, Parquet footer)에 한 번만 기록하며,
+        build_db의 catalog 테이블/뷰에서 일반 컬럼처럼 조회된다.
+        """
         required_fields = self.schema_manager.get_required_fields(metadata['task'])
         self.logger.debug(f"필수 필드: {required_fields}")
-        self.logger.debug(f"현재 columns: {dataset_obj.column_names}")
-        
-        # 데이터셋 길이
-        num_rows = len(dataset_obj)
-        # 필수 필드들만 컬럼으로 추가
-        added_columns = []
-        
+
+        constants = {}
         for field in required_fields:
             value = metadata.get(field)
             if value is None:
                 self.logger.warning(f"⚠️ 필수 필드 '{field}'가 메타데이터에 없습니다. 추가하지 않습니다.")
                 raise ValueError(f"필수 필드 '{field}'를 추가해주세요.")
-            column_data = [value] * num_rows
-            dataset_obj = dataset_obj.add_column(field, column_data)
-            added_columns.append(f"{field}={value}")
-            self.logger.debug(f"📝 컬럼 추가: {field} = {value}")
-        if added_columns:
-            self.logger.info(f"✅ 필수 필드 컬럼 추가 완료: {', '.join(added_columns)}")
+            constants[field] = value
+        metadata['constant_columns'] = constants
+        if constants:
+            self.logger.info(
+                f"✅ 필수 필드 상수 컬럼 기록: {', '.join(f'{k}={v}' for k, v in constants.items())}"
+            )
         else:
-            self.logger.info("📝 추가할 필수 필드 컬럼 없음")
-            
-        return dataset_obj
+            self.logger.info("📝 기록할 필수 필드 컬럼 없음")
+        return metadata
     
             
 if __name__ == "__main__":
@@ -0,0 +1,81 @@
+import errno
+import logging
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Hashable, Iterable, List, Optional, Tuple
+
+
+class FileStager:
+    """업로드 파일을 staging으로 복사하는 I/O 스레드 풀
+
+    Dataset.map(num_proc)처럼 프로세스를 띄우거나 데이터셋을 pickle하지 않고,
+    동시에 진행 중인 복사 수를 max_in_flight로 제한해 작업 목록을 스트리밍으로 소비한다.
+    지연이 큰 NAS는 max_workers를 크게(16~32), 로컬 디스크는 작게(4~8) 잡는 것이 유리하다.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 16,
+        max_in_flight: Optional[int] = None,  # 제출 후 완료되지 않은 복사 수 상한 (기본: max_workers * 4)
+        buffer_size: Optional[int] = None,  # None이면 shutil.copyfile (Linux는 sendfile), 지정 시 이 크기로 읽고 쓰기
+        symlink: bool = False,  # 복사 대신 원본을 가리키는 링크 생성 (HTTP 업로드 전 로컬 staging 구성용)
+    ):
+        self.max_workers = max(1, max_workers)
+        self.max_in_flight = max(self.max_workers, max_in_flight or self.max_workers * 4)
+        self.buffer_size = buffer_size
+        self.symlink = symlink
+        self.logger = logging.getLogger(__name__)
+
+    def copy_file(self, source: str, target: str):
+        """단일 파일 복사 (메타데이터는 복사하지 않음)"""
+        if self.symlink:
+            if not os.path.exists(source):
+                raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), source)
+            os.symlink(os.path.abspath(source), target)
+            return
+        if self.buffer_size is None:
+            shutil.copyfile(source, target)
+            return
+        with open(source, "rb") as fsrc, open(target, "wb") as fdst:
+            shutil.copyfileobj(fsrc, fdst, self.buffer_size)
+
+    def copy_all(self, jobs: Iterable[Tuple[Hashable, str, str]]) -> List[Hashable]:
+        """(key, 원본 경로, 대상 경로) 작업을 병렬 복사
+
+        대상 디렉토리는 호출 측에서 미리 만들어 둔다. 첫 오류가 나면 새 작업 제출을 멈추고 예외를 올린다.
+
+        Returns:
+            원본 파일이 없어 복사하지 못한 작업의 key 목록
+        """
+        slots = threading.BoundedSemaphore(self.max_in_flight)
+        lock = threading.Lock()
+        missing = []
+        errors = []
+
+        def run(key, source, target):
+            try:
+                self.copy_file(source, target)
+            except FileNotFoundError as e:
+                with lock:
+                    if e.filename == source:
+                        missing.append(key)
+                    else:
+                        errors.append(f"{source} → {target}: {e}")
+            except Exception as e:
+                with lock:
+                    errors.append(f"{source} → {target}: {e}")
+            finally:
+                slots.release()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="file_stager") as executor:
+            for key, source, target in jobs:
+                if errors:
+                    break
+                slots.acquire()
+                executor.submit(run, key, source, target)
+
+        if errors:
+            raise RuntimeError(f"파일 복사 실패 ({len(errors)}건): {errors[0]}")
+        return missing
@@ -0,0 +1,436 @@
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import boto3
+from boto3.s3.transfer import TransferConfig, create_transfer_manager
+from botocore.config import Config
+from s3transfer.utils import ChunksizeAdjuster
+
+from datalake.utils import list_catalog_segments, materialize_segment_constants
+
+DEFAULT_CHUNK_SIZE = 16 * 1024 * 1024
+UPLOAD_BATCH_SIZE = 1000
+DELETE_BATCH_SIZE = 1000  # delete_objects 요청당 최대 개수
+
+
+def default_sync_state_dir() -> Path:
+    """동기화 상태 파일 기본 경로 (sqlite 잠금을 위해 NAS가 아닌 로컬 디스크)"""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "datalake" / "sync"
+
+
+def parse_size(text: Union[str, int, None]) -> Optional[int]:
+    """'50MB', '1.5GB', '1024' 같은 크기 문자열을 바이트로 변환"""
+    if text is None or isinstance(text, int):
+        return text
+    match = re.fullmatch(r"\s*([\d.]+)\s*([KMGT]?)(I?B)?\s*", text.upper())
+    if not match:
+        raise ValueError(f"잘못된 크기 형식: {text} (예: 50MB, 1GB)")
+    number, unit = float(match.group(1)), match.group(2)
+    return int(number * 1024 ** " KMGT".index(unit or " "))
+
+
+class SyncState:
+    """원격에 반영된 객체 기록 (key → 크기, mtime, ETag)
+
+    업로드가 끝날 때마다 배치 단위로 커밋하므로 중단 후 다시 실행하면
+    이미 올라간 파일은 건너뛰고 이어서 진행한다.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(self.path))
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS objects (
+                key TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                etag TEXT,
+                synced_at REAL NOT NULL
+            )
+        """)
+        self.connection.commit()
+
+    def load(self, prefix: str) -> Dict[str, Tuple[int, int, Optional[str]]]:
+        """prefix 아래 기록 전체 조회"""
+        rows = self.connection.execute(
+            "SELECT key, size, mtime_ns, etag FROM objects WHERE substr(key, 1, ?) = ?",
+            (len(prefix), prefix),
+        )
+        return {key: (size, mtime_ns, etag) for key, size, mtime_ns, etag in rows}
+
+    def record(self, rows: List[Tuple[str, int, int, Optional[str]]]):
+        """업로드(또는 동일 확인)된 객체 기록"""
+        if not rows:
+            return
+        now = time.time()
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO objects (key, size, mtime_ns, etag, synced_at) VALUES (?, ?, ?, ?, ?)",
+            [(key, size, mtime_ns, etag, now) for key, size, mtime_ns, etag in rows],
+        )
+        self.connection.commit()
+
+    def remove(self, keys: List[str]):
+        """원격에서 삭제된 객체 기록 제거"""
+        if not keys:
+            return
+        self.connection.executemany("DELETE FROM objects WHERE key = ?", [(key,) for key in keys])
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+
+class ObjectStorageSync:
+    """catalog/assets 디렉토리를 S3 호환 버킷으로 미러링
+
+    - 하나의 TransferManager로 여러 파일을 동시에 멀티파트 업로드 (max_bandwidth는 전체 합계 기준)
+    - 크기/mtime이 기록과 같으면 건너뛰고, 원격 객체가 있으면 로컬에서 계산한 ETag로 내용이 같은지 확인
+    - 업로드 기록은 SyncState에 배치마다 커밋되어 중단 후 재실행 시 이어서 진행
+    - catalog는 manifest 기준 현재 스냅샷의 segment만 올리므로 Athena가 쓰는 중/폐기된 파일을 읽지 않음
+    - footer 메타데이터로만 저장된 상수 컬럼(lang/src 등)은 실제 컬럼으로 채운 로컬 복사본을 올림
+
+    Example:
+        >>> syncer = ObjectStorageSync("kdl-data-lake", prefix="datalake", endpoint_url="http://localhost:9000")
+        >>> syncer.sync(catalog_path="/mnt/AI_NAS/datalake/catalog", delete=True)
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "",
+        endpoint_url: Optional[str] = None,
+        max_workers: int = 8,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_bandwidth: Optional[int] = None,
+        state_path: Union[str, Path, None] = None,
+        **session_kwargs,
+    ):
+        """
+        Args:
+            bucket: 대상 버킷
+            prefix: 버킷 안의 기준 경로 (catalog/, assets/가 이 아래에 생김)
+            endpoint_url: S3 호환 서버 주소 (MinIO, 로컬 테스트 서버 등), None이면 AWS S3
+            max_workers: 동시 업로드 스레드 수
+            chunk_size: 멀티파트 기준 크기이자 파트 크기 (바이트)
+            max_bandwidth: 전체 업로드 대역폭 제한 (바이트/초), None이면 제한 없음
+            state_path: 동기화 상태 파일 (기본: ~/.cache/datalake/sync/ 아래 대상별 파일)
+            **session_kwargs: boto3.Session 파라미터 (region_name, aws_access_key_id 등)
+        """
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.endpoint_url = endpoint_url
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.logger = logging.getLogger(__name__)
+
+        session = boto3.Session(**session_kwargs)
+        self.session = session
+        self.client = session.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            config=Config(max_pool_connections=max(10, max_workers * 2)),
+        )
+        config_kwargs = dict(
+            multipart_threshold=chunk_size,
+            multipart_chunksize=chunk_size,
+            max_concurrency=max_workers,
+            max_bandwidth=max_bandwidth,
+            use_threads=True,
+        )
+        try:
+            # CRT 전송 클라이언트는 max_bandwidth를 지원하지 않으므로 기본 구현 사용
+            self.transfer_config = TransferConfig(preferred_transfer_client="classic", **config_kwargs)
+        except TypeError:
+            self.transfer_config = TransferConfig(**config_kwargs)
+
+        if state_path is None:
+            target = f"{endpoint_url or 's3'}|{bucket}|{self.prefix}"
+            state_name = hashlib.sha256(target.encode("utf-8")).hexdigest()[:16]
+            state_path = default_sync_state_dir() / f"{bucket}-{state_name}.sqlite"
+        self.state = SyncState(state_path)
+        # 상수 컬럼을 채운 segment 복사본 (대상별로 따로 두어 정리 시 다른 대상의 복사본을 지우지 않음)
+        self.materialized_dir = Path(state_path).with_suffix(".segments")
+
+    def close(self):
+        self.state.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def sync(
+        self,
+        catalog_path: Union[str, Path],
+        assets_path: Union[str, Path, None] = None,
+        delete: bool = False,
+        verify: bool = False,
+        dry_run: bool = False,
+        crawler_name: Optional[str] = None,
+    ) -> Dict:
+        """catalog(와 assets)를 버킷에 미러링
+
+        Args:
+            catalog_path: 로컬 catalog 디렉토리
+            assets_path: 로컬 assets 디렉토리 (None이면 catalog만)
+            delete: 로컬에 없는 원격 객체 삭제 (catalog는 compaction으로 사라진 segment 정리)
+            verify: 상태 기록을 믿지 않고 모든 파일을 원격 크기/ETag와 비교
+            dry_run: 업로드/삭제 없이 대상만 계산
+            crawler_name: catalog가 바뀌었으면 실행할 Glue Crawler 이름
+
+        Returns:
+            {'catalog': 통계, 'assets': 통계, 'crawler_started': bool}
+        """
+        catalog_path = Path(catalog_path)
+        segments = list_catalog_segments(catalog_path)
+        result = {
+            'catalog': self.sync_files(
+                local_root=catalog_path,
+                files=[segment['path'] for segment in segments],
+                remote_dir="catalog",
+                sources=self.materialize_constants(segments),
+                delete=delete,
+                verify=verify,
+                dry_run=dry_run,
+            ),
+            'crawler_started': False,
+        }
+        if assets_path is not None:
+            result['assets'] = self.sync_files(
+                local_root=Path(assets_path),
+                files=self.walk_files(assets_path),
+                remote_dir="assets",
+                delete=delete,
+                verify=verify,
+                dry_run=dry_run,
+            )
+
+        catalog_stats = result['catalog']
+        if crawler_name and not dry_run and (catalog_stats['uploaded'] or catalog_stats['deleted']):
+            self.session.client("glue").start_crawler(Name=crawler_name)
+            self.logger.info(f"🕷️ Crawler 실행: {crawler_name}")
+            result['crawler_started'] = True
+        return result
+
+    def sync_files(
+        self,
+        local_root: Path,
+        files: Iterable[Path],
+        remote_dir: str,
+        delete: bool = False,
+        verify: bool = False,
+        dry_run: bool = False,
+        sources: Optional[Dict[Path, Path]] = None,
+    ) -> Dict:
+        """파일 목록을 {prefix}/{remote_dir}/ 아래 같은 상대경로로 업로드
+
+        sources에 있는 파일은 대신 매핑된 파일 내용을 올린다 (원격 key는 원래 파일 기준).
+        """
+        sources = sources or {}
+        remote_prefix = self._remote_key(remote_dir) + "/"
+        known = self.state.load(remote_prefix)
+
+        # 상태 기록이 없거나(첫 실행, 다른 PC) 검증/삭제가 필요하면 원격 목록을 한 번 조회
+        remote = None
+        if verify or delete or not known:
+            remote = self._list_remote(remote_prefix)
+            self.logger.info(f"☁️ 원격 객체 {len(remote):,}개 확인: {remote_prefix}")
+
+        stats = {'files': 0, 'uploaded': 0, 'uploaded_bytes': 0, 'skipped': 0, 'deleted': 0, 'failed': []}
+        local_keys = set()
+        pending = []
+        confirmed = []
+
+        for path in files:
+            path = Path(path)
+            key = remote_prefix + path.relative_to(local_root).as_posix()
+            path = sources.get(path, path)
+            stat = path.stat()
+            local_keys.add(key)
+            stats['files'] += 1
+
+            if self._is_unchanged(path, stat, key, known.get(key), remote, verify, confirmed):
+                stats['skipped'] += 1
+                continue
+            pending.append((path, key, stat.st_size, stat.st_mtime_ns))
+
+        self.state.record(confirmed)
+        self.logger.info(
+            f"📤 {remote_dir}: 전체 {stats['files']:,}개, 업로드 대상 {len(pending):,}개, 변경 없음 {stats['skipped']:,}개"
+        )
+
+        if not dry_run:
+            self._upload(pending, stats)
+        else:
+            stats['uploaded'] = len(pending)
+            stats['uploaded_bytes'] = sum(size for _, _, size, _ in pending)
+
+        if delete and remote is not None:
+            stale = sorted(set(remote) - local_keys)
+            if stale and not dry_run:
+                self._delete(stale)
+            stats['deleted'] = len(stale)
+
+        return stats
+
+    def materialize_constants(self, segments: List[Dict]) -> Dict[Path, Path]:
+        """상수 컬럼이 있는 segment마다 컬럼을 채운 로컬 복사본을 만들고 {segment 경로: 복사본 경로} 반환
+
+        복사본 이름은 원본 경로/크기/mtime으로 정해지고 mtime도 원본과 같게 맞추므로,
+        원본이 그대로면 다시 만들지 않고 상태 기록과 비교해 업로드도 건너뛴다.
+        현재 스냅샷에 없는 이전 복사본은 삭제한다.
+        """
+        targets = {}
+        for segment in segments:
+            if not segment.get('constants'):
+                continue
+            stat = segment['path'].stat()
+            name = hashlib.sha256(
+                f"{segment['path']}|{stat.st_size}|{stat.st_mtime_ns}".encode("utf-8")
+            ).hexdigest()[:32]
+            targets[segment['path']] = (self.materialized_dir / f"{name}.parquet", segment['constants'], stat)
+
+        if targets:
+            self.materialized_dir.mkdir(parents=True, exist_ok=True)
+        missing = [(source, *target) for source, target in targets.items() if not target[0].exists()]
+        if missing:
+            self.logger.info(f"🧩 상수 컬럼을 채운 segment 복사본 생성: {len(missing):,}개")
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                list(executor.map(lambda args: self._materialize_segment(*args), missing))
+
+        current = {target[0] for target in targets.values()}
+        if self.materialized_dir.exists():
+            for path in self.materialized_dir.glob("*.parquet"):
+                if path not in current:
+                    path.unlink(missing_ok=True)
+        return {source: target[0] for source, target in targets.items()}
+
+    @staticmethod
+    def _materialize_segment(source: Path, path: Path, constants: Dict, stat: os.stat_result):
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        try:
+            materialize_segment_constants(source, tmp_path, constants)
+            os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            os.replace(tmp_path, path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    def _is_unchanged(
+        self,
+        path: Path,
+        stat: os.stat_result,
+        key: str,
+        known: Optional[Tuple[int, int, Optional[str]]],
+        remote: Optional[Dict[str, Tuple[int, str]]],
+        verify: bool,
+        confirmed: List[Tuple[str, int, int, Optional[str]]],
+    ) -> bool:
+        """원격 객체가 로컬 파일과 같은지 판단 (같다고 새로 확인되면 confirmed에 추가)"""
+        same_stat = known is not None and known[0] == stat.st_size and known[1] == stat.st_mtime_ns
+        if same_stat and not verify:
+            return True
+        if remote is None:
+            return False
+
+        remote_object = remote.get(key)
+        if remote_object is None or remote_object[0] != stat.st_size:
+            return False
+        if same_stat and known[2] is not None:
+            etag = known[2]
+        else:
+            etag = self.local_etag(path, stat.st_size)
+        if etag != remote_object[1]:
+            return False
+        if not same_stat or known[2] is None:
+            confirmed.append((key, stat.st_size, stat.st_mtime_ns, etag))
+        return True
+
+    def local_etag(self, path: Path, size: int) -> str:
+        """업로드 시 S3가 붙일 ETag를 로컬에서 계산 (멀티파트면 파트 MD5들의 MD5 + 파트 수)"""
+        if size < self.chunk_size:
+            digest = hashlib.md5()
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(block)
+            return digest.hexdigest()
+
+        part_size = ChunksizeAdjuster().adjust_chunksize(self.chunk_size, size)
+        part_digests = []
+        with open(path, "rb") as f:
+            for part in iter(lambda: f.read(part_size), b""):
+                part_digests.append(hashlib.md5(part).digest())
+        return f"{hashlib.md5(b''.join(part_digests)).hexdigest()}-{len(part_digests)}"
+
+    def _upload(self, pending: List[Tuple[Path, str, int, int]], stats: Dict):
+        """배치 단위 동시 업로드 (배치마다 상태 커밋)"""
+        if not pending:
+            return
+        started = time.time()
+        with create_transfer_manager(self.client, self.transfer_config) as manager:
+            for start in range(0, len(pending), UPLOAD_BATCH_SIZE):
+                batch = pending[start:start + UPLOAD_BATCH_SIZE]
+                futures = [
+                    (manager.upload(str(path), self.bucket, key), key, size, mtime_ns)
+                    for path, key, size, mtime_ns in batch
+                ]
+                done = []
+                for future, key, size, mtime_ns in futures:
+                    try:
+                        future.result()
+                    except Exception as e:
+                        self.logger.error(f"❌ 업로드 실패: {key} - {e}")
+                        stats['failed'].append(key)
+                        continue
+                    done.append((key, size, mtime_ns, None))
+                    stats['uploaded'] += 1
+                    stats['uploaded_bytes'] += size
+                self.state.record(done)
+
+                elapsed = max(time.time() - started, 1e-6)
+                self.logger.info(
+                    f"📤 {min(start + UPLOAD_BATCH_SIZE, len(pending)):,}/{len(pending):,} "
+                    f"({stats['uploaded_bytes'] / 1024 / 1024 / elapsed:.1f}MB/s)"
+                )
+
+    def _delete(self, keys: List[str]):
+        """원격 객체 삭제"""
+        for start in range(0, len(keys), DELETE_BATCH_SIZE):
+            batch = keys[start:start + DELETE_BATCH_SIZE]
+            self.client.delete_objects(
+                Bucket=self.bucket,
+                Delete={'Objects': [{'Key': key} for key in batch], 'Quiet': True},
+            )
+            self.state.remove(batch)
+        self.logger.info(f"🗑️ 원격 객체 {len(keys):,}개 삭제")
+
+    def _list_remote(self, prefix: str) -> Dict[str, Tuple[int, str]]:
+        """prefix 아래 원격 객체 {key: (크기, ETag)}"""
+        objects = {}
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+            for obj in page.get("Contents", []):
+                objects[obj["Key"]] = (obj["Size"], obj["ETag"].strip('"'))
+        return objects
+
+    def _remote_key(self, relative: str) -> str:
+        return f"{self.prefix}/{relative}" if self.prefix else relative
+
+    @staticmethod
+    def walk_files(root: Union[str, Path]) -> Iterator[Path]:
+        """디렉토리 아래 일반 파일 (숨김/임시 파일 제외)"""
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+            for filename in sorted(filenames):
+                if filename.startswith(".") or filename.endswith(".tmp"):
+                    continue
+                yield Path(dirpath) / filename
@@ -0,0 +1,244 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import requests
+
+DEFAULT_PART_SIZE = 16 * 1024 * 1024
+PART_QUERY_BATCH_SIZE = 10_000  # 누락 파트 조회 요청당 hash 수
+
+
+def default_upload_cache_dir() -> Path:
+    """HTTP 업로드 모드에서 서버 설정(schema.yaml 등)을 받아 두는 로컬 경로"""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "datalake" / "upload"
+
+
+class HttpStagingTransport:
+    """base_path(NAS)를 마운트하지 않은 클라이언트용 staging 업로드
+
+    로컬에서 만든 staging 디렉토리를 파일별 고정 크기 파트로 나눠 SHA256으로 주소를 매기고,
+    서버에 없는 파트만 병렬로 올린 뒤 commit 요청으로 staging/pending 아래에 같은 구조를 조립한다.
+    파트는 내용 hash로 저장되므로 중단 후 다시 올리면 이미 받은 파트는 건너뛴다.
+
+    Example:
+        >>> transport = HttpStagingTransport("http://192.168.20.62:8091", max_workers=8)
+        >>> transport.upload_dir("/tmp/datalake_upload_x/coco_raw_image_...", "coco_raw_image_...")
+    """
+
+    def __init__(
+        self,
+        server_url: str,
+        part_size: int = DEFAULT_PART_SIZE,
+        max_workers: int = 8,
+        timeout: int = 300,
+        commit_timeout: int = 3600,
+        max_retries: int = 3,
+    ):
+        """
+        Args:
+            server_url: 처리 서버 주소
+            part_size: 파트 크기 (바이트, 동시 전송 메모리는 max_workers * part_size)
+            max_workers: 동시 파트 업로드/해시 스레드 수
+            timeout: 파트 요청 타임아웃 (초)
+            commit_timeout: 서버 조립(commit) 요청 타임아웃 (초)
+            max_retries: 파트별 재시도 횟수 (연결 오류, 5xx)
+        """
+        self.server_url = server_url.rstrip('/')
+        self.part_size = part_size
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.commit_timeout = commit_timeout
+        self.max_retries = max(1, max_retries)
+        self.logger = logging.getLogger(__name__)
+        self._local = threading.local()
+
+    def __getstate__(self):
+        # datasets.map()이 client를 pickle할 때 스레드별 세션은 제외
+        state = self.__dict__.copy()
+        state.pop('_local', None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    def _session(self) -> requests.Session:
+        """스레드별 HTTP 세션 (연결 재사용)"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def upload_dir(self, local_dir: Union[str, Path], name: str) -> Dict:
+        """로컬 staging 디렉토리를 서버 staging/pending/{name}으로 업로드
+
+        심볼릭 링크는 원본 파일 내용으로 올라간다.
+
+        Returns:
+            {'path': 서버 staging 경로, 'files': 파일 수, 'bytes': 전체 크기, 'uploaded_bytes': 실제 전송량}
+        """
+        local_dir = Path(local_dir)
+        start_time = time.time()
+
+        files, part_sources = self._build_manifest(local_dir)
+        total_bytes = sum(file_info['size'] for file_info in files)
+        missing = self._missing_parts(list(part_sources))
+        self.logger.info(
+            f"📤 HTTP 업로드: 파일 {len(files):,}개, {total_bytes / 1024 ** 2:,.1f}MB, "
+            f"전송할 파트 {len(missing):,}/{len(part_sources):,}개"
+        )
+
+        uploaded_bytes = self._upload_parts(missing, part_sources)
+        result = self._commit(name, files)
+        if result.get('status') == 'missing_parts':
+            # 같은 파트를 쓰는 다른 업로드가 먼저 commit하며 정리한 경우 한 번 더 전송
+            self.logger.info(f"🔁 서버에 없는 파트 재전송: {len(result['missing']):,}개")
+            uploaded_bytes += self._upload_parts(result['missing'], part_sources)
+            result = self._commit(name, files)
+        if result.get('status') != 'committed':
+            raise RuntimeError(f"❌ 업로드 commit 실패: {result}")
+
+        elapsed = time.time() - start_time
+        self.logger.info(
+            f"✅ HTTP 업로드 완료: {result['path']} "
+            f"(전송 {uploaded_bytes / 1024 ** 2:,.1f}MB, {elapsed:.1f}초)"
+        )
+        return {
+            'path': result['path'],
+            'files': len(files),
+            'bytes': total_bytes,
+            'uploaded_bytes': uploaded_bytes,
+        }
+
+    def pending_uploads(
+        self,
+        provider: str,
+        dataset: str,
+        task: str,
+        variant: Optional[str] = None,
+        is_raw: bool = True,
+        delete: bool = False,
+    ) -> List[str]:
+        """서버 staging/pending에서 같은 provider/dataset/task(/variant) 업로드 조회 (delete=True면 삭제)"""
+        response = self._session().post(
+            f"{self.server_url}/uploads/pending",
+            json={
+                "provider": provider,
+                "dataset": dataset,
+                "task": task,
+                "variant": variant,
+                "is_raw": is_raw,
+                "delete": delete,
+            },
+            timeout=self.timeout,
+        )
+        if response.status_code != 200:
+            raise RuntimeError(f"❌ pending 조회 실패: {response.status_code} {response.text}")
+        return response.json().get('pending', [])
+
+    def fetch_schema(self, target_path: Union[str, Path]) -> Path:
+        """서버 schema.yaml을 로컬에 저장"""
+        response = self._session().get(f"{self.server_url}/schema", timeout=self.timeout)
+        if response.status_code != 200:
+            raise RuntimeError(f"❌ 스키마 조회 실패: {response.status_code} {response.text}")
+        target_path = Path(target_path)
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+        target_path.write_text(response.json()['content'], encoding='utf-8')
+        return target_path
+
+    def _build_manifest(self, local_dir: Path) -> Tuple[List[Dict], Dict[str, Tuple[str, int, int]]]:
+        """파일별 파트 hash 목록과 hash → (파일, offset, 길이) 매핑"""
+        file_paths = []
+        for root, _, names in os.walk(local_dir, followlinks=True):
+            file_paths.extend(os.path.join(root, name) for name in names)
+        file_paths.sort()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            hashed = list(executor.map(self._hash_parts, file_paths))
+
+        files = []
+        part_sources = {}
+        for file_path, (size, part_hashes) in zip(file_paths, hashed):
+            files.append({
+                'path': Path(file_path).relative_to(local_dir).as_posix(),
+                'size': size,
+                'parts': part_hashes,
+            })
+            for index, part_hash in enumerate(part_hashes):
+                offset = index * self.part_size
+                part_sources.setdefault(part_hash, (file_path, offset, min(self.part_size, size - offset)))
+        return files, part_sources
+
+    def _hash_parts(self, file_path: str) -> Tuple[int, List[str]]:
+        """파일을 part_size 단위로 읽어 파트별 SHA256 계산"""
+        part_hashes = []
+        size = 0
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(self.part_size), b""):
+                part_hashes.append(hashlib.sha256(chunk).hexdigest())
+                size += len(chunk)
+        return size, part_hashes
+
+    def _missing_parts(self, part_hashes: List[str]) -> List[str]:
+        """서버에 아직 없는 파트 hash"""
+        missing = []
+        for start in range(0, len(part_hashes), PART_QUERY_BATCH_SIZE):
+            response = self._session().post(
+                f"{self.server_url}/uploads/parts/missing",
+                json={"hashes": part_hashes[start:start + PART_QUERY_BATCH_SIZE]},
+                timeout=self.timeout,
+            )
+            if response.status_code != 200:
+                raise RuntimeError(f"❌ 파트 조회 실패: {response.status_code} {response.text}")
+            missing.extend(response.json().get('missing', []))
+        return missing
+
+    def _upload_parts(self, part_hashes: List[str], part_sources: Dict[str, Tuple[str, int, int]]) -> int:
+        """파트 병렬 업로드 (스레드마다 한 파트씩만 메모리에 읽음)"""
+        if not part_hashes:
+            return 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            sizes = executor.map(lambda part_hash: self._put_part(part_hash, part_sources[part_hash]), part_hashes)
+            return sum(sizes)
+
+    def _put_part(self, part_hash: str, source: Tuple[str, int, int]) -> int:
+        file_path, offset, length = source
+        with open(file_path, "rb") as f:
+            f.seek(offset)
+            data = f.read(length)
+
+        error = None
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                response = self._session().put(
+                    f"{self.server_url}/uploads/parts/{part_hash}",
+                    data=data,
+                    headers={'Content-Type': 'application/octet-stream'},
+                    timeout=self.timeout,
+                )
+                if response.status_code == 200:
+                    return length
+                error = f"{response.status_code} {response.text}"
+                if response.status_code < 500:
+                    break
+            except requests.exceptions.RequestException as e:
+                error = str(e)
+            if attempt < self.max_retries:
+                time.sleep(min(2 ** attempt, 30))
+        raise RuntimeError(f"❌ 파트 업로드 실패 ({part_hash[:12]}, {file_path}): {error}")
+
+    def _commit(self, name: str, files: List[Dict]) -> Dict:
+        response = self._session().post(
+            f"{self.server_url}/uploads/commit",
+            json={"name": name, "files": files},
+            timeout=self.commit_timeout,
+        )
+        if response.status_code != 200:
+            raise RuntimeError(f"❌ 업로드 commit 실패: {response.status_code} {response.text}")
+        return response.json()
@@ -22,13 +22,15 @@ class DataManagerCLI:
         server_url: str = "http://192.168.20.62:8091",
         log_level: str = "INFO",
         num_proc: int = 8,
+        query_cache: bool = False,
     ):
         self.data_manager = DatalakeClient(
             user_id=user_id,
             base_path=base_path,
             server_url=server_url,
             log_level=log_level,
-            num_proc=num_proc
+            num_proc=num_proc,
+            query_cache=query_cache,
         )
         self.schema_manager = self.data_manager.schema_manager
     
@@ -49,6 +51,17 @@ class DataManagerCLI:
             print(f"📁 DB 파일: {db_info['path']}")
             print(f"💾 파일 크기: {db_info['size_mb']}MB")
             print(f"🕒 수정 시간: {db_info['modified_time']}")
+            print(f"🧩 DB 모드: {db_info.get('mode', 'table')}")
+            print(f"🔢 Catalog 세대: DB={db_info.get('db_generation', '-')}, 최신={db_info.get('catalog_generation', '-')}")
+            if db_info.get('hot_columns'):
+                print(f"🔥 보조 테이블 컬럼: {', '.join(db_info['hot_columns'])}")
+            if db_info.get('text_index_columns'):
+                print(f"🔤 텍스트 색인 컬럼: {', '.join(db_info['text_index_columns'])}")
+            for column, paths in db_info.get('label_text_paths', {}).items():
+                print(f"🏷️ 라벨 텍스트 경로 ({column}): {', '.join(paths)}")
+            query_cache = self.data_manager.query_cache
+            if query_cache is not None:
+                print(f"⚡ 쿼리 캐시: {query_cache.cache_dir} ({query_cache.size_bytes() / 1024 / 1024:.1f}MB)")
             
             # 업데이트 상태 확인 및 제안
             if db_info.get('is_outdated'):
@@ -81,7 +94,11 @@ class DataManagerCLI:
                 print(f"\n📊 데이터 통계:")
                 print(f"  📈 총 행 수: {db_info['total_rows']:,}개")
                 print(f"  🏷️ 파티션: {db_info.get('partitions', 0)}개")
-                
+                if db_info.get('parquet_bytes') is not None:
+                    print(f"  🗂️ Catalog 크기: {db_info['parquet_bytes'] / 1024 / 1024:.1f}MB")
+                if db_info.get('asset_bytes') is not None:
+                    print(f"  🖼️ Asset 크기: {db_info['asset_bytes'] / 1024 / 1024 / 1024:.2f}GB")
+
                 # Provider별 통계 (상위 5개)
                 if 'provider_stats' in db_info and db_info['provider_stats']:
                     print(f"\n🏢 Provider별 파티션:")
@@ -104,7 +121,7 @@ class DataManagerCLI:
             print(f"❌ DB 정보 조회 실패: {e}")
             return False
         
-    def build_db_interactive(self):
+    def build_db_interactive(self, mode=None, hot_columns=None, text_index_columns=None, label_paths=None, incremental=False):
         """대화형 DB 구축"""
         print("\n" + "="*50)
         print("🔨 DB 구축")
@@ -115,7 +132,9 @@ class DataManagerCLI:
             db_info = self.data_manager.get_db_info()
             force_rebuild = False
             
-            if db_info['exists']:
+            if db_info['exists'] and incremental:
+                print("🔄 새로 추가된 segment만 반영합니다.")
+            elif db_info['exists']:
                 print("⚠️ 기존 DB가 있습니다.")
                 print(f"  📁 파일: {db_info['path']}")
                 print(f"  💾 크기: {db_info['size_mb']}MB")
@@ -133,7 +152,14 @@ class DataManagerCLI:
             
             # DB 구축 실행
             print("\n🔄 DB 구축 중...")
-            success = self.data_manager.build_db(force_rebuild=force_rebuild)
+            success = self.data_manager.build_db(
+                force_rebuild=force_rebuild,
+                mode=mode,
+                hot_columns=hot_columns,
+                text_index_columns=text_index_columns,
+                label_text_paths=self._parse_label_paths(label_paths) if label_paths is not None else None,
+                incremental=incremental,
+            )
             
             if success:
                 print("✅ DB 구축 완료!")
@@ -495,6 +521,127 @@ class DataManagerCLI:
             print(f"❌ 처리 중 오류: {e}")
             return False
 
+    def compact_catalog(
+        self,
+        providers=None,
+        datasets=None,
+        tasks=None,
+        variants=None,
+        row_group_size=100_000,
+        compression="zstd",
+        compression_level=None,
+        wait=True,
+    ):
+        """Catalog compaction 요청 및 대기"""
+        print("\n🗜️ Catalog compaction")
+        print("="*50)
+        try:
+            job_id = self.data_manager.trigger_compaction(
+                providers=providers,
+                datasets=datasets,
+                tasks=tasks,
+                variants=variants,
+                row_group_size=row_group_size,
+                compression=compression,
+                compression_level=compression_level,
+            )
+            if not job_id:
+                print("❌ compaction 시작에 실패했습니다. (실행 중인 작업이 있는지 확인하세요)")
+                return False
+            print(f"✅ compaction 시작됨: {job_id}")
+
+            if not wait:
+                print(f"💡 'python main.py process status {job_id}' 명령으로 상태를 확인할 수 있습니다.")
+                return True
+
+            print("⏳ compaction 완료 대기 중... (Ctrl+C로 중단)")
+            result = self.data_manager.wait_for_job_completion(job_id, polling_interval=10, timeout=3600)
+            summary = result.get('result') or {}
+            for detail in summary.get('success_details', []):
+                print(
+                    f"  🗜️ {detail['partition']}: {detail['size_before'] / 1024 / 1024:.1f}MB → "
+                    f"{detail['size_after'] / 1024 / 1024:.1f}MB ({detail['rows']:,}행)"
+                )
+            for detail in summary.get('failed_details', []):
+                print(f"  ❌ {detail['partition']}: {detail['error']}")
+            print(f"📊 성공 {summary.get('success', 0)}개, 실패 {summary.get('failed', 0)}개")
+            print("💡 'python main.py db update' 명령으로 DB를 갱신하세요.")
+            return True
+
+        except KeyboardInterrupt:
+            print("\n⏸️ 대기 중단됨. 백그라운드에서 compaction은 계속됩니다.")
+            return True
+        except Exception as e:
+            print(f"❌ compaction 중 오류: {e}")
+            return False
+
+    def sync_to_object_storage(
+        self,
+        bucket,
+        prefix="",
+        include_assets=False,
+        endpoint_url=None,
+        delete=False,
+        verify=False,
+        dry_run=False,
+        max_workers=8,
+        max_bandwidth=None,
+        crawler_name=None,
+    ):
+        """catalog/assets를 S3 호환 버킷에 동기화"""
+        print("\n☁️ Object storage 동기화")
+        print("="*50)
+        try:
+            from datalake.core.sync import parse_size
+        except ImportError:
+            print("❌ boto3가 설치되어 있지 않습니다. 'pip install datalake[aws]'로 설치하세요.")
+            return False
+
+        try:
+            target = f"s3://{bucket}/{prefix}".rstrip("/")
+            print(f"📦 대상: {target}" + (f" ({endpoint_url})" if endpoint_url else ""))
+            if dry_run:
+                print("🔍 dry-run: 업로드/삭제 없이 대상만 계산합니다.")
+
+            result = self.data_manager.sync_to_object_storage(
+                bucket=bucket,
+                prefix=prefix,
+                include_assets=include_assets,
+                endpoint_url=endpoint_url,
+                delete=delete,
+                verify=verify,
+                dry_run=dry_run,
+                max_workers=max_workers,
+                max_bandwidth=parse_size(max_bandwidth),
+                crawler_name=crawler_name,
+            )
+            for name in ['catalog', 'assets']:
+                stats = result.get(name)
+                if not stats:
+                    continue
+                print(
+                    f"  📁 {name}: 전체 {stats['files']:,}개, 업로드 {stats['uploaded']:,}개 "
+                    f"({stats['uploaded_bytes'] / 1024 / 1024:.1f}MB), 변경 없음 {stats['skipped']:,}개, "
+                    f"삭제 {stats['deleted']:,}개"
+                )
+                for key in stats['failed'][:10]:
+                    print(f"    ❌ {key}")
+                if len(stats['failed']) > 10:
+                    print(f"    ... 외 {len(stats['failed']) - 10}개 실패")
+            if result.get('crawler_started'):
+                print(f"🕷️ Crawler 실행됨: {crawler_name}")
+            failed = sum(len(result[name]['failed']) for name in ['catalog', 'assets'] if name in result)
+            if failed:
+                print("💡 같은 명령을 다시 실행하면 실패한 파일만 이어서 업로드합니다.")
+            return failed == 0
+
+        except KeyboardInterrupt:
+            print("\n⏸️ 동기화 중단됨. 다시 실행하면 이어서 진행합니다.")
+            return False
+        except Exception as e:
+            print(f"❌ 동기화 중 오류: {e}")
+            return False
+
     def check_job_status(self, job_id: str):
         """특정 작업 상태 확인"""
         print(f"\n🔍 작업 상태 확인: {job_id}")
@@ -707,7 +854,9 @@ class DataManagerCLI:
                             print("❌ 비율은 0과 1 사이의 값이어야 합니다. 다시 입력해주세요.")
                     except ValueError:
                         print("❌ 숫자를 입력해주세요. (예: 0.1, 0.05)")
-                                    
+
+            # 샘플링은 DB에서 수행 (샘플 행만 가져옴)
+            sample = {'fraction': sample_percent, 'seed': 42} if sample_percent else None
             search_results = None
 
             if scope_choice == "1":
@@ -715,34 +864,29 @@ class DataManagerCLI:
                 partitions_df = self.data_manager.get_partitions()                        
                 print(f"📊 {len(partitions_df)}개 파티션 사용 가능")
                 
-                search_results = self._partition_search_interactive(partitions_df)
+                search_results = self._partition_search_interactive(partitions_df, sample=sample)
                 
                 if search_results is None or search_results.empty:
                     raise ValueError("검색 결과가 없습니다. 조건을 다시 확인해주세요.")
                 
             elif scope_choice == "2":
                 print("\n🔄 전체 데이터 조회 중...")
-                search_results = self.data_manager.search() 
+                search_results = self.data_manager.search(sample=sample)
+                if sample and search_results is not None and search_results.empty:
+                    print("❗ 샘플 크기가 너무 작습니다. 전체 데이터로 검사합니다.")
+                    search_results = self.data_manager.search()
                 
                 if search_results is None or search_results.empty:
                     raise ValueError("전체 데이터가 비어있습니다. DB를 먼저 구축해주세요.")
             
-            print(f"\n📊 검사 대상: {len(search_results):,}개 항목")    
-        
             if sample_percent:
                 print(f"🔍 샘플 검사 비율: {sample_percent * 100:.1f}%")
-                sample_size = int(len(search_results) * sample_percent)
-                if sample_size < 1:
-                    print("❗ 샘플 크기가 너무 작습니다. 전체 데이터로 검사합니다.")
-                    sample_size = len(search_results)
-                search_results = search_results.sample(n=sample_size, random_state=42)
-
-            print(f"📊 샘플 검사 대상: {len(search_results):,}개 항목")
+            print(f"\n📊 검사 대상: {len(search_results):,}개 항목")
             
             print("\n🔄 서버에 검사 요청 중...")
+            # 이미 샘플링된 결과이므로 서버에서 다시 샘플링하지 않음
             job_id = self.data_manager.request_asset_validation(
                 search_results=search_results,
-                sample_percent=sample_percent
             )
             
             if not job_id:
@@ -1206,6 +1350,16 @@ class DataManagerCLI:
         
         print("\n" + "="*50)
         
+    def _parse_label_paths(self, label_paths):
+        """'컬럼:JSON경로' 목록을 {컬럼: [JSON경로]}로 변환"""
+        parsed = {}
+        for item in label_paths or []:
+            column, sep, json_path = item.partition(':')
+            if not sep or not column or not json_path:
+                raise ValueError(f"라벨 경로 형식이 올바르지 않습니다 (COLUMN:JSON_PATH): {item}")
+            parsed.setdefault(column, []).append(json_path)
+        return parsed
+
     def _ask_yes_no(self, question, default=False):
         """y/N 질문 함수"""
         full_question = f"{question} (y/N): " if not default else f"{question} (Y/n): "
@@ -1239,8 +1393,8 @@ class DataManagerCLI:
             else:
                 print("❌ 잘못된 선택입니다. 1 또는 2를 입력해주세요.")
     
-    def _partition_search_interactive(self, partitions_df):
-        """파티션 기반 대화형 검색"""
+    def _partition_search_interactive(self, partitions_df, sample=None):
+        """파티션 기반 대화형 검색 (sample: search()의 샘플링 설정)"""
         # Provider 선택
         providers = self._select_items_interactive(
             df=partitions_df,
@@ -1282,12 +1436,17 @@ class DataManagerCLI:
         
         # 검색 실행
         print(f"\n🔍 검색 실행 중...")
-        return self.data_manager.search(
-            providers=providers,
-            datasets=datasets,
-            tasks=tasks,
-            variants=variants
-        )
+        search_kwargs = {
+            'providers': providers,
+            'datasets': datasets,
+            'tasks': tasks,
+            'variants': variants,
+        }
+        search_results = self.data_manager.search(**search_kwargs, sample=sample)
+        if sample and search_results.empty:
+            print("❗ 샘플 크기가 너무 작습니다. 전체 데이터로 검사합니다.")
+            search_results = self.data_manager.search(**search_kwargs)
+        return search_results
 
     def _select_items_interactive(self, df=None, column=None, level=None):
         """아이템 대화형 선택"""
@@ -1774,6 +1933,8 @@ For more help on subcommands:
                        help="로깅 레벨 (default: %(default)s)")
     parser.add_argument("--num-proc", type=int, default= 8,
                        help="병렬 처리 프로세스 수 (default: %(default)s)")
+    parser.add_argument("--query-cache", action="store_true",
+                       help="검색/파티션 조회 결과를 로컬 디스크에 캐시 (반복 조회 시 재사용)")
     
     subparsers = parser.add_subparsers(dest='command', title='commands', description='사용 가능한 명령어', help='명령어 설명', metavar='<command>')
         
@@ -1816,6 +1977,19 @@ For more help on subcommands:
     collections_subparsers.add_parser('export', help='컬렉션 내보내기')
     collections_subparsers.add_parser('delete', help='컬렉션 삭제')
     
+    # Object storage 동기화
+    sync_parser = subparsers.add_parser('sync', help='S3 호환 버킷으로 동기화', description='catalog(와 assets)를 S3 호환 버킷에 미러링합니다 (변경된 파일만 업로드).')
+    sync_parser.add_argument('--bucket', required=True, help='대상 버킷')
+    sync_parser.add_argument('--prefix', default='', help='버킷 안의 기준 경로')
+    sync_parser.add_argument('--endpoint-url', default=None, help='S3 호환 서버 주소 (예: http://localhost:9000)')
+    sync_parser.add_argument('--include-assets', action='store_true', help='assets/도 동기화')
+    sync_parser.add_argument('--delete', action='store_true', help='로컬에 없는 원격 객체 삭제')
+    sync_parser.add_argument('--verify', action='store_true', help='모든 파일을 원격 크기/ETag와 비교')
+    sync_parser.add_argument('--dry-run', action='store_true', help='업로드/삭제 없이 대상만 표시')
+    sync_parser.add_argument('--workers', type=int, default=8, help='동시 업로드 수 (기본: 8)')
+    sync_parser.add_argument('--max-bandwidth', default=None, help='전체 업로드 대역폭 제한 (예: 50MB)')
+    sync_parser.add_argument('--crawler', default=None, help='catalog가 바뀌면 실행할 Glue Crawler 이름')
+
     # 처리 관리
     process_parser = subparsers.add_parser('process', help='Staging 데이터 처리 관리', description='Staging 데이터 처리 작업을 관리합니다.')
     process_subparsers = process_parser.add_subparsers(dest='process_action', title='Process Actions', metavar='<action>')
@@ -1827,8 +2001,28 @@ For more help on subcommands:
     db_parser = subparsers.add_parser('db', help='DB 관리', description='DB 상태를 관리합니다.')
     db_subparsers = db_parser.add_subparsers(dest='db_action', title='DB Actions', metavar='<action>')
     db_subparsers.add_parser('info', help='DB 정보 확인')
-    db_subparsers.add_parser('update', help='DB 업데이트')
+    db_update_parser = db_subparsers.add_parser('update', help='DB 업데이트')
+    db_update_parser.add_argument('--mode', choices=['table', 'view'], default=None,
+                                  help='table: catalog 복사, view: Parquet 직접 조회 (기본: table)')
+    db_update_parser.add_argument('--hot-columns', nargs='+', default=None,
+                                  help='view 모드에서 보조 테이블로 저장할 컬럼 (예: labels)')
+    db_update_parser.add_argument('--text-index-columns', nargs='+', default=None,
+                                  help='텍스트 검색용 n-gram 색인을 만들 컬럼 (예: labels)')
+    db_update_parser.add_argument('--label-paths', nargs='+', default=None, metavar='COLUMN:JSON_PATH',
+                                  help="라벨 텍스트를 펼쳐 저장할 경로 (예: 'labels:$.{variant}.text.content')")
+    db_update_parser.add_argument('--incremental', action='store_true',
+                                  help='table 모드 DB에 새 catalog segment만 반영 (불가능하면 전체 재구축)')
     db_subparsers.add_parser('processes', help='DB 사용 프로세스 확인')
+    db_subparsers.add_parser('clear-cache', help='로컬 쿼리 결과 캐시와 검색 결과 Arrow 파일 삭제')
+    compact_parser = db_subparsers.add_parser('compact', help='Catalog 파티션 재작성 (hash 정렬, zstd, Bloom filter)')
+    compact_parser.add_argument('--providers', nargs='+', default=None, help='대상 Provider (기본: 전체)')
+    compact_parser.add_argument('--datasets', nargs='+', default=None, help='대상 Dataset (기본: 전체)')
+    compact_parser.add_argument('--tasks', nargs='+', default=None, help='대상 Task (기본: 전체)')
+    compact_parser.add_argument('--variants', nargs='+', default=None, help='대상 Variant (기본: 전체)')
+    compact_parser.add_argument('--row-group-size', type=int, default=100_000, help='row group당 행 수 (기본: 100000)')
+    compact_parser.add_argument('--compression', default='zstd', help='압축 코덱 (기본: zstd)')
+    compact_parser.add_argument('--compression-level', type=int, default=None, help='압축 레벨')
+    compact_parser.add_argument('--no-wait', action='store_true', help='완료를 기다리지 않음')
     validate_parser = db_subparsers.add_parser('validate', help='DB 상태 검사 (--report: 상세 보고서)')
     validate_parser.add_argument('--report', action='store_true', help='검사 보고서 생성')
     
@@ -1843,7 +2037,8 @@ For more help on subcommands:
             base_path=args.base_path,
             server_url=args.server_url,
             log_level=args.log_level,
-            num_proc=args.num_proc
+            num_proc=args.num_proc,
+            query_cache=args.query_cache,
         )
     except Exception as e:
         print(f"❌ CLI 초기화 실패: {e}")
@@ -1912,13 +2107,48 @@ For more help on subcommands:
             elif args.db_action == 'info':
                 cli.show_db_info()
             elif args.db_action == 'update':  # 새로 추가
-                cli.build_db_interactive()
+                cli.build_db_interactive(
+                    mode=args.mode,
+                    hot_columns=args.hot_columns,
+                    text_index_columns=args.text_index_columns,
+                    label_paths=args.label_paths,
+                    incremental=args.incremental,
+                )
             elif args.db_action == 'processes':  # 새로 추가
                 cli.check_db_processes() 
+            elif args.db_action == 'compact':
+                cli.compact_catalog(
+                    providers=args.providers,
+                    datasets=args.datasets,
+                    tasks=args.tasks,
+                    variants=args.variants,
+                    row_group_size=args.row_group_size,
+                    compression=args.compression,
+                    compression_level=args.compression_level,
+                    wait=not args.no_wait,
+                )
+            elif args.db_action == 'clear-cache':
+                removed = cli.data_manager.clear_query_cache()
+                print(f"✅ 쿼리 캐시 삭제 완료: {removed}개")
+                removed = cli.data_manager.clear_search_files()
+                print(f"✅ 검색 결과 파일 삭제 완료: {removed}개")
             elif args.db_action == 'validate':
                 cli.validate_db_integrity_interactive(
                     report=args.report
                 )
+        elif args.command == 'sync':
+            cli.sync_to_object_storage(
+                bucket=args.bucket,
+                prefix=args.prefix,
+                include_assets=args.include_assets,
+                endpoint_url=args.endpoint_url,
+                delete=args.delete,
+                verify=args.verify,
+                dry_run=args.dry_run,
+                max_workers=args.workers,
+                max_bandwidth=args.max_bandwidth,
+                crawler_name=args.crawler,
+            )
         elif args.command == 'download':
             cli.download_interactive(as_collection=args.as_collection)
         elif args.command == 'collections':
@@ -8,7 +8,8 @@ from pathlib import Path
 from typing import Dict, List, Optional
 from datetime import datetime
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from functools import partial
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Request
 from pydantic import BaseModel
 
 from datalake.server.processor import DatalakeProcessor
@@ -22,6 +23,55 @@ class ValidateAssetsRequest(BaseModel):
     sample_percent: Optional[float] = None
 
 
+class CompactCatalogRequest(BaseModel):
+    """Catalog compaction 요청 (파티션 필터가 비어 있으면 전체)"""
+    providers: Optional[List[str]] = None
+    datasets: Optional[List[str]] = None
+    tasks: Optional[List[str]] = None
+    variants: Optional[List[str]] = None
+    row_group_size: int = 100_000
+    compression: str = "zstd"
+    compression_level: Optional[int] = None
+    dictionary_max_ratio: float = 0.1
+    sort_by: Optional[str] = "hash"
+    bloom_filter_columns: List[str] = ["hash", "path"]
+
+
+class AssetLookupRequest(BaseModel):
+    """업로드 전 asset 존재 여부 조회 요청 (SHA256 hash 목록)"""
+    provider: str
+    dataset: str
+    hashes: List[str]
+
+
+class UploadPartsRequest(BaseModel):
+    """서버에 없는 업로드 파트 조회 요청"""
+    hashes: List[str]
+
+
+class UploadFile(BaseModel):
+    """업로드 파일 (staging 디렉토리 기준 상대경로와 파트 hash 목록)"""
+    path: str
+    size: int
+    parts: List[str]
+
+
+class UploadCommitRequest(BaseModel):
+    """받은 파트로 staging/pending/{name} 조립 요청"""
+    name: str
+    files: List[UploadFile]
+
+
+class PendingUploadsRequest(BaseModel):
+    """pending 업로드 조회/삭제 요청"""
+    provider: str
+    dataset: str
+    task: str
+    variant: Optional[str] = None
+    is_raw: bool = True
+    delete: bool = False
+
+
 class StatusResponse(BaseModel):
     """상태 응답 모델"""
     pending: int
@@ -233,6 +283,160 @@ async def validate_assets(request: ValidateAssetsRequest, background_tasks: Back
         raise HTTPException(status_code=500, detail=str(e))
     
     
+@app.post("/assets/lookup")
+async def lookup_assets(request: AssetLookupRequest):
+    """이미 저장된 asset 조회 (hash → assets 기준 상대경로)"""
+    try:
+        if not processor:
+            raise HTTPException(status_code=503, detail="Processor not initialized")
+
+        loop = asyncio.get_event_loop()
+        existing = await loop.run_in_executor(
+            None,
+            partial(processor.lookup_assets, request.provider, request.dataset, request.hashes),
+        )
+        return {"existing": existing}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"asset 조회 실패: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/schema")
+async def get_schema():
+    """schema.yaml 내용 (NAS를 마운트하지 않은 클라이언트의 provider/task 검증용)"""
+    if not processor:
+        raise HTTPException(status_code=503, detail="Processor not initialized")
+
+    schema_path = processor.base_path / "config" / "schema.yaml"
+    if not schema_path.exists():
+        raise HTTPException(status_code=404, detail=f"스키마 파일이 없습니다: {schema_path}")
+    return {"content": schema_path.read_text(encoding='utf-8')}
+
+
+@app.post("/uploads/parts/missing")
+async def missing_upload_parts(request: UploadPartsRequest):
+    """아직 받지 않은 업로드 파트 조회"""
+    try:
+        if not processor:
+            raise HTTPException(status_code=503, detail="Processor not initialized")
+
+        loop = asyncio.get_event_loop()
+        missing = await loop.run_in_executor(None, processor.missing_upload_parts, request.hashes)
+        return {"missing": missing}
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"업로드 파트 조회 실패: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.put("/uploads/parts/{part_hash}")
+async def upload_part(part_hash: str, request: Request):
+    """업로드 파트 저장 (본문 SHA256 = part_hash)"""
+    try:
+        if not processor:
+            raise HTTPException(status_code=503, detail="Processor not initialized")
+
+        data = await request.body()
+        loop = asyncio.get_event_loop()
+        size = await loop.run_in_executor(None, processor.store_upload_part, part_hash, data)
+        return {"hash": part_hash, "size": size}
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"업로드 파트 저장 실패: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/uploads/commit")
+async def commit_upload(request: UploadCommitRequest):
+    """받은 파트로 staging/pending 디렉토리 조립"""
+    try:
+        if not processor:
+            raise HTTPException(status_code=503, detail="Processor not initialized")
+
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            None,
+            processor.commit_upload,
+            request.name,
+            [file.model_dump() for file in request.files],
+        )
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"업로드 commit 실패: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/uploads/pending")
+async def pending_uploads(request: PendingUploadsRequest):
+    """같은 provider/dataset/task(/variant)의 pending 업로드 조회 (delete=True면 삭제)"""
+    try:
+        if not processor:
+            raise HTTPException(status_code=503, detail="Processor not initialized")
+
+        loop = asyncio.get_event_loop()
+        pending = await loop.run_in_executor(
+            None, partial(processor.find_pending_uploads, **request.model_dump())
+        )
+        return {"pending": pending}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"pending 조회 실패: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/compact")
+async def compact_catalog(request: CompactCatalogRequest):
+    """Catalog 파티션 재작성 (비동기, 다른 작업과 동시에 실행하지 않음)"""
+    try:
+        job_id = f"compact_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')[:19]}"
+
+        async with job_lock:
+            # 처리 작업과 같은 파티션을 동시에 쓰지 않도록 실행 중인 작업이 있으면 거절
+            running_jobs = [job for job in current_jobs.values() if job.status == "running"]
+            if running_jobs:
+                return {
+                    "job_id": running_jobs[0].job_id,
+                    "status": "already_running",
+                    "message": "이미 실행 중인 작업이 있습니다"
+                }
+
+            job = ProcessingJob(
+                job_id=job_id,
+                status="running",
+                started_at=datetime.now().isoformat()
+            )
+            current_jobs[job_id] = job
+
+        asyncio.create_task(run_compaction_job(job_id, request))
+
+        return {
+            "job_id": job_id,
+            "status": "started",
+            "message": "Catalog compaction이 시작되었습니다"
+        }
+
+    except Exception as e:
+        logger.error(f"Compaction 요청 실패: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.get("/jobs/{job_id}")
 async def get_job_status(job_id: str):
     async with job_lock:
@@ -304,6 +508,15 @@ async def run_validation_job(job_id: str, request: ValidateAssetsRequest):
     )
 
 
+async def run_compaction_job(job_id: str, request: CompactCatalogRequest):
+    """백그라운드에서 실행할 catalog compaction 작업"""
+    await _run_background_job(
+        job_id=job_id,
+        job_name="Catalog compaction",
+        job_func=partial(processor.compact_catalog, **request.model_dump()),
+    )
+
+
 async def _run_background_job(
     job_id: str, 
     job_name: str, 
@@ -1,4 +1,5 @@
 import logging
+import os
 import json
 import shutil
 import hashlib
@@ -7,18 +8,36 @@ import threading
 import time
 import gc
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import random
+import re
+import uuid
 
 from collections import Counter
 from datetime import datetime
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 from typing import Dict, List, Optional
 from PIL import Image
 from datasets import Dataset, load_from_disk
 from datasets.features import Image as ImageFeature
 from functools import partial
 
-from datalake.utils import setup_logging
+from datalake.utils import (
+    setup_logging,
+    bump_catalog_generation,
+    is_nested_type,
+    unify_nested_columns,
+    write_catalog_parquet,
+    write_segment_parquet,
+    atomic_write_json,
+    new_segment_name,
+    read_partition_manifest,
+    partition_segments,
+    commit_partition_snapshot,
+    asset_bytes,
+    file_sha256,
+)
 
 
 class DatalakeProcessor:
@@ -36,6 +55,7 @@ class DatalakeProcessor:
         self.staging_pending_path = self.staging_path / "pending"
         self.staging_processing_path = self.staging_path / "processing"
         self.staging_failed_path = self.staging_path / "failed"
+        self.staging_uploads_path = self.staging_path / "uploads"  # HTTP 업로드 파트/조립 영역
         
         self.catalog_path = self.base_path / "catalog"
         self.assets_path = self.base_path / "assets"
@@ -47,12 +67,14 @@ class DatalakeProcessor:
         # LocalDataManager와 동일
         self.image_data_key = 'image'  # 기본 이미지 컬럼 키
         self.file_path_key = 'file_path'  # 기본 파일 경로 컬럼 키
+        self.asset_ref_key = '_asset_ref'  # client가 staging 복사를 생략한 행의 기존 asset 경로
         
         self._initialize(log_level, create_dirs=create_dirs)
         
         self.existing_hashes = set()
         self.cache_built = False
         self.cache_lock = threading.Lock()
+        self.catalog_lock = threading.Lock()
         
         # 처리 실패 추적용
         self.processing_failed = False
@@ -145,6 +167,7 @@ class DatalakeProcessor:
                 self._move_to_failed(processing_dir, dir_name, error_info)
                 
         self._cleanup_processing_dirs()
+        self._cleanup_upload_parts()
         
         return self._create_processing_result(
             success_count=success_count,
@@ -256,6 +279,337 @@ class DatalakeProcessor:
                 error=str(e)
             ) 
     
+    def compact_catalog(
+        self,
+        providers: Optional[List[str]] = None,
+        datasets: Optional[List[str]] = None,
+        tasks: Optional[List[str]] = None,
+        variants: Optional[List[str]] = None,
+        row_group_size: int = 100_000,
+        compression: str = "zstd",
+        compression_level: Optional[int] = None,
+        dictionary_max_ratio: float = 0.1,
+        sort_by: Optional[str] = "hash",
+        bloom_filter_columns: Optional[List[str]] = None,
+    ) -> Dict:
+        """catalog 파티션을 조회용 레이아웃으로 재작성 (hash 정렬, zstd, 사전 인코딩, Bloom filter)
+
+        파티션별로 임시 파일에 쓴 뒤 rename으로 교체하고, 하나라도 바뀌면 catalog 세대를 올린다.
+        """
+        filters = {
+            'provider': providers,
+            'dataset': datasets,
+            'task': tasks,
+            'variant': variants,
+        }
+        layout_options = dict(
+            row_group_size=row_group_size,
+            compression=compression,
+            compression_level=compression_level,
+            dictionary_max_ratio=dictionary_max_ratio,
+            sort_by=sort_by,
+            bloom_filter_columns=bloom_filter_columns if bloom_filter_columns is not None else ['hash', 'path'],
+        )
+
+        partition_dirs = []
+        for partition_dir in sorted(self.catalog_path.glob("provider=*/dataset=*/task=*/variant=*")):
+            if not partition_dir.is_dir():
+                continue
+            values = dict(part.split("=", 1) for part in partition_dir.relative_to(self.catalog_path).parts)
+            if all(not allowed or values[key] in allowed for key, allowed in filters.items()):
+                partition_dirs.append(partition_dir)
+
+        self.logger.info(f"🗜️ Catalog compaction 시작: {len(partition_dirs)}개 파티션")
+        success_details = []
+        failed_details = []
+        for partition_dir in partition_dirs:
+            partition_name = partition_dir.relative_to(self.catalog_path).as_posix()
+            try:
+                detail = self._compact_partition(partition_dir, layout_options)
+                if detail:
+                    success_details.append({'partition': partition_name, **detail})
+            except Exception as e:
+                self.logger.error(f"❌ compaction 실패: {partition_name} - {e}")
+                failed_details.append({
+                    'partition': partition_name,
+                    'error': str(e),
+                    'error_type': type(e).__name__,
+                })
+
+        if success_details:
+            with self.catalog_lock:
+                generation = bump_catalog_generation(self.catalog_path)
+            self.logger.info(f"✅ Catalog compaction 완료: {len(success_details)}개 (generation={generation})")
+
+        return self._create_processing_result(
+            success_count=len(success_details),
+            failed_count=len(failed_details),
+            success_details=success_details,
+            failed_details=failed_details,
+            error_summary=[detail['error'] for detail in failed_details],
+            message="Catalog compaction 완료",
+        )
+
+    def _compact_partition(self, partition_dir: Path, layout_options: Dict) -> Optional[Dict]:
+        """파티션의 현재 segment들을 하나로 합쳐 재작성한 뒤 새 스냅샷으로 교체
+
+        상수 컬럼(constants) 값이 다른 segment끼리는 합치지 않고 값별로 한 파일씩 만든다.
+        compaction 중에 추가된 segment는 그대로 남는다 (읽은 segment만 스냅샷에서 뺌).
+        """
+        segments = partition_segments(partition_dir)
+        if not segments:
+            return None
+        parquet_files = [segment['path'] for segment in segments]
+        size_before = sum(f.stat().st_size for f in parquet_files)
+
+        groups = {}
+        for segment in segments:
+            constants = segment.get('constants') or {}
+            groups.setdefault(json.dumps(constants, sort_keys=True), (constants, []))[1].append(segment)
+
+        manifest = read_partition_manifest(partition_dir) or {}
+        snapshot_id = manifest.get('snapshot_id', 0) + 1
+        added = []
+        tmp_files = []
+        total_rows = 0
+        try:
+            for constants, group_segments in groups.values():
+                table = pa.concat_tables(
+                    [pq.read_table(segment['path']) for segment in group_segments],
+                    promote_options="permissive",
+                )
+                target_file = partition_dir / new_segment_name(snapshot_id)
+                tmp_file = partition_dir / f".{target_file.name}.tmp"
+                tmp_files.append(tmp_file)
+                layout = write_catalog_parquet(table, tmp_file, constants=constants, **layout_options)
+                written_rows = pq.read_metadata(tmp_file).num_rows
+                if written_rows != table.num_rows:
+                    raise RuntimeError(f"행 수 불일치: {table.num_rows} → {written_rows}")
+                os.chmod(tmp_file, 0o664)
+                os.replace(tmp_file, target_file)
+
+                # 기존 segment의 asset 크기를 모두 알면 합산, 아니면 path 컬럼으로 다시 계산
+                segment_asset_bytes = [segment.get('asset_bytes') for segment in group_segments]
+                if None not in segment_asset_bytes:
+                    compacted_asset_bytes = sum(segment_asset_bytes)
+                elif 'path' in table.column_names:
+                    compacted_asset_bytes = asset_bytes(table.column('path').to_pylist(), self.assets_path)
+                else:
+                    compacted_asset_bytes = 0
+
+                entry = {
+                    'name': target_file.name,
+                    'rows': written_rows,
+                    'size': target_file.stat().st_size,
+                    'asset_bytes': compacted_asset_bytes,
+                    'compacted': True,
+                }
+                if constants:
+                    entry['constants'] = constants
+                added.append(entry)
+                total_rows += table.num_rows
+                del table
+
+            with self.catalog_lock:
+                commit_partition_snapshot(
+                    partition_dir,
+                    added=added,
+                    removed=[f.name for f in parquet_files],
+                )
+        finally:
+            for tmp_file in tmp_files:
+                if tmp_file.exists():
+                    tmp_file.unlink()
+
+        metadata_file = partition_dir / "_metadata.json"
+        if metadata_file.exists():
+            with open(metadata_file, encoding='utf-8') as f:
+                metadata = json.load(f)
+            metadata['parquet_layout'] = {**layout, 'compacted_at': datetime.now().isoformat()}
+            atomic_write_json(metadata_file, metadata)
+
+        size_after = sum(entry['size'] for entry in added)
+        self.logger.info(
+            f"🗜️ {partition_dir.relative_to(self.catalog_path).as_posix()}: "
+            f"{len(parquet_files)}개 파일 {size_before / 1024 / 1024:.1f}MB → "
+            f"{len(added)}개 파일 {size_after / 1024 / 1024:.1f}MB ({total_rows:,}행)"
+        )
+        return {
+            'rows': total_rows,
+            'files_before': len(parquet_files),
+            'files_after': len(added),
+            'size_before': size_before,
+            'size_after': size_after,
+        }
+
+    def lookup_assets(self, provider: str, dataset: str, hashes: List[str]) -> Dict[str, str]:
+        """이미 저장된 asset 조회 (client 업로드 전 사전 중복 제거용)
+
+        처리 시 중복 판정과 같은 범위(provider/dataset)에서 샤딩 단계별 후보 경로만 확인한다.
+
+        Returns:
+            {hash: assets 기준 상대경로} (존재하는 hash만)
+        """
+        assets_base = self.assets_path / f"provider={provider}" / f"dataset={dataset}"
+        if not assets_base.exists():
+            return {}
+
+        shard_configs = [{"levels": levels} for levels in (0, 1, 2)]
+        existing = {}
+        for file_hash in dict.fromkeys(hashes):
+            if not isinstance(file_hash, str) or len(file_hash) != 64:
+                continue
+            for shard_config in shard_configs:
+                candidate = self._get_level_path(assets_base, shard_config, file_hash)
+                if candidate.exists():
+                    existing[file_hash] = str(candidate.relative_to(self.assets_path))
+                    break
+
+        self.logger.info(f"🔍 asset 조회: {len(existing)}/{len(hashes)}개 존재 ({provider}/{dataset})")
+        return existing
+
+    def missing_upload_parts(self, part_hashes: List[str]) -> List[str]:
+        """아직 받지 않은 HTTP 업로드 파트 hash 목록"""
+        return [
+            part_hash for part_hash in dict.fromkeys(part_hashes)
+            if not self._upload_part_path(part_hash).exists()
+        ]
+
+    def store_upload_part(self, part_hash: str, data: bytes) -> int:
+        """HTTP 업로드 파트 저장 (내용 SHA256이 hash와 같아야 함)"""
+        part_path = self._upload_part_path(part_hash)
+        if hashlib.sha256(data).hexdigest() != part_hash:
+            raise ValueError(f"파트 hash 불일치: {part_hash}")
+        if part_path.exists():
+            return len(data)
+
+        part_path.parent.mkdir(mode=0o775, parents=True, exist_ok=True)
+        tmp_path = part_path.with_name(f"{part_hash}.{uuid.uuid4().hex[:8]}.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, part_path)
+        return len(data)
+
+    def commit_upload(self, name: str, files: List[Dict]) -> Dict:
+        """받은 파트로 staging/pending/{name}을 조립
+
+        조립은 staging/uploads/assembling에서 한 뒤 디렉토리 이름 변경으로 pending에 올리므로
+        process_all_pending()은 완성된 업로드만 본다. 조립에 쓴 파트는 삭제하며,
+        조립 중 같은 파트를 쓰는 다른 commit이 파트를 먼저 지웠으면 missing_parts를 돌려준다.
+
+        Args:
+            name: staging 디렉토리 이름
+            files: [{'path': 상대경로, 'size': 바이트, 'parts': [파트 hash, ...]}, ...]
+
+        Returns:
+            {'status': 'committed', 'path': ...} 또는 {'status': 'missing_parts', 'missing': [...]}
+        """
+        if not name or name in (".", "..") or "/" in name or "\\" in name:
+            raise ValueError(f"잘못된 업로드 이름: {name}")
+        target_dir = self.staging_pending_path / name
+        if target_dir.exists():
+            # 응답을 받지 못한 클라이언트의 재시도
+            return {"status": "committed", "path": str(target_dir), "files": len(files)}
+
+        relative_paths = []
+        for file_info in files:
+            relative_path = PurePosixPath(file_info['path'])
+            if relative_path.is_absolute() or any(part in ("", ".", "..") for part in relative_path.parts):
+                raise ValueError(f"잘못된 업로드 경로: {file_info['path']}")
+            relative_paths.append(relative_path)
+        if PurePosixPath("upload_metadata.json") not in relative_paths:
+            raise ValueError("upload_metadata.json이 없는 업로드입니다")
+
+        missing = self.missing_upload_parts([part_hash for file_info in files for part_hash in file_info['parts']])
+        if missing:
+            return {"status": "missing_parts", "missing": missing}
+
+        part_hashes = list(dict.fromkeys(part_hash for file_info in files for part_hash in file_info['parts']))
+        assembling_dir = self.staging_uploads_path / "assembling" / name
+        if assembling_dir.exists():
+            shutil.rmtree(assembling_dir)
+        try:
+            for file_info, relative_path in zip(files, relative_paths):
+                target_path = assembling_dir / relative_path
+                target_path.parent.mkdir(mode=0o775, parents=True, exist_ok=True)
+                parts = file_info['parts']
+                if len(parts) == 1:
+                    # 단일 파트 파일은 복사 없이 하드 링크 (같은 파트를 다른 commit이 읽는 중일 수 있어 이동하지 않음)
+                    part_path = self._upload_part_path(parts[0])
+                    try:
+                        os.link(part_path, target_path)
+                    except OSError:
+                        # 하드 링크를 지원하지 않는 파일시스템 (파트가 없으면 여기서도 FileNotFoundError)
+                        shutil.copyfile(part_path, target_path)
+                else:
+                    with open(target_path, 'wb') as out:
+                        for part_hash in parts:
+                            with open(self._upload_part_path(part_hash), 'rb') as part_file:
+                                shutil.copyfileobj(part_file, out, 8 * 1024 * 1024)
+                if target_path.stat().st_size != file_info['size']:
+                    raise ValueError(f"파일 크기 불일치: {relative_path}")
+            os.replace(assembling_dir, target_dir)
+        except FileNotFoundError:
+            shutil.rmtree(assembling_dir, ignore_errors=True)
+            # 같은 파트를 쓰는 다른 업로드가 먼저 commit하며 파트를 정리한 경우 → client가 재전송
+            missing = self.missing_upload_parts(part_hashes)
+            if missing:
+                return {"status": "missing_parts", "missing": missing}
+            raise
+        except Exception:
+            shutil.rmtree(assembling_dir, ignore_errors=True)
+            raise
+
+        for part_hash in part_hashes:
+            self._upload_part_path(part_hash).unlink(missing_ok=True)
+
+        self.logger.info(f"📥 HTTP 업로드 조립 완료: {name} ({len(files)}개 파일)")
+        return {"status": "committed", "path": str(target_dir), "files": len(files)}
+
+    def find_pending_uploads(
+        self,
+        provider: str,
+        dataset: str,
+        task: str,
+        variant: Optional[str] = None,
+        is_raw: bool = True,
+        delete: bool = False,
+    ) -> List[str]:
+        """같은 provider/dataset/task(/variant)의 pending 업로드 조회 (client._cleanup_existing_pending과 동일 기준)"""
+        if not self.staging_pending_path.exists():
+            return []
+
+        matched = []
+        for pending_dir in self.staging_pending_path.iterdir():
+            metadata_file = pending_dir / "upload_metadata.json"
+            if not (pending_dir.is_dir() and metadata_file.exists()):
+                continue
+            try:
+                with open(metadata_file, encoding='utf-8') as f:
+                    metadata = json.load(f)
+            except Exception as e:
+                self.logger.warning(f"⚠️ 메타데이터 읽기 실패: {pending_dir} - {e}")
+                continue
+
+            basic_match = (
+                metadata.get('provider') == provider and
+                metadata.get('dataset') == dataset and
+                metadata.get('task') == task
+            )
+            if basic_match and (is_raw or metadata.get('variant') == variant):
+                matched.append(pending_dir)
+
+        if delete:
+            for pending_dir in matched:
+                shutil.rmtree(pending_dir)
+                self.logger.info(f"🗑️ pending 삭제: {pending_dir.name}")
+        return [pending_dir.name for pending_dir in matched]
+
+    def _upload_part_path(self, part_hash: str) -> Path:
+        if not re.fullmatch(r"[0-9a-f]{64}", part_hash or ""):
+            raise ValueError(f"잘못된 파트 hash: {part_hash}")
+        return self.staging_uploads_path / "parts" / part_hash[:2] / part_hash
+
     def _check_file_exists(self, example):
         """파일 존재 여부 확인"""
         path_val = example.get('path')
@@ -370,6 +724,24 @@ class DatalakeProcessor:
             except Exception as e:
                 self.logger.error(f"❌ 처리 중 디렉토리 정리 실패: {remain_dir.name} - {str(e)}")
                 
+    def _cleanup_upload_parts(self, older_than_seconds: int = 7 * 24 * 3600):
+        """commit되지 않고 남은 HTTP 업로드 파트 정리 (중단 후 재개할 시간은 남겨 둠)"""
+        parts_path = self.staging_uploads_path / "parts"
+        if not parts_path.exists():
+            return
+
+        cutoff = time.time() - older_than_seconds
+        removed = 0
+        for part_path in parts_path.glob("*/*"):
+            try:
+                if part_path.stat().st_mtime < cutoff:
+                    part_path.unlink()
+                    removed += 1
+            except OSError:
+                continue
+        if removed:
+            self.logger.info(f"🧹 오래된 업로드 파트 정리: {removed}개")
+
     def _initialize(self, log_level: str = "INFO", create_dirs: bool = True):
         
         required_paths = {
@@ -493,6 +865,9 @@ class DatalakeProcessor:
             assets_base=assets_base,
             shard_config=shard_config,
         )
+        remove_columns = [self.file_path_key]
+        if self.asset_ref_key in dataset_obj.column_names:
+            remove_columns.append(self.asset_ref_key)
         
         try:
             processed_dataset = dataset_obj.map(
@@ -500,7 +875,7 @@ class DatalakeProcessor:
                 batched=True,
                 batch_size=self.batch_size,
                 num_proc=min(self.num_proc, total_files // self.batch_size + 1),  # 최소 1개 프로세스
-                remove_columns=[self.file_path_key],  # 원본 파일 경로 컬럼 제거
+                remove_columns=remove_columns,  # 원본 파일 경로 컬럼 제거
                 desc="📄 파일 이동",
                 load_from_cache_file=False,
             )
@@ -584,6 +959,7 @@ class DatalakeProcessor:
         """배치 단위 파일 처리 (staging/assets → final/assets + hash)"""
         
         input_file_paths = batch[self.file_path_key]
+        asset_refs = batch.get(self.asset_ref_key) or [None] * len(input_file_paths)
         self.logger.debug(f"배치 파일 처리: {len(input_file_paths)}개")
         
         output_hashes = []
@@ -591,11 +967,19 @@ class DatalakeProcessor:
         saved_count = 0
         duplicate_count = 0
         
-        for idx, relative_path in enumerate(input_file_paths):
+        for idx, (relative_path, asset_ref) in enumerate(zip(input_file_paths, asset_refs)):
             try:
                 if self.processing_failed:
                     break
                 
+                # client가 이미 저장된 asset으로 확인해 복사하지 않은 파일
+                if asset_ref is not None:
+                    asset_hash = self._resolve_asset_ref(asset_ref, assets_base)
+                    duplicate_count += 1
+                    output_hashes.append(asset_hash)
+                    output_paths.append(asset_ref)
+                    continue
+                
                 if relative_path is None:
                     output_hashes.append(None)
                     output_paths.append(None)
@@ -643,6 +1027,25 @@ class DatalakeProcessor:
             "hash": output_hashes
         }
         
+    def _resolve_asset_ref(self, asset_ref: str, assets_base: Path) -> str:
+        """client가 보낸 _asset_ref 검증 후 hash 반환
+
+        lookup_assets()가 돌려주는 형태(같은 provider/dataset의 샤딩 경로, `{sha256}.jpg`)만 허용한다.
+        """
+        match = re.fullmatch(r"([0-9a-f]{64})\.jpg", PurePosixPath(str(asset_ref)).name)
+        if not match:
+            raise ValueError(f"잘못된 asset 참조: {asset_ref}")
+        asset_hash = match.group(1)
+        candidates = {
+            self._get_level_path(assets_base, {"levels": levels}, asset_hash) for levels in (0, 1, 2)
+        }
+        asset_path = self.assets_path / asset_ref
+        if asset_path not in candidates:
+            raise ValueError(f"업로드 대상 provider/dataset의 asset이 아닙니다: {asset_ref}")
+        if not asset_path.is_file():
+            raise FileNotFoundError(f"참조한 asset이 존재하지 않습니다: {asset_ref}")
+        return asset_hash
+
     def _build_hash_cache(self, assets_base: Path):
         """기존 이미지 해시 캐시 구축"""
         if self.cache_built:
@@ -675,12 +1078,8 @@ class DatalakeProcessor:
         return hashlib.sha256(jpeg_bytes).hexdigest()
     @staticmethod
     def _get_file_hash(file_path: Path) -> str:
-        """파일 해시 계산 (SHA256)"""
-        hash_sha256 = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_sha256.update(chunk)
-        return hash_sha256.hexdigest()
+        """파일 해시 계산 (SHA256, client 사전 중복 제거와 같은 함수)"""
+        return file_sha256(file_path)
     @staticmethod
     def _get_shard_config(total_images: int) -> Dict:
         
@@ -720,19 +1119,79 @@ class DatalakeProcessor:
         )
         output_dir.mkdir(mode=0o775, parents=True, exist_ok=True)
         
-        # Parquet 저장 (datasets 내장 최적화)
-        parquet_file = output_dir / "data.parquet"
-        dataset_obj.to_parquet(str(parquet_file))
+        # 업로드 단위 상수(lang/src 등)는 행마다 저장하지 않고 segment 메타데이터로만 기록
+        constants = metadata.get('constant_columns') or {}
+        materialized = [col for col in constants if col in dataset_obj.column_names]
+        if materialized:
+            dataset_obj = dataset_obj.remove_columns(materialized)
         
-        # 메타데이터 저장
-        metadata_file = output_dir / "_metadata.json"
-        with open(metadata_file, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, ensure_ascii=False, indent=2)
+        # 컬럼 타입을 catalog에 저장된 타입으로 통일 (중첩/문자열이 섞이면 조회가 깨짐)
+        dataset_obj, metadata = self._unify_nested_columns(dataset_obj, metadata)
+        
+        # 새 segment로 저장 (기존 파일은 건드리지 않음, 다 쓴 뒤 이름 변경)
+        manifest = read_partition_manifest(output_dir) or {}
+        parquet_file = output_dir / new_segment_name(manifest.get('snapshot_id', 0) + 1)
+        tmp_file = output_dir / f".{parquet_file.name}.tmp"
+        try:
+            write_segment_parquet(dataset_obj, tmp_file, constants=constants)
+            os.replace(tmp_file, parquet_file)
+        finally:
+            if tmp_file.exists():
+                tmp_file.unlink()
+        
+        # 파티션 통계용 asset 크기 (이번 segment가 참조하는 파일)
+        segment_asset_bytes = (
+            asset_bytes(dataset_obj['path'], self.assets_path)
+            if 'path' in dataset_obj.column_names else 0
+        )
+        
+        # 메타데이터 저장 (마지막 업로드 기준)
+        atomic_write_json(output_dir / "_metadata.json", metadata)
+        
+        # manifest 커밋 후 catalog 세대 번호 갱신 (클라이언트 DB 최신 여부 판단용)
+        replace = metadata.get('write_mode') == 'replace'
+        segment_entry = {
+            'name': parquet_file.name,
+            'rows': len(dataset_obj),
+            'size': parquet_file.stat().st_size,
+            'asset_bytes': segment_asset_bytes,
+            'file_id': metadata.get('file_id'),
+            'uploaded_by': metadata.get('uploaded_by'),
+            'uploaded_at': metadata.get('uploaded_at'),
+        }
+        if constants:
+            segment_entry['constants'] = constants
+        with self.catalog_lock:
+            snapshot = commit_partition_snapshot(output_dir, added=[segment_entry], replace=replace)
+            generation = bump_catalog_generation(self.catalog_path)
         
         # 파일 크기 로그
         file_size_mb = parquet_file.stat().st_size / (1024 * 1024)
-        self.logger.info(f"💾 저장 완료: {parquet_file.name} ({file_size_mb:.1f}MB, {len(dataset_obj)}행)")
+        self.logger.info(
+            f"💾 저장 완료: {parquet_file.name} ({file_size_mb:.1f}MB, {len(dataset_obj)}행, "
+            f"{'교체' if replace else '추가'}, snapshot={snapshot['snapshot_id']}, "
+            f"파티션 {snapshot['total_rows']:,}행, generation={generation})"
+        )
         
+    def _unify_nested_columns(self, dataset_obj: Dataset, metadata: Dict):
+        """컬럼 타입을 catalog 저장 타입으로 통일 (맞출 수 없으면 ValueError로 업로드 실패 처리)"""
+        table = dataset_obj.with_format("arrow")[:]
+        with self.catalog_lock:
+            unified, dumped_columns, parsed_columns = unify_nested_columns(table, self.catalog_path)
+        if dumped_columns:
+            self.logger.warning(
+                f"⚠️ catalog에 문자열로 저장된 컬럼이라 JSON 문자열로 저장: {dumped_columns}"
+            )
+        if parsed_columns:
+            self.logger.info(f"🔄 catalog에 중첩 타입으로 저장된 컬럼이라 JSON 문자열을 파싱해 저장: {parsed_columns}")
+        metadata = {
+            **metadata,
+            'nested_columns': [field.name for field in unified.schema if is_nested_type(field.type)],
+        }
+        if unified is table:
+            return dataset_obj, metadata
+        return Dataset(unified), metadata
+
 if __name__ == "__main__":
     # datasets.map() 활용 버전
     processor = DatalakeProcessor(
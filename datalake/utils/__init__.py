@@ -1 +1,26 @@
-from .logging import setup_logging
\ No newline at end of file
+from .logging import setup_logging
+from .catalog import (
+    atomic_write_json,
+    read_catalog_generation,
+    bump_catalog_generation,
+    new_segment_name,
+    read_partition_manifest,
+    partition_segments,
+    partition_segment_files,
+    list_catalog_segments,
+    list_catalog_files,
+    asset_bytes,
+    file_sha256,
+    commit_partition_snapshot,
+    is_nested_type,
+    read_catalog_column_types,
+    unify_nested_columns,
+    read_file_schemas,
+    json_fallback_columns,
+    dictionary_columns,
+    with_segment_constants,
+    write_segment_parquet,
+    materialize_segment_constants,
+    write_catalog_parquet,
+)
+from .labels import parse_label, dump_label
@@ -0,0 +1,521 @@
+import base64
+import hashlib
+import json
+import os
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+GENERATION_FILE = "_generation.json"
+MANIFEST_FILE = "_manifest.json"
+# catalog 전체의 컬럼별 저장 타입 (중첩 컬럼 타입 통합 시 segment footer를 매번 읽지 않도록)
+COLUMN_TYPES_FILE = "_column_types.json"
+PARTITION_GLOB = "provider=*/dataset=*/task=*/variant=*"
+# segment Parquet footer에 업로드 단위 상수 컬럼 값을 기록하는 key-value 메타데이터 키
+SEGMENT_CONSTANTS_KEY = b"datalake.constants"
+# 스냅샷에서 빠진 segment를 실제로 지우기까지의 유예 시간 (이전 스냅샷을 읽는 중인 reader 보호)
+SEGMENT_RETENTION_SECONDS = 3600
+
+
+def atomic_write_json(path: Union[str, Path], data: Dict) -> None:
+    """같은 디렉토리의 임시 파일에 쓴 뒤 rename으로 교체 (읽는 쪽은 항상 완전한 파일만 봄)"""
+    path = Path(path)
+    path.parent.mkdir(mode=0o775, parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o664)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def read_catalog_generation(catalog_path: Union[str, Path]) -> int:
+    """catalog 세대 번호 조회 (manifest가 없으면 0)"""
+    generation_file = Path(catalog_path) / GENERATION_FILE
+    try:
+        with open(generation_file, encoding='utf-8') as f:
+            return int(json.load(f).get('generation', 0))
+    except FileNotFoundError:
+        return 0
+
+
+def bump_catalog_generation(catalog_path: Union[str, Path]) -> int:
+    """catalog 세대 번호 증가 (catalog 내용이 바뀔 때마다 호출)"""
+    generation = read_catalog_generation(catalog_path) + 1
+    atomic_write_json(
+        Path(catalog_path) / GENERATION_FILE,
+        {
+            'generation': generation,
+            'updated_at': datetime.now().isoformat(),
+        }
+    )
+    return generation
+
+
+def new_segment_name(snapshot_id: int) -> str:
+    """새 segment 파일 이름 (한 번 쓴 segment는 수정하지 않음)"""
+    return f"part-{snapshot_id:06d}-{uuid.uuid4().hex[:8]}.parquet"
+
+
+def read_partition_manifest(partition_dir: Union[str, Path]) -> Optional[Dict]:
+    """파티션 manifest 조회 (없으면 None - manifest 도입 전 파티션)"""
+    try:
+        with open(Path(partition_dir) / MANIFEST_FILE, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def partition_segments(partition_dir: Union[str, Path]) -> List[Dict]:
+    """파티션의 현재 스냅샷에 속한 segment 정보 목록 ({'path', 'name', 'rows', 'asset_bytes', 'constants', ...})
+
+    manifest가 있으면 manifest에 기록된 파일만, 없으면 디렉토리의 *.parquet 전체(이전 방식, 파일 경로만)를 반환한다.
+    """
+    partition_dir = Path(partition_dir)
+    manifest = read_partition_manifest(partition_dir)
+    if manifest is None:
+        return [{'path': f, 'name': f.name} for f in sorted(partition_dir.glob("*.parquet"))]
+    return [{**entry, 'path': partition_dir / entry['name']} for entry in manifest.get('files', [])]
+
+
+def partition_segment_files(partition_dir: Union[str, Path]) -> List[Path]:
+    """파티션의 현재 스냅샷에 속한 Parquet 파일 목록"""
+    return [segment['path'] for segment in partition_segments(partition_dir)]
+
+
+def list_catalog_segments(catalog_path: Union[str, Path]) -> List[Dict]:
+    """catalog 전체에서 현재 스냅샷에 속한 segment 정보 목록"""
+    segments = []
+    for partition_dir in sorted(Path(catalog_path).glob(PARTITION_GLOB)):
+        if partition_dir.is_dir():
+            segments.extend(partition_segments(partition_dir))
+    return segments
+
+
+def list_catalog_files(catalog_path: Union[str, Path]) -> List[Path]:
+    """catalog 전체에서 현재 스냅샷에 속한 Parquet 파일 목록"""
+    return [segment['path'] for segment in list_catalog_segments(catalog_path)]
+
+
+def asset_bytes(paths: Iterable[Optional[str]], assets_path: Union[str, Path]) -> int:
+    """assets 기준 상대경로 목록이 가리키는 파일 크기 합 (중복 경로는 한 번만, 없는 파일은 0)"""
+    assets_path = Path(assets_path)
+    total = 0
+    for path in set(paths):
+        if not path:
+            continue
+        try:
+            total += (assets_path / path).stat().st_size
+        except OSError:
+            continue
+    return total
+
+
+def file_sha256(path: Union[str, Path], chunk_size: int = 1024 * 1024) -> str:
+    """파일 내용의 SHA256 (asset 파일명/중복 판정에 쓰는 hash)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def commit_partition_snapshot(
+    partition_dir: Union[str, Path],
+    added: Optional[List[Dict]] = None,
+    removed: Optional[List[str]] = None,
+    replace: bool = False,
+) -> Dict:
+    """파티션 manifest에 새 스냅샷 기록 (호출자가 파티션 쓰기를 직렬화해야 함)
+
+    added의 파일은 이미 디렉토리에 다 써진 상태여야 하며, manifest 교체(rename)가
+    곧 커밋이므로 reader는 항상 완전한 스냅샷만 본다.
+    빠진 파일은 바로 지우지 않고 SEGMENT_RETENTION_SECONDS 이후의 커밋에서 삭제한다.
+
+    Args:
+        added: 추가할 segment 정보 목록 ({'name', 'rows', ...})
+        removed: 스냅샷에서 뺄 파일 이름 목록
+        replace: True면 기존 파일을 모두 빼고 added만 남김
+
+    Returns:
+        새 manifest
+    """
+    partition_dir = Path(partition_dir)
+    added = added or []
+    manifest = read_partition_manifest(partition_dir)
+    if manifest is None:
+        # 이전 방식(data.parquet) 파티션은 기존 파일로 첫 스냅샷을 구성 (이번에 추가하는 파일 제외)
+        added_names = {entry['name'] for entry in added}
+        manifest = {
+            'snapshot_id': 0,
+            'files': [
+                {
+                    'name': f.name,
+                    'rows': pq.read_metadata(f).num_rows,
+                    'size': f.stat().st_size,
+                    'snapshot_id': 0,
+                }
+                for f in sorted(partition_dir.glob("*.parquet"))
+                if f.name not in added_names
+            ],
+            'obsolete': [],
+        }
+
+    snapshot_id = manifest.get('snapshot_id', 0) + 1
+    now = time.time()
+    removed_names = {entry['name'] for entry in manifest['files']} if replace else set(removed or [])
+
+    files = [entry for entry in manifest['files'] if entry['name'] not in removed_names]
+    for entry in added:
+        files.append({**entry, 'snapshot_id': snapshot_id})
+
+    obsolete = manifest.get('obsolete', []) + [
+        {'name': name, 'removed_at': now} for name in sorted(removed_names)
+    ]
+    live_names = {entry['name'] for entry in files}
+    retained = []
+    for entry in obsolete:
+        if entry['name'] in live_names:
+            continue
+        if now - entry['removed_at'] >= SEGMENT_RETENTION_SECONDS:
+            (partition_dir / entry['name']).unlink(missing_ok=True)
+        else:
+            retained.append(entry)
+
+    asset_sizes = [entry.get('asset_bytes') for entry in files]
+    new_manifest = {
+        'snapshot_id': snapshot_id,
+        'parent_snapshot_id': manifest.get('snapshot_id', 0),
+        'committed_at': datetime.now().isoformat(),
+        'total_rows': sum(entry.get('rows', 0) for entry in files),
+        'parquet_bytes': sum(entry.get('size', 0) for entry in files),
+        # 크기를 모르는 segment(이전 방식 파일)가 있으면 None
+        'asset_bytes': None if None in asset_sizes else sum(asset_sizes),
+        'files': files,
+        'obsolete': retained,
+    }
+    atomic_write_json(partition_dir / MANIFEST_FILE, new_manifest)
+    return new_manifest
+
+
+def is_nested_type(data_type: pa.DataType) -> bool:
+    """struct/list/map 같은 중첩 Arrow 타입 여부"""
+    return pa.types.is_nested(data_type)
+
+
+def _merge_column_type(
+    column: str,
+    stored_type: Optional[pa.DataType],
+    new_type: pa.DataType,
+) -> pa.DataType:
+    """같은 컬럼의 두 타입을 합침 (중첩 타입끼리는 합집합, 중첩/비중첩 충돌은 ValueError)"""
+    if stored_type is None or pa.types.is_null(stored_type):
+        return new_type
+    if pa.types.is_null(new_type):
+        return stored_type
+    if is_nested_type(stored_type) != is_nested_type(new_type):
+        raise ValueError(f"'{column}' 컬럼 타입 충돌: {stored_type} / {new_type}")
+    if not is_nested_type(stored_type):
+        # 스칼라 타입 차이(int32/int64 등)는 조회 시 union_by_name이 맞춘다
+        return stored_type
+    try:
+        return pa.unify_schemas(
+            [pa.schema([pa.field(column, stored_type)]), pa.schema([pa.field(column, new_type)])]
+        ).field(column).type
+    except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+        raise ValueError(f"'{column}' 컬럼 타입 충돌: {stored_type} / {new_type} ({e})")
+
+
+def _read_file_schema(parquet_file: Union[str, Path]) -> Optional[pa.Schema]:
+    try:
+        return pq.read_schema(parquet_file)
+    except Exception:
+        return None
+
+
+def read_file_schemas(parquet_files: Sequence[Union[str, Path]], max_workers: int = 16) -> List[Optional[pa.Schema]]:
+    """Parquet footer의 스키마 목록 (읽지 못한 파일은 None)"""
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_read_file_schema, parquet_files))
+
+
+def scan_catalog_column_types(catalog_path: Union[str, Path]) -> Dict[str, pa.DataType]:
+    """모든 segment footer를 읽어 컬럼별 저장 타입 계산
+
+    이미 같은 컬럼이 중첩 타입과 문자열로 섞여 저장된 catalog(이전 버전)는 문자열로 본다.
+    """
+    column_types: Dict[str, pa.DataType] = {}
+    for schema in read_file_schemas(list_catalog_files(catalog_path)):
+        if schema is None:
+            continue
+        for field in schema:
+            try:
+                column_types[field.name] = _merge_column_type(
+                    field.name, column_types.get(field.name), field.type
+                )
+            except ValueError:
+                column_types[field.name] = pa.string()
+    return column_types
+
+
+def read_catalog_column_types(catalog_path: Union[str, Path]) -> Dict[str, pa.DataType]:
+    """catalog 컬럼별 저장 타입 (기록이 없으면 segment footer를 한 번 읽어 만든다)"""
+    types_file = Path(catalog_path) / COLUMN_TYPES_FILE
+    try:
+        with open(types_file, encoding='utf-8') as f:
+            encoded = json.load(f).get('schema')
+    except FileNotFoundError:
+        encoded = None
+    if encoded is None:
+        return scan_catalog_column_types(catalog_path)
+    schema = pa.ipc.read_schema(pa.py_buffer(base64.b64decode(encoded)))
+    return {field.name: field.type for field in schema}
+
+
+def write_catalog_column_types(catalog_path: Union[str, Path], column_types: Dict[str, pa.DataType]) -> None:
+    """catalog 컬럼별 저장 타입 기록 (호출자가 catalog 쓰기를 직렬화해야 함)"""
+    schema = pa.schema([pa.field(name, data_type) for name, data_type in column_types.items()])
+    atomic_write_json(
+        Path(catalog_path) / COLUMN_TYPES_FILE,
+        {
+            'schema': base64.b64encode(schema.serialize().to_pybytes()).decode('ascii'),
+            'updated_at': datetime.now().isoformat(),
+        }
+    )
+
+
+def unify_nested_columns(
+    table: pa.Table,
+    catalog_path: Union[str, Path],
+) -> Tuple[pa.Table, List[str], List[str]]:
+    """업로드 테이블의 컬럼을 catalog에 저장된 물리 타입으로 맞춘 뒤 컬럼 타입 기록 갱신
+
+    한 컬럼은 catalog 전체에서 한 가지 물리 타입(중첩 또는 문자열 등)으로만 저장한다.
+    - catalog에 중첩 타입으로 저장된 컬럼: 중첩 값은 합집합 타입으로 cast (없는 필드는 null),
+      JSON 문자열은 파싱한 뒤 같은 방식으로 cast
+    - catalog에 문자열 등 비중첩 타입으로 저장된 컬럼: 중첩 값을 JSON 문자열로 변환
+    - 처음 저장되는 컬럼: 업로드 타입 그대로 기록
+    어느 쪽으로도 맞출 수 없으면 ValueError (업로드 거부). 호출자가 catalog 쓰기를 직렬화해야 한다.
+
+    Returns:
+        (변환된 테이블, JSON 문자열로 바꾼 컬럼 목록, JSON 문자열을 파싱한 컬럼 목록)
+    """
+    column_types = read_catalog_column_types(catalog_path)
+    dumped_columns = []
+    parsed_columns = []
+    for index, field in enumerate(table.schema):
+        col, current_type = field.name, field.type
+        stored_type = column_types.get(col)
+        column = table.column(col)
+
+        if stored_type is not None and is_nested_type(stored_type) and not is_nested_type(current_type):
+            if not (pa.types.is_null(current_type) or pa.types.is_string(current_type)
+                    or pa.types.is_large_string(current_type)):
+                raise ValueError(f"'{col}' 컬럼은 catalog에 {stored_type}로 저장되어 있어 {current_type} 값을 저장할 수 없습니다")
+            if not pa.types.is_null(current_type):
+                try:
+                    values = [None if value is None else json.loads(value) for value in column.to_pylist()]
+                    column = pa.array(values)
+                except (ValueError, pa.ArrowInvalid, pa.ArrowTypeError) as e:
+                    raise ValueError(f"'{col}' 컬럼을 catalog 타입({stored_type})으로 파싱할 수 없습니다: {e}")
+                parsed_columns.append(col)
+            current_type = column.type
+        elif stored_type is not None and not is_nested_type(stored_type) and is_nested_type(current_type):
+            values = [
+                None if value is None else json.dumps(value, ensure_ascii=False)
+                for value in column.to_pylist()
+            ]
+            table = table.set_column(index, col, pa.array(values, type=pa.string()))
+            dumped_columns.append(col)
+            continue
+
+        unified_type = _merge_column_type(col, stored_type, current_type)
+        if unified_type != column.type and is_nested_type(unified_type):
+            try:
+                column = column.cast(unified_type)
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+                raise ValueError(f"'{col}' 컬럼을 catalog 타입({unified_type})으로 변환할 수 없습니다: {e}")
+        if column is not table.column(col):
+            table = table.set_column(index, col, column)
+        column_types[col] = unified_type
+
+    write_catalog_column_types(catalog_path, column_types)
+    return table, dumped_columns, parsed_columns
+
+
+def json_fallback_columns(parquet_files: Sequence[Union[str, Path]]) -> List[List[str]]:
+    """파일별로 조회 시 JSON 문자열로 읽어야 하는 중첩 컬럼 목록 (parquet_files와 같은 순서)
+
+    같은 컬럼이 파일마다 중첩 타입과 문자열로 섞여 있거나 중첩 타입끼리 합칠 수 없으면
+    union_by_name이 VARCHAR → STRUCT 변환에 실패하므로, 그 컬럼의 중첩 파일은 to_json으로 읽는다.
+    """
+    schemas = read_file_schemas(parquet_files)
+    column_types: Dict[str, pa.DataType] = {}
+    conflicts = set()
+    for schema in schemas:
+        for field in schema or []:
+            if field.name in conflicts:
+                continue
+            try:
+                column_types[field.name] = _merge_column_type(
+                    field.name, column_types.get(field.name), field.type
+                )
+            except ValueError:
+                conflicts.add(field.name)
+    return [
+        [field.name for field in schema if field.name in conflicts and is_nested_type(field.type)]
+        if schema is not None else []
+        for schema in schemas
+    ]
+
+
+def dictionary_columns(table: pa.Table, max_ratio: float = 0.1) -> List[str]:
+    """사전 인코딩이 유리한 저카디널리티 문자열 컬럼 (고유값 비율 <= max_ratio)"""
+    if table.num_rows == 0:
+        return []
+    columns = []
+    for field in table.schema:
+        if not (pa.types.is_string(field.type) or pa.types.is_large_string(field.type)):
+            continue
+        distinct = pc.count_distinct(table.column(field.name)).as_py()
+        if distinct / table.num_rows <= max_ratio:
+            columns.append(field.name)
+    return columns
+
+
+def with_segment_constants(schema: pa.Schema, constants: Optional[Dict] = None) -> pa.Schema:
+    """상수 컬럼 값을 key-value 메타데이터로 담은 스키마 (constants가 없으면 기존 값도 제거)"""
+    metadata = dict(schema.metadata or {})
+    metadata.pop(SEGMENT_CONSTANTS_KEY, None)
+    if constants:
+        metadata[SEGMENT_CONSTANTS_KEY] = json.dumps(constants, ensure_ascii=False, sort_keys=True).encode()
+    return schema.with_metadata(metadata)
+
+
+def write_segment_parquet(
+    dataset_obj,
+    path: Union[str, Path],
+    constants: Optional[Dict] = None,
+    row_group_size: int = 100_000,
+) -> int:
+    """업로드 segment(datasets.Dataset)를 배치 단위로 Parquet 저장
+
+    constants(행마다 같은 lang/src 등)는 컬럼으로 쓰지 않고 footer key-value 메타데이터에만 기록한다.
+
+    Returns:
+        저장한 행 수
+    """
+    schema = with_segment_constants(dataset_obj.features.arrow_schema, constants)
+    written = 0
+    with pq.ParquetWriter(str(path), schema) as writer:
+        for batch in dataset_obj.with_format("arrow").iter(batch_size=row_group_size):
+            writer.write_table(batch)
+            written += batch.num_rows
+    return written
+
+
+def materialize_segment_constants(
+    source: Union[str, Path],
+    path: Union[str, Path],
+    constants: Dict,
+) -> int:
+    """footer 메타데이터로만 저장된 상수 컬럼을 실제 컬럼으로 채운 segment 복사본 저장
+
+    Athena처럼 segment 메타데이터를 모르는 엔진에 catalog를 내보낼 때 사용한다.
+    row group 단위로 읽고 쓰므로 segment 전체를 메모리에 올리지 않는다.
+
+    Returns:
+        저장한 행 수
+    """
+    parquet_file = pq.ParquetFile(str(source))
+    schema = parquet_file.schema_arrow
+    added = {
+        col: pa.scalar(value) for col, value in constants.items()
+        if schema.get_field_index(col) < 0
+    }
+    for col, value in added.items():
+        schema = schema.append(pa.field(col, value.type))
+
+    written = 0
+    with pq.ParquetWriter(str(path), schema) as writer:
+        for index in range(parquet_file.num_row_groups):
+            table = parquet_file.read_row_group(index)
+            for col, value in added.items():
+                table = table.append_column(col, pa.array([value.as_py()] * table.num_rows, value.type))
+            writer.write_table(table.replace_schema_metadata(schema.metadata))
+            written += table.num_rows
+    return written
+
+
+def write_catalog_parquet(
+    table: pa.Table,
+    path: Union[str, Path],
+    row_group_size: int = 100_000,
+    compression: str = "zstd",
+    compression_level: Optional[int] = None,
+    dictionary_max_ratio: float = 0.1,
+    sort_by: Optional[str] = "hash",
+    bloom_filter_columns: Sequence[str] = ("hash", "path"),
+    constants: Optional[Dict] = None,
+) -> Dict:
+    """catalog 조회에 맞춘 레이아웃으로 Parquet 저장
+
+    - sort_by 컬럼 기준 정렬 (row group min/max 통계로 hash 조회 시 건너뛰기 가능)
+    - 저카디널리티 문자열 컬럼만 사전 인코딩
+    - bloom_filter_columns에 Bloom filter 기록 (지원하지 않는 pyarrow 버전이면 생략)
+    - constants는 footer key-value 메타데이터로 기록
+
+    Returns:
+        적용한 레이아웃 정보
+    """
+    table = table.replace_schema_metadata(with_segment_constants(table.schema, constants).metadata)
+    if sort_by and sort_by in table.column_names:
+        table = table.sort_by([(sort_by, "ascending")])
+    else:
+        sort_by = None
+
+    dict_columns = dictionary_columns(table, dictionary_max_ratio)
+    bloom_columns = [col for col in bloom_filter_columns if col in table.column_names]
+    options = dict(
+        row_group_size=row_group_size,
+        compression=compression,
+        compression_level=compression_level,
+        use_dictionary=dict_columns,
+        write_statistics=True,
+        sorting_columns=(
+            [pq.SortingColumn(table.column_names.index(sort_by))] if sort_by else None
+        ),
+    )
+    if bloom_columns:
+        ndv = max(table.num_rows, 1)
+        options["bloom_filter_options"] = {col: {"ndv": ndv, "fpp": 0.01} for col in bloom_columns}
+    try:
+        pq.write_table(table, str(path), **options)
+    except TypeError:
+        # bloom_filter_options를 지원하지 않는 pyarrow
+        options.pop("bloom_filter_options", None)
+        bloom_columns = []
+        pq.write_table(table, str(path), **options)
+
+    return {
+        "row_group_size": row_group_size,
+        "compression": compression,
+        "compression_level": compression_level,
+        "dictionary_columns": dict_columns,
+        "sorted_by": sort_by,
+        "bloom_filter_columns": bloom_columns,
+    }
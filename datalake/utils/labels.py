@@ -0,0 +1,32 @@
+import json
+from typing import Any
+
+
+def parse_label(value: Any) -> Any:
+    """라벨 값을 Python 객체로 변환
+
+    JSON 문자열로 저장된 라벨은 json.loads로 파싱하고, 중첩 Arrow 타입으로 저장되어
+    이미 dict/list로 조회된 라벨은 그대로 반환한다 (numpy 배열은 list로 변환).
+    """
+    if isinstance(value, (str, bytes, bytearray)):
+        return json.loads(value)
+    return _to_builtin(value)
+
+
+def dump_label(value: Any, **kwargs) -> str:
+    """라벨 값을 JSON 문자열로 변환 (이미 문자열이면 그대로 반환)"""
+    if isinstance(value, str):
+        return value
+    kwargs.setdefault('ensure_ascii', False)
+    return json.dumps(_to_builtin(value), **kwargs)
+
+
+def _to_builtin(value: Any) -> Any:
+    """pandas/DuckDB가 돌려주는 numpy 배열을 포함한 중첩 값을 dict/list로 변환"""
+    if isinstance(value, dict):
+        return {k: _to_builtin(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_builtin(v) for v in value]
+    if hasattr(value, 'tolist'):
+        return _to_builtin(value.tolist())
+    return value
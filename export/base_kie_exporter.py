@@ -2,11 +2,14 @@
 import json
 from pathlib import Path
 import pandas as pd
-from typing import Dict, Any
+import pyarrow as pa
+from typing import Dict, Any, Iterable, Union
 from PIL import Image, ImageDraw, ImageFont
 
+from datalake.utils import parse_label
 from prep.utils import DATALAKE_DIR
 from export.utils import (
+    iter_dataframes,
     save_df_as_jsonl,
     denormalize_bboxes,
     smart_resize,
@@ -77,7 +80,7 @@ class KIEStructExporter(object):
             else:
                 return d
 
-        data = json.loads(json_str)
+        data = parse_label(json_str)
         blanked = recursively_blank(data)
         return json.dumps(
             blanked,
@@ -93,7 +96,7 @@ class KIEStructExporter(object):
         indent: int = 0,
         bbox_key: str = "<|bbox|>",
     ) -> str:
-        label_dict = json.loads(label)
+        label_dict = parse_label(label)
         label_dict = remove_none_values(label_dict)
         label_str = json.dumps(
             label_dict,
@@ -114,7 +117,7 @@ class KIEStructExporter(object):
         value_key: str = "<|value|>",
         bbox_key: str = "<|bbox|>",
     ) -> str:
-        label_dict = json.loads(label)
+        label_dict = parse_label(label)
         label_dict = remove_none_values(label_dict)
         label_dict = truncate_lists(label_dict)
         label_str = json.dumps(
@@ -131,53 +134,55 @@ class KIEStructExporter(object):
 
     def export(
         self,
-        df: pd.DataFrame,
+        df: Union[pd.DataFrame, Iterable[pa.RecordBatch]],
         user_prompt: str,
         jsonl_path: str,
         value_key: str = "<|value|>",
         bbox_key: str = "<|bbox|>",
         indent: int = None,
     ) -> None:
-        df_copied = df.copy()
+        for idx, df_chunk in enumerate(iter_dataframes(df)):
+            df_copied = df_chunk.copy()
 
-        df_copied["path"] = df_copied["path"].apply(
-            lambda x: (Path(self.datalake_dir) / "assets" / x).as_posix(),
-        )
-        df_copied = filter_valid_image_paths(
-            df_copied,
-        )
-        df_copied["query"] = df_copied.apply(
-            lambda x: user_prompt + "\n" + self._make_target_schema(
-                x["label"],
-                indent=indent,
-                value_key=value_key,
-                bbox_key=bbox_key,
-            ),
-            axis=1,
-        )
-        df_copied[["width", "height"]] = df_copied.apply(
-            lambda x: smart_resize(
-                width=x["width"],
-                height=x["height"],
-            ),
-            axis=1,
-            result_type="expand",
-        )
-        df_copied["label"] = df_copied.apply(
-            lambda x: self._process_kie_label(
-                label=x["label"],
-                width=x["width"],
-                height=x["height"],
-                indent=indent,
-                bbox_key=bbox_key,
-            ),
-            axis=1,
-        )
+            df_copied["path"] = df_copied["path"].apply(
+                lambda x: (Path(self.datalake_dir) / "assets" / x).as_posix(),
+            )
+            df_copied = filter_valid_image_paths(
+                df_copied,
+            )
+            df_copied["query"] = df_copied.apply(
+                lambda x: user_prompt + "\n" + self._make_target_schema(
+                    x["label"],
+                    indent=indent,
+                    value_key=value_key,
+                    bbox_key=bbox_key,
+                ),
+                axis=1,
+            )
+            df_copied[["width", "height"]] = df_copied.apply(
+                lambda x: smart_resize(
+                    width=x["width"],
+                    height=x["height"],
+                ),
+                axis=1,
+                result_type="expand",
+            )
+            df_copied["label"] = df_copied.apply(
+                lambda x: self._process_kie_label(
+                    label=x["label"],
+                    width=x["width"],
+                    height=x["height"],
+                    indent=indent,
+                    bbox_key=bbox_key,
+                ),
+                axis=1,
+            )
 
-        save_df_as_jsonl(
-            df=df_copied,
-            jsonl_path=jsonl_path,
-        )
+            save_df_as_jsonl(
+                df=df_copied,
+                jsonl_path=jsonl_path,
+                append=idx > 0,
+            )
 
 
 def vis_base_kie_gt(
@@ -206,7 +211,7 @@ def vis_base_kie_gt(
     except Exception:
         font = ImageFont.load_default()
 
-    label_dict = json.loads(label_str)
+    label_dict = parse_label(label_str)
     for key, info in label_dict.items():
         text = f"{key} -> {info['<|value|>']}"
         bbox = info['<|bbox|>']
@@ -217,6 +222,8 @@ def vis_base_kie_gt(
 
 if __name__ == "__main__":
     import duckdb
+    from datalake.clients.queries import SQLQueries
+    from datalake.utils import list_catalog_segments, json_fallback_columns
     from sklearn.model_selection import train_test_split
 
     from export.utils import user_prompt_dict
@@ -226,7 +233,14 @@ if __name__ == "__main__":
     ROOT = Path(__file__).resolve().parent
     seed = 42
 
-    read_parquet = "read_parquet('/mnt/AI_NAS/datalake/catalog/provider=*/dataset=*/task=*/variant=*/data.parquet', union_by_name=True, filename=True, hive_partitioning=True)"
+    # manifest 기준 현재 스냅샷의 segment만 읽음 (segment 메타데이터의 상수 컬럼 포함)
+    segments = list_catalog_segments(DATALAKE_DIR / "catalog")
+    parquet_files = [segment["path"].as_posix() for segment in segments]
+    read_parquet = "(" + SQLQueries.catalog_source(
+        parquet_files,
+        [segment.get("constants") for segment in segments],
+        json_columns=json_fallback_columns(parquet_files),
+    ) + ")"
 
     sql=f"""SELECT *
     FROM {read_parquet}
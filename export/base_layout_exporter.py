@@ -2,12 +2,14 @@
 import json
 from pathlib import Path
 import pandas as pd
-from typing import List, Dict
+import pyarrow as pa
+from typing import List, Dict, Iterable, Union
 from PIL import Image, ImageDraw, ImageFont
 from tqdm import tqdm
 
 from prep.utils import DATALAKE_DIR
 from export.utils import (
+    iter_dataframes,
     save_df_as_jsonl,
     denormalize_bboxes,
     smart_resize,
@@ -77,68 +79,70 @@ class BaseLayoutExporter(object):
 
     def export(
         self,
-        df: pd.DataFrame,
+        df: Union[pd.DataFrame, Iterable[pa.RecordBatch]],
         jsonl_path: str,
         images_dir: str,
         user_prompt_reading_order: str = user_prompt_dict["base_layout_reading_order"],
         user_prompt_no_reading_order: str = user_prompt_dict["base_layout_no_reading_order"],
         indent: int = None,
     ) -> None:
-        df_copied = df.copy()
-
-        df_copied[["new_width", "new_height"]] = df_copied.apply(
-            lambda x: smart_resize(
-                width=x["width"],
-                height=x["height"],
-            ),
-            axis=1,
-            result_type="expand",
-        )  # Smart resize.
-        df_copied["label"] = df_copied.apply(
-            lambda x: denormalize_bboxes(
-                x["label"],
-                width=x["new_width"],
-                height=x["new_height"],
-                bbox_key="bbox",
-            ),
-            axis=1,
-        )  # Denormalize.
-        df_copied["label"] = df_copied["label"].apply(
-            lambda x: json.loads(x),
-        )  # String to Dict.
-
-        df_copied["path"] = df_copied["path"].apply(
-            lambda x: (Path(self.datalake_dir) / "assets" / x).as_posix(),
-        )  # Relative path to absolute path.
-        df_copied = filter_valid_image_paths(
-            df_copied,
-        )
-        df_copied["path"] = df_copied.progress_apply(
-            lambda x: self.save_masked_image(
-                image_path=x["path"],
-                bboxes=[i["bbox"] for i in x["label"]["elements"]],
-                images_dir=images_dir,
-            ),
-            axis=1,
-        )
-        df_copied = df_copied[df_copied["path"].notna()]
+        for idx, df_chunk in enumerate(iter_dataframes(df)):
+            df_copied = df_chunk.copy()
+
+            df_copied[["new_width", "new_height"]] = df_copied.apply(
+                lambda x: smart_resize(
+                    width=x["width"],
+                    height=x["height"],
+                ),
+                axis=1,
+                result_type="expand",
+            )  # Smart resize.
+            df_copied["label"] = df_copied.apply(
+                lambda x: denormalize_bboxes(
+                    x["label"],
+                    width=x["new_width"],
+                    height=x["new_height"],
+                    bbox_key="bbox",
+                ),
+                axis=1,
+            )  # Denormalize.
+            df_copied["label"] = df_copied["label"].apply(
+                lambda x: json.loads(x),
+            )  # String to Dict.
+
+            df_copied["path"] = df_copied["path"].apply(
+                lambda x: (Path(self.datalake_dir) / "assets" / x).as_posix(),
+            )  # Relative path to absolute path.
+            df_copied = filter_valid_image_paths(
+                df_copied,
+            )
+            df_copied["path"] = df_copied.progress_apply(
+                lambda x: self.save_masked_image(
+                    image_path=x["path"],
+                    bboxes=[i["bbox"] for i in x["label"]["elements"]],
+                    images_dir=images_dir,
+                ),
+                axis=1,
+            )
+            df_copied = df_copied[df_copied["path"].notna()]
 
-        df_copied["query"] = df_copied.apply(
-            lambda x: user_prompt_reading_order if x["label"]["reading_order"] else user_prompt_no_reading_order,
-            axis=1,
-        )
-        df_copied["label"] = df_copied.apply(
-            lambda x: self._elements_to_label(
-                x["label"]["elements"],
-                indent=indent,
-            ),
-            axis=1,
-        )
+            df_copied["query"] = df_copied.apply(
+                lambda x: user_prompt_reading_order if x["label"]["reading_order"] else user_prompt_no_reading_order,
+                axis=1,
+            )
+            df_copied["label"] = df_copied.apply(
+                lambda x: self._elements_to_label(
+                    x["label"]["elements"],
+                    indent=indent,
+                ),
+                axis=1,
+            )
 
-        save_df_as_jsonl(
-            df=df_copied,
-            jsonl_path=jsonl_path,
-        )
+            save_df_as_jsonl(
+                df=df_copied,
+                jsonl_path=jsonl_path,
+                append=idx > 0,
+            )
 
 
 def vis_elements(
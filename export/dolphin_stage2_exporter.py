@@ -2,12 +2,14 @@
 import json
 from pathlib import Path
 import pandas as pd
-from typing import List, Dict
+import pyarrow as pa
+from typing import List, Dict, Iterable, Union
 from PIL import Image
 from tqdm import tqdm
 
 from prep.utils import DATALAKE_DIR, get_safe_image_hash_from_pil
 from export.utils import (
+    iter_dataframes,
     save_df_as_jsonl,
     denormalize_bboxes,
     layout_category_dict,
@@ -63,52 +65,54 @@ class DolphinStage2Exporter(object):
 
     def export(
         self,
-        df: pd.DataFrame,
+        df: Union[pd.DataFrame, Iterable[pa.RecordBatch]],
         jsonl_path: str,
         images_dir: str,
         datalake_dir: str = DATALAKE_DIR.as_posix(),
         layout_category_dict: Dict[str, str] = layout_category_dict,
         user_prompt_dict: Dict[str, str] = user_prompt_dict,
     ) -> None:
-        df_copied = df.copy()
+        for idx, df_chunk in enumerate(iter_dataframes(df)):
+            df_copied = df_chunk.copy()
 
-        df_copied["label"] = df_copied.apply(
-            lambda x: denormalize_bboxes(
-                x["label"],
-                width=x["width"],
-                height=x["height"],
-                bbox_key="bbox",
-            ),
-            axis=1,
-        )  # Denormalize.
-        df_copied["label"] = df_copied["label"].apply(
-            lambda x: json.loads(x),
-        )  # String to Dict.
+            df_copied["label"] = df_copied.apply(
+                lambda x: denormalize_bboxes(
+                    x["label"],
+                    width=x["width"],
+                    height=x["height"],
+                    bbox_key="bbox",
+                ),
+                axis=1,
+            )  # Denormalize.
+            df_copied["label"] = df_copied["label"].apply(
+                lambda x: json.loads(x),
+            )  # String to Dict.
 
-        df_copied["image_path"] = df_copied["image_path"].apply(
-            lambda x: (Path(datalake_dir) / x).as_posix(),
-        )  # Relative path to absolute path.
+            df_copied["image_path"] = df_copied["image_path"].apply(
+                lambda x: (Path(datalake_dir) / x).as_posix(),
+            )  # Relative path to absolute path.
 
-        df_copied[["image_path", "query", "label"]] = df_copied.progress_apply(
-            lambda x: self.crop(
-                image_path=x["image_path"],
-                elements=x["label"]["elements"],
-                images_dir=images_dir,
-                layout_category_dict=layout_category_dict,
-                user_prompt_dict=user_prompt_dict,
-            ),
-            axis=1,
-            result_type="expand",
-        )
-        save_df_as_jsonl(
-            df=df_copied.explode(
-                [
-                    "image_path",
-                    "label",
-                ]
-            ),
-            jsonl_path=jsonl_path,
-        )
+            df_copied[["image_path", "query", "label"]] = df_copied.progress_apply(
+                lambda x: self.crop(
+                    image_path=x["image_path"],
+                    elements=x["label"]["elements"],
+                    images_dir=images_dir,
+                    layout_category_dict=layout_category_dict,
+                    user_prompt_dict=user_prompt_dict,
+                ),
+                axis=1,
+                result_type="expand",
+            )
+            save_df_as_jsonl(
+                df=df_copied.explode(
+                    [
+                        "image_path",
+                        "label",
+                    ]
+                ),
+                jsonl_path=jsonl_path,
+                append=idx > 0,
+            )
 
 
 if __name__ == "__main__":
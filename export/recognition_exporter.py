@@ -189,9 +189,18 @@ class RecogntionCharExporter(object):
 
 if __name__ == "__main__":
     import duckdb
+    from datalake.clients.queries import SQLQueries
+    from datalake.utils import list_catalog_segments, json_fallback_columns
 
     conn = duckdb.connect()
-    read_parquet = "read_parquet('/mnt/AI_NAS/datalake/catalog/provider=*/dataset=*/task=*/variant=*/data.parquet', union_by_name=True, filename=True, hive_partitioning=True)"
+    # manifest 기준 현재 스냅샷의 segment만 읽음 (segment 메타데이터의 상수 컬럼 포함)
+    segments = list_catalog_segments(DATALAKE_DIR / "catalog")
+    parquet_files = [segment["path"].as_posix() for segment in segments]
+    read_parquet = "(" + SQLQueries.catalog_source(
+        parquet_files,
+        [segment.get("constants") for segment in segments],
+        json_columns=json_fallback_columns(parquet_files),
+    ) + ")"
     sql=f"""SELECT *
     FROM {read_parquet}
     WHERE dataset = 'diverse_ocr_char' or dataset = 'diverse_ocr_word'
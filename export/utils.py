@@ -2,14 +2,17 @@ import re
 import json
 import math
 import pandas as pd
+import pyarrow as pa
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator, Union
 from PIL import Image, ImageDraw
 from io import BytesIO
 from docling.backend.html_backend import HTMLDocumentBackend
 from docling.datamodel.base_models import InputFormat
 from docling.datamodel.document import InputDocument
 
+from datalake.utils import dump_label
+
 
 def to_chat_format(
     image_paths: List[str],
@@ -47,15 +50,27 @@ def to_chat_format(
     }
 
 
+def iter_dataframes(
+    data: Union[pd.DataFrame, Iterable[pa.RecordBatch]],
+) -> Iterator[pd.DataFrame]:
+    # A DataFrame, or record batches from `DatalakeClient.search_iter()` one chunk at a time.
+    if isinstance(data, pd.DataFrame):
+        yield data
+        return
+    for batch in data:
+        yield batch.to_pandas()
+
+
 def save_df_as_jsonl(
     df: pd.DataFrame,
     jsonl_path: str,
+    append: bool = False,
 ) -> None:
     Path(jsonl_path).parent.mkdir(
         parents=True,
         exist_ok=True,
     )
-    with open(jsonl_path, "w", encoding="utf-8") as f:
+    with open(jsonl_path, "a" if append else "w", encoding="utf-8") as f:
         for row in df.itertuples(index=False):
             json_obj = to_chat_format(
                 image_paths=row.path,
@@ -134,6 +149,8 @@ def denormalize_bboxes(
     height: int,
     bbox_key: str = "bbox",
 ) -> str:
+    json_str = dump_label(json_str)  # Nested (already parsed) labels to JSON string.
+
     def replacer(
         match,
     ):
@@ -0,0 +1,72 @@
+import json
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from datasets import Dataset
+
+from datalake.core.client import DatalakeClient
+from datalake.server.processor import DatalakeProcessor
+
+
+LABELS = {
+    "h1": {"word": {"text": {"content": ["안녕"]}}},
+    "h2": {"word": {"text": {"content": ["hello"]}}},
+    "h3": {"word": {"text": {"content": ["안녕하세요"]}}},
+}
+
+
+@pytest.fixture
+def lake(tmp_path, monkeypatch):
+    """view 모드로 DB를 구축한 뒤 같은 파티션에 segment를 하나 더 업로드한 datalake"""
+    monkeypatch.setattr(DatalakeClient, "_check_server_connection", lambda self: None)
+    for name in ("staging/pending", "staging/processing", "staging/failed", "assets", "collections"):
+        (tmp_path / name).mkdir(parents=True)
+    partition = tmp_path / "catalog/provider=p/dataset=d/task=ocr/variant=word"
+    partition.mkdir(parents=True)
+    pq.write_table(
+        pa.table({
+            "hash": ["h1", "h2"],
+            "path": ["h1.jpg", "h2.jpg"],
+            "labels": [json.dumps(LABELS[h], ensure_ascii=False) for h in ("h1", "h2")],
+        }),
+        partition / "data.parquet",
+    )
+
+    client = DatalakeClient(
+        user_id="tester", base_path=str(tmp_path), log_level="WARNING", db_mode="view"
+    )
+    assert client.build_db(
+        force_rebuild=True,
+        hot_columns=["labels"],
+        text_index_columns=["labels"],
+        label_text_paths={"labels": ["$.{variant}.text.content"]},
+    )
+
+    processor = DatalakeProcessor(base_path=str(tmp_path), log_level="WARNING", num_proc=1)
+    processor._save_to_catalog(
+        Dataset.from_dict({
+            "hash": ["h3"],
+            "path": ["h3.jpg"],
+            "labels": [json.dumps(LABELS["h3"], ensure_ascii=False)],
+        }),
+        {"provider": "p", "dataset": "d", "task": "ocr", "variant": "word"},
+    )
+    yield client
+    client.close()
+
+
+def test_lookup_by_hash_sees_upload_after_build(lake):
+    result = lake.lookup_by_hash(["h3"])
+    assert result["hash"].tolist() == ["h3"]
+
+
+def test_text_search_sees_upload_after_build(lake):
+    result = lake.search(
+        tasks=["ocr"],
+        text_search={"column": "labels", "text": "안녕", "json_path": "$.word.text.content"},
+    )
+    assert sorted(result["hash"]) == ["h1", "h3"]
+
+    result = lake.search(tasks=["ocr"], text_search={"column": "labels", "text": "안녕"})
+    assert sorted(result["hash"]) == ["h1", "h3"]